@@ -30,6 +30,28 @@ args = [
     "--hidden-import=modules.socialclub_fixer",
     "--hidden-import=modules.network_manager",
     "--hidden-import=modules.optimizer",
+    "--hidden-import=modules.rpf_reader",
+    "--hidden-import=modules.mod_detector",
+    "--hidden-import=modules.mod_manager",
+    "--hidden-import=modules.dedup",
+    "--hidden-import=modules.install_mover",
+    "--hidden-import=modules.storage_bench",
+    "--hidden-import=modules.benchmark_runner",
+    "--hidden-import=modules.frametime_analytics",
+    "--hidden-import=modules.preset_tuner",
+    "--hidden-import=modules.settings_xml",
+    "--hidden-import=modules.vram_estimator",
+    "--hidden-import=modules.commandline",
+    "--hidden-import=modules.cmdline_history",
+    "--hidden-import=modules.arg_catalog",
+    "--hidden-import=modules.profiles",
+    "--hidden-import=modules.diagnostics",
+    "--hidden-import=modules.dir_size",
+    "--hidden-import=modules.backup_store",
+    "--hidden-import=modules.quarantine",
+    "--hidden-import=modules.log_analyzer",
+    "--hidden-import=modules.diag_history",
+    "--hidden-import=modules.health_scheduler",
     # Coletar dados do customtkinter
     "--collect-data=customtkinter",
     # Assets
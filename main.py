@@ -11,13 +11,22 @@ from PIL import Image, ImageDraw
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.config import (
-    load_config, save_config, detect_game_path,
+    load_config, save_config, detect_game_path, detect_all_game_paths,
     detect_platform, validate_game_path,
 )
 from modules.game_manager import GameManager
 from modules.socialclub_fixer import SocialClubFixer
 from modules.network_manager import NetworkManager
-from modules.optimizer import OptimizationManager, ALL_ARGUMENTS, OPTIMIZATION_PRESETS
+from modules.mod_manager import ModManager
+from modules.dedup import InstallDeduplicator
+from modules.install_mover import InstallMover
+from modules.benchmark_runner import BenchmarkRunner
+from modules.frametime_analytics import summarize_record
+from modules.preset_tuner import PresetTuner, DEFAULT_CANDIDATES
+from modules.vram_estimator import describe as describe_graphics
+from modules.optimizer import OptimizationManager, CATALOG, OPTIMIZATION_PRESETS
+from modules.profiles import ProfileManager
+from modules.health_scheduler import HealthScheduler
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("GTAVLauncher")
@@ -59,6 +68,17 @@ C = {
 FONT = "Segoe UI"
 FONT_MONO = "Cascadia Code"
 
+# Origem das versões do commandline.txt, como aparece no histórico
+HISTORY_ORIGINS = {
+    "manual": "Edição manual",
+    "recommended": "Recomendação",
+    "clear": "Limpeza",
+    "tuner": "Ajuste automático",
+    "rollback": "Restauração",
+    "profile": "Perfil",
+    "external": "Versão anterior / externa",
+}
+
 
 # ═══════════════════════════════════════════════════════
 #  MAIN APP
@@ -74,12 +94,22 @@ class GTAVLauncher(ctk.CTk):
         self.game_manager: GameManager | None = None
         self.sc_fixer = SocialClubFixer()
         self.net_mgr = NetworkManager()
+        self.mod_mgr = ModManager()
         self.optimizer: OptimizationManager | None = None
+        self._pending_args: dict = {}
+        self._pending_job = None
+        self._arg_vars: dict = {}
+        self._args_key = None
+        self._opt_gen = 0
+        self.profiles: ProfileManager | None = None
+        self.health: HealthScheduler | None = None
 
         self._setup_window()
         self._auto_detect()
         self._build()
         self._refresh_status()
+        if self.config.get("health_checks"):
+            self._start_health()
 
     # ── window ──────────────────────────────────────────
     def _setup_window(self):
@@ -97,6 +127,12 @@ class GTAVLauncher(ctk.CTk):
         icon = os.path.join(os.path.dirname(__file__), "assets", "icon.ico")
         if os.path.isfile(icon):
             self.iconbitmap(icon)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        # Cliques nos argumentos ainda aguardando o debounce são gravados
+        self._settle_args(flush=True)
+        self.destroy()
 
     def _auto_detect(self):
         gp = self.config.get("game_path", "")
@@ -108,7 +144,18 @@ class GTAVLauncher(ctk.CTk):
         if validate_game_path(self.config.get("game_path", "")):
             self.game_manager = GameManager(self.config["game_path"])
             self.net_mgr.game_path = self.config["game_path"]
+            self.sc_fixer.game_path = self.config["game_path"]
+            self.mod_mgr.game_path = self.config["game_path"]
             self.optimizer = OptimizationManager(self.config["game_path"])
+            # Troca de conjunto de mods interrompida: concluir
+            if self.mod_mgr.has_pending_operation():
+                _, msg = self.mod_mgr.recover(complete=True)
+                logger.info(msg)
+            # Sessão vanilla interrompida (launcher fechado durante o jogo)
+            mods = self.game_manager.mod_detector
+            if mods.is_vanilla_active() and not self.game_manager.is_game_running():
+                _, msg = mods.restore_mods()
+                logger.info(msg)
 
     # ══════════════════════════════════════════════════
     #  BUILD
@@ -206,6 +253,11 @@ class GTAVLauncher(ctk.CTk):
             self._refresh_fw()
         if key == "optimize":
             self._refresh_opt()
+        if key == "settings":
+            self._refresh_mods()
+            self._refresh_health()
+        if key == "diag":
+            self._refresh_backups()
 
     # ══════════════════════════════════════════════════
     #  PAGE — HOME (JOGAR)
@@ -289,6 +341,35 @@ class GTAVLauncher(ctk.CTk):
                             command=self._save_quick_opts,
                             ).pack(side="left", padx=(0, 22))
 
+        # ── profiles ──
+        prof = ctk.CTkFrame(sc, fg_color=C["card"], corner_radius=12,
+                            border_width=1, border_color=C["card_border"])
+        prof.pack(fill="x", padx=28, pady=6)
+        ctk.CTkLabel(prof, text="PERFIS",
+                     font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(14, 0))
+        prof_row = ctk.CTkFrame(prof, fg_color="transparent")
+        prof_row.pack(fill="x", padx=18, pady=(8, 14))
+        self._profile_var = ctk.StringVar(value="")
+        self._profile_menu = ctk.CTkOptionMenu(prof_row, variable=self._profile_var, values=[""],
+                                               width=220, height=32, corner_radius=8,
+                                               font=ctk.CTkFont(FONT, 12),
+                                               fg_color=C["input_bg"], button_color=C["card_hover"],
+                                               button_hover_color=C["t4"], text_color=C["t1"])
+        self._profile_menu.pack(side="left")
+        self._btn_profile = ctk.CTkButton(prof_row, text="Aplicar", width=90, height=32,
+                                          corner_radius=8, font=ctk.CTkFont(FONT, 11, "bold"),
+                                          fg_color=C["accent"], hover_color=C["accent_hover"],
+                                          text_color="#000", command=self._apply_profile)
+        self._btn_profile.pack(side="left", padx=(8, 0))
+        ctk.CTkButton(prof_row, text="💾 Salvar atual", width=120, height=32, corner_radius=8,
+                      font=ctk.CTkFont(FONT, 11), fg_color=C["card_hover"], hover_color=C["t4"],
+                      command=self._save_profile).pack(side="left", padx=(8, 0))
+        ctk.CTkButton(prof_row, text="🗑️", width=36, height=32, corner_radius=8,
+                      font=ctk.CTkFont(FONT, 11), fg_color=C["card_hover"], hover_color=C["red"],
+                      command=self._delete_profile).pack(side="left", padx=(8, 0))
+        self._refresh_profiles()
+
         # ── PLAY button ──
         self._btn_play = ctk.CTkButton(
             sc, text="▶   JOGAR OFFLINE",
@@ -299,6 +380,15 @@ class GTAVLauncher(ctk.CTk):
         )
         self._btn_play.pack(fill="x", padx=28, pady=(12, 4))
 
+        self._btn_vanilla = ctk.CTkButton(
+            sc, text="🧩   JOGAR VANILLA (sem mods)",
+            font=ctk.CTkFont(FONT, 12, "bold"),
+            height=34, corner_radius=10,
+            fg_color=C["card_hover"], hover_color=C["t4"],
+            command=lambda: self._on_play(vanilla=True),
+        )
+        self._btn_vanilla.pack(fill="x", padx=28, pady=(2, 4))
+
         self._btn_kill = ctk.CTkButton(
             sc, text="⏹   ENCERRAR GTA V",
             font=ctk.CTkFont(FONT, 13, "bold"),
@@ -363,6 +453,88 @@ class GTAVLauncher(ctk.CTk):
         self.config["auto_fix_socialclub"] = self._ck_fix.get()
         save_config(self.config)
 
+    # ── profiles ──
+    def _profile_mgr(self) -> ProfileManager | None:
+        if not self.optimizer:
+            return None
+        if not self.profiles:
+            self.profiles = ProfileManager(self.config, self.optimizer, self.net_mgr)
+        self.profiles.optimizer = self.optimizer
+        return self.profiles
+
+    def _refresh_profiles(self, select: str = ""):
+        mgr = self._profile_mgr()
+        profiles = mgr.get_profiles() if mgr else {}
+        self._profile_keys = {p.get("name", k): k for k, p in profiles.items()}
+        names = list(self._profile_keys) or ["Nenhum perfil salvo"]
+        self._profile_menu.configure(values=names)
+        if select or self._profile_var.get() not in self._profile_keys:
+            self._profile_var.set(select or names[0])
+
+    def _apply_profile(self):
+        mgr = self._profile_mgr()
+        key = self._profile_keys.get(self._profile_var.get())
+        if not mgr or not key:
+            return
+        self._btn_profile.configure(state="disabled", text="⏳")
+
+        def t():
+            ok, msg = mgr.apply(key)
+            self.after(0, lambda: done(ok, msg))
+
+        def done(ok, msg):
+            self._btn_profile.configure(state="normal", text="Aplicar")
+            self._sync_config_widgets()
+            self._lbl_msg.configure(text=msg, text_color=C["accent"] if ok else C["red"])
+            if not ok:
+                messagebox.showerror("Perfil", msg)
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _save_profile(self):
+        mgr = self._profile_mgr()
+        if not mgr:
+            messagebox.showerror("Perfil", "Configure o caminho do GTA V em Configurações.")
+            return
+        name = ctk.CTkInputDialog(text="Nome do perfil (ex.: Stream, Heists):",
+                                  title="Salvar perfil").get_input()
+        name = (name or "").strip()
+        if not name:
+            return
+        key = self._profile_keys.get(name) or "_".join(name.lower().split())
+
+        def t():
+            ok, msg = mgr.save_profile(key, mgr.capture(name))
+            self.after(0, lambda: done(ok, msg))
+
+        def done(ok, msg):
+            self._refresh_profiles(select=name if ok else "")
+            self._lbl_msg.configure(text=msg, text_color=C["accent"] if ok else C["red"])
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _delete_profile(self):
+        mgr = self._profile_mgr()
+        name = self._profile_var.get()
+        key = self._profile_keys.get(name)
+        if not mgr or not key or not messagebox.askyesno("Perfil", f"Excluir o perfil '{name}'?"):
+            return
+        ok, msg = mgr.delete_profile(key)
+        self._refresh_profiles()
+        self._lbl_msg.configure(text=msg, text_color=C["accent"] if ok else C["red"])
+
+    def _sync_config_widgets(self):
+        """Atualiza os controles depois que o config mudou por fora (ex.: perfil)."""
+        self._mode.set(self.config.get("launch_mode", "offline"))
+        self._on_mode_changed()
+        self._ck_win.set(self.config.get("windowed", False))
+        self._ck_brd.set(self.config.get("borderless", False))
+        if hasattr(self, "_args_entry"):
+            self._args_entry.delete(0, "end")
+            self._args_entry.insert(0, self.config.get("custom_args", ""))
+            self._density.set(self.config.get("population_density", 1.0))
+            self._density_lbl.configure(text=f"{self._density.get():.0%}")
+
     # ══════════════════════════════════════════════════
     #  PAGE — OTIMIZAÇÃO
     # ══════════════════════════════════════════════════
@@ -389,9 +561,16 @@ class GTAVLauncher(ctk.CTk):
                                 border_width=1, border_color=C["card_border"])
         sys_card.pack(fill="x", padx=28, pady=(14, 6))
 
-        ctk.CTkLabel(sys_card, text="💻  SEU HARDWARE",
+        sys_head = ctk.CTkFrame(sys_card, fg_color="transparent")
+        sys_head.pack(fill="x", padx=18, pady=(14, 6))
+        ctk.CTkLabel(sys_head, text="💻  SEU HARDWARE",
                      font=ctk.CTkFont(FONT, 11, "bold"),
-                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(14, 6))
+                     text_color=C["t3"]).pack(side="left")
+        self._btn_disk = ctk.CTkButton(sys_head, text="💽 Testar disco", width=120, height=28,
+                                       corner_radius=8, font=ctk.CTkFont(FONT, 11),
+                                       fg_color=C["card_hover"], hover_color=C["t4"],
+                                       command=self._run_disk_bench)
+        self._btn_disk.pack(side="right")
 
         self._sys_info_frame = ctk.CTkFrame(sys_card, fg_color="transparent")
         self._sys_info_frame.pack(fill="x", padx=18, pady=(0, 14))
@@ -427,6 +606,28 @@ class GTAVLauncher(ctk.CTk):
                       command=self._apply_recommended
                       ).pack(side="right", padx=(12, 0))
 
+        # ── Benchmark ──
+        bm_card = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                               border_width=1, border_color=C["card_border"])
+        bm_card.pack(fill="x", padx=28, pady=6)
+        bm_head = ctk.CTkFrame(bm_card, fg_color="transparent")
+        bm_head.pack(fill="x", padx=18, pady=(14, 4))
+        ctk.CTkLabel(bm_head, text="📊  BENCHMARK INTEGRADO",
+                     font=ctk.CTkFont(FONT, 11, "bold"),
+                     text_color=C["t3"]).pack(side="left")
+        self._btn_bench = ctk.CTkButton(bm_head, text="▶ Rodar benchmark", width=140, height=30,
+                                        corner_radius=8, font=ctk.CTkFont(FONT, 11, "bold"),
+                                        fg_color=C["blue"], hover_color=C["blue_hover"],
+                                        command=self._run_benchmark)
+        self._btn_bench.pack(side="right")
+        self._btn_tune = ctk.CTkButton(bm_head, text="🎯 Ajuste automático", width=150, height=30,
+                                       corner_radius=8, font=ctk.CTkFont(FONT, 11, "bold"),
+                                       fg_color=C["input_bg"], hover_color=C["card_border"],
+                                       text_color=C["t1"], command=self._run_tuner)
+        self._btn_tune.pack(side="right", padx=(0, 8))
+        self._bench_list = ctk.CTkFrame(bm_card, fg_color="transparent")
+        self._bench_list.pack(fill="x", padx=18, pady=(0, 14))
+
         # ── Presets ──
         pre_card = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
                                 border_width=1, border_color=C["card_border"])
@@ -488,11 +689,62 @@ class GTAVLauncher(ctk.CTk):
                       fg_color=C["red"], hover_color=C["red_hover"],
                       command=self._clear_cmdline).pack(side="left")
 
+        ctk.CTkLabel(cmd_card, text="🕘  HISTÓRICO", font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(0, 4))
+        self._hist_list = ctk.CTkFrame(cmd_card, fg_color="transparent")
+        self._hist_list.pack(fill="x", padx=18, pady=(0, 14))
+
+    def _refresh_history(self):
+        for w in self._hist_list.winfo_children():
+            w.destroy()
+        versions = self.optimizer.get_history(limit=6)
+        if not versions:
+            ctk.CTkLabel(self._hist_list, text="Nenhuma alteração registrada",
+                         font=ctk.CTkFont(FONT, 11), text_color=C["t3"]).pack(anchor="w")
+            return
+        presets = self.optimizer.get_presets()
+        for i, v in enumerate(versions):
+            origin = v["origin"]
+            if origin.startswith("preset:"):
+                origin = presets.get(origin[7:], {}).get("name", origin[7:])
+            else:
+                origin = HISTORY_ORIGINS.get(origin.split(":")[0], origin)
+            row = ctk.CTkFrame(self._hist_list, fg_color=C["input_bg"], corner_radius=8)
+            row.pack(fill="x", pady=2)
+            ri = ctk.CTkFrame(row, fg_color="transparent")
+            ri.pack(fill="x", padx=12, pady=6)
+            ctk.CTkLabel(ri, text=f'{v["date"].replace("T", " ")}  ·  {origin}'
+                                  + ("  (atual)" if i == 0 else ""),
+                         font=ctk.CTkFont(FONT, 11), text_color=C["t2"]).pack(side="left")
+            if i == 0:
+                continue
+            ctk.CTkButton(ri, text="Restaurar", width=80, height=26, corner_radius=6,
+                          font=ctk.CTkFont(FONT, 10, "bold"),
+                          fg_color=C["blue"], hover_color=C["blue_hover"],
+                          command=lambda vid=v["id"]: self._rollback_cmdline(vid)
+                          ).pack(side="right")
+            ctk.CTkButton(ri, text="Diff", width=50, height=26, corner_radius=6,
+                          font=ctk.CTkFont(FONT, 10),
+                          fg_color=C["card_hover"], hover_color=C["t4"],
+                          command=lambda vid=v["id"]: messagebox.showinfo(
+                              "Diferenças", self.optimizer.diff_version(vid) or "Sem diferenças.")
+                          ).pack(side="right", padx=(0, 6))
+
+    def _rollback_cmdline(self, version_id):
+        self._settle_args(flush=False)
+        ok, msg = self.optimizer.rollback(version_id)
+        if ok:
+            self._refresh_opt()
+        messagebox.showinfo("Histórico", msg) if ok else messagebox.showerror("Histórico", msg)
+
     def _refresh_opt(self):
         """Popula / atualiza toda a página de otimização."""
+        self._settle_args(flush=True)
         if not self.optimizer:
             self.optimizer = OptimizationManager(self.config.get("game_path", ""))
         self.optimizer.game_path = self.config.get("game_path", "")
+        if self.optimizer.analyzer.storage_info is None:
+            self.optimizer.analyzer.storage_info = self.config.get("storage_benchmark")
 
         # --- sys info ---
         for w in self._sys_info_frame.winfo_children():
@@ -504,6 +756,11 @@ class GTAVLauncher(ctk.CTk):
             ("GPU", info["gpu_name"][:45], f'{info["vram_mb"]} MB VRAM' if info["vram_mb"] else ""),
             ("OS",  f'Windows {info["os_release"]}', info["architecture"]),
         ]
+        disk = self.optimizer.analyzer.storage_info
+        if disk and disk.get("drive_class") != "unknown":
+            specs.append(("DISCO", f'{disk["drive_class"].upper()} · {disk["seq_mb_s"]:.0f} MB/s seq'
+                                   f' · {disk["random_iops"]:.0f} IOPS',
+                          f'{disk["free_gb"]:.0f} GB livres'))
         for label, val, extra in specs:
             row = ctk.CTkFrame(self._sys_info_frame, fg_color="transparent")
             row.pack(fill="x", pady=2)
@@ -515,17 +772,68 @@ class GTAVLauncher(ctk.CTk):
                 ctk.CTkLabel(row, text=extra, font=ctk.CTkFont(FONT, 10),
                              text_color=C["t3"], anchor="w").pack(side="left")
 
-        # --- recommended ---
-        rec_key = self.optimizer.get_recommended_preset()
-        rec_preset = OPTIMIZATION_PRESETS.get(rec_key, {})
-        rec_args = self.optimizer.analyzer.get_recommended_args()
+        # --- recommended / benchmarks / presets ---
+        # A estimativa de VRAM (tabela montada na primeira chamada) e a leitura
+        # dos benchmarks rodam fora da thread da UI; só a última atualização vale
+        self._opt_gen += 1
+        gen = self._opt_gen
+        optimizer = self.optimizer
+
+        def t():
+            rec = {
+                "key": optimizer.get_recommended_preset(),
+                "args": optimizer.analyzer.get_recommended_args(),
+                "gfx": optimizer.get_recommended_graphics(),
+                "disk_tip": optimizer.analyzer.get_storage_recommendation(),
+            }
+            results = self._load_benchmarks()
+            self.after(0, lambda: done(rec, results))
+
+        def done(rec, results):
+            if gen == self._opt_gen:
+                self._show_recommendation(rec, results)
+
+        threading.Thread(target=t, daemon=True).start()
+
+        # --- argument toggles ---
+        # Os widgets são montados uma vez por catálogo/build; nas visitas
+        # seguintes só o estado dos switches é atualizado.
+        current_args = {a.lower() for a in self.optimizer.get_current_args()}
+        args_key = (CATALOG.version, self.optimizer.get_game_build())
+        if args_key != self._args_key:
+            self._build_arg_toggles(self.optimizer.get_arguments_by_category())
+            self._args_key = args_key
+        for arg, var in self._arg_vars.items():
+            on = arg.lower() in current_args
+            if var.get() != on:
+                var.set(on)
+
+        # --- commandline textbox ---
+        self._cmdline_box.delete("1.0", "end")
+        self._cmdline_box.insert("1.0", self.optimizer.read_commandline())
+        self._refresh_history()
+
+    def _show_recommendation(self, rec, bench_results):
+        rec_key = rec["key"]
+        presets = self.optimizer.get_presets()
+        rec_preset = presets.get(rec_key, {})
         self._rec_desc.configure(text=f"Preset recomendado: {rec_preset.get('name', rec_key)}")
-        self._rec_args.configure(text="  ".join(rec_args) if rec_args else "Nenhum argumento adicional")
+        rec_text = "  ".join(rec["args"]) if rec["args"] else "Nenhum argumento adicional"
+        gfx = rec["gfx"]
+        if gfx:
+            rec_text += (f"\n🎨 Gráficos para a sua VRAM: {', '.join(describe_graphics(gfx['settings']))}"
+                         f"  (~{gfx['vram_mb']} de {gfx['budget_mb']} MB)")
+        if rec["disk_tip"]:
+            rec_text += f"\n{rec['disk_tip']}"
+        self._rec_args.configure(text=rec_text, justify="left", wraplength=560)
+
+        # --- benchmarks ---
+        self._show_benchmarks(bench_results)
 
         # --- presets ---
         for w in self._presets_frame.winfo_children():
             w.destroy()
-        for key, preset in OPTIMIZATION_PRESETS.items():
+        for key, preset in presets.items():
             is_rec = key == rec_key
             row = ctk.CTkFrame(self._presets_frame,
                                fg_color=C["accent_dim"] if is_rec else C["input_bg"],
@@ -552,16 +860,12 @@ class GTAVLauncher(ctk.CTk):
                           command=lambda k=key: self._apply_preset(k)
                           ).pack(side="right")
 
-        # --- argument toggles ---
+    def _build_arg_toggles(self, cats):
         for w in self._args_frame.winfo_children():
             w.destroy()
-
-        current_args = self.optimizer.get_current_args()
         self._arg_vars = {}
-        cats = {}
-        for a in ALL_ARGUMENTS:
-            cats.setdefault(a["category"], []).append(a)
-
+        impact_colors = {"positivo": C["accent"], "negativo": C["red"],
+                         "neutro": C["t2"], "variável": C["orange"]}
         for cat, items in cats.items():
             ctk.CTkLabel(self._args_frame, text=cat.upper(),
                          font=ctk.CTkFont(FONT, 10, "bold"),
@@ -571,15 +875,13 @@ class GTAVLauncher(ctk.CTk):
                 row.pack(fill="x", pady=2)
                 ri = ctk.CTkFrame(row, fg_color="transparent")
                 ri.pack(fill="x", padx=12, pady=8)
-                var = ctk.BooleanVar(value=item["arg"] in current_args)
+                var = ctk.BooleanVar(value=False)
                 self._arg_vars[item["arg"]] = var
                 sw = ctk.CTkSwitch(ri, text="", variable=var, width=44,
                                    fg_color=C["t4"], progress_color=C["accent"],
                                    button_color=C["t1"], button_hover_color=C["accent_hover"],
                                    command=lambda a=item["arg"]: self._toggle_arg(a))
                 sw.pack(side="left")
-                impact_colors = {"positivo": C["accent"], "negativo": C["red"],
-                                 "neutro": C["t2"], "variável": C["orange"]}
                 ctk.CTkLabel(ri, text=f'{item["icon"]}  {item["name"]}',
                              font=ctk.CTkFont(FONT, 12, "bold"),
                              text_color=C["t1"]).pack(side="left", padx=(8, 6))
@@ -590,13 +892,109 @@ class GTAVLauncher(ctk.CTk):
                 ctk.CTkLabel(ri, text=f'● {item["impact"]}',
                              font=ctk.CTkFont(FONT, 10), text_color=dot_col).pack(side="right")
 
-        # --- commandline textbox ---
-        self._cmdline_box.delete("1.0", "end")
-        self._cmdline_box.insert("1.0", self.optimizer.read_commandline())
+    def _load_benchmarks(self) -> list:
+        """Últimos resultados com as estatísticas de frame time (fora da thread da UI)."""
+        results = BenchmarkRunner().get_results()[:3]
+        return [(r, summarize_record(r)) for r in results]
+
+    def _refresh_benchmarks(self):
+        def t():
+            results = self._load_benchmarks()
+            self.after(0, lambda: self._show_benchmarks(results))
+        threading.Thread(target=t, daemon=True).start()
+
+    def _show_benchmarks(self, results):
+        for w in self._bench_list.winfo_children():
+            w.destroy()
+        if not results:
+            ctk.CTkLabel(self._bench_list, text="Nenhum resultado de benchmark encontrado",
+                         font=ctk.CTkFont(FONT, 11), text_color=C["t3"]).pack(anchor="w")
+            return
+        presets = self.optimizer.get_presets() if self.optimizer else OPTIMIZATION_PRESETS
+        for r, stats in results:
+            fps = [p["fps"]["avg"] for p in r["passes"] if "fps" in p]
+            avg = f"{sum(fps) / len(fps):.1f} FPS médio" if fps else "sem dados"
+            if stats:
+                avg += f"  ·  1% low {stats['low_1_fps']:.1f}  ·  {stats['stutter_count']} travada(s)"
+            ctx = r.get("context") or {}
+            preset = presets.get(ctx.get("preset"), {}).get("name", "")
+            ctk.CTkLabel(self._bench_list, text=f"{r['date'].replace('T', ' ')}  ·  {avg}  {preset}",
+                         font=ctk.CTkFont(FONT_MONO, 11), text_color=C["t2"]).pack(anchor="w")
+
+    def _run_benchmark(self):
+        if not self.game_manager:
+            messagebox.showerror("Benchmark", "Configure o caminho do GTA V em Configurações.")
+            return
+        if not messagebox.askyesno("Benchmark", "O GTA V será aberto no benchmark integrado "
+                                   "(~5 minutos). Continuar?"):
+            return
+        self._btn_bench.configure(state="disabled", text="⏳ Em execução…")
+        runner = BenchmarkRunner(self.game_manager, self.optimizer)
+
+        def t():
+            ok, msg, _ = runner.run(self.config)
+            self.after(0, lambda: done(ok, msg))
+
+        def done(ok, msg):
+            self._btn_bench.configure(state="normal", text="▶ Rodar benchmark")
+            self._refresh_benchmarks()
+            messagebox.showinfo("Benchmark", msg) if ok else messagebox.showerror("Benchmark", msg)
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _run_tuner(self):
+        if not self.game_manager or not self.optimizer:
+            messagebox.showerror("Ajuste automático", "Configure o caminho do GTA V em Configurações.")
+            return
+        runs = PresetTuner.estimate_runs(DEFAULT_CANDIDATES)
+        if not messagebox.askyesno("Ajuste automático",
+                                   f"O benchmark será executado até {runs} vezes para encontrar a "
+                                   "melhor configuração para este PC. Configurações já testadas "
+                                   "não são repetidas.\n\nContinuar?"):
+            return
+        self._btn_tune.configure(state="disabled")
+        self._btn_bench.configure(state="disabled")
+        tuner = PresetTuner(self.game_manager, self.optimizer)
+
+        def progress(text):
+            self.after(0, lambda: self._btn_tune.configure(text=f"⏳ {text}"))
+
+        def t():
+            ok, msg, _ = tuner.run(self.config, progress=progress)
+            self.after(0, lambda: done(ok, msg))
+
+        def done(ok, msg):
+            self._btn_tune.configure(state="normal", text="🎯 Ajuste automático")
+            self._btn_bench.configure(state="normal")
+            self._refresh_opt()
+            messagebox.showinfo("Ajuste automático", msg) if ok else \
+                messagebox.showerror("Ajuste automático", msg)
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _run_disk_bench(self):
+        gp = self.config.get("game_path", "")
+        if not validate_game_path(gp) or not self.optimizer:
+            messagebox.showerror("Disco", "Configure o caminho do GTA V primeiro.")
+            return
+        self._btn_disk.configure(state="disabled", text="⏳ Testando…")
+
+        def t():
+            result = self.optimizer.analyzer.run_storage_benchmark(gp)
+            self.after(0, lambda: done(result))
+
+        def done(result):
+            self.config["storage_benchmark"] = result
+            save_config(self.config)
+            self._btn_disk.configure(state="normal", text="💽 Testar disco")
+            self._refresh_opt()
+
+        threading.Thread(target=t, daemon=True).start()
 
     def _apply_preset(self, key):
         if not self.optimizer:
             return
+        self._settle_args(flush=False)
         ok, msg = self.optimizer.apply_preset(key)
         if ok:
             self._refresh_opt()
@@ -605,6 +1003,7 @@ class GTAVLauncher(ctk.CTk):
     def _apply_recommended(self):
         if not self.optimizer:
             return
+        self._settle_args(flush=False)
         ok, msg = self.optimizer.apply_recommended()
         if ok:
             self._refresh_opt()
@@ -614,16 +1013,42 @@ class GTAVLauncher(ctk.CTk):
         if not self.optimizer:
             return
         var = self._arg_vars.get(arg)
-        if var and var.get():
-            self.optimizer.add_argument(arg)
+        # Cliques seguidos viram uma única gravação do commandline.txt
+        self._pending_args[arg] = bool(var and var.get())
+        if self._pending_job:
+            self.after_cancel(self._pending_job)
+        self._pending_job = self.after(400, self._flush_args)
+
+    def _settle_args(self, flush: bool):
+        """
+        Resolve os cliques pendentes antes de outra escrita no commandline.txt:
+        grava agora (flush) ou descarta, quando a nova escrita os substitui
+        (preset, editor, restauração, limpar).
+        """
+        if self._pending_job:
+            self.after_cancel(self._pending_job)
+            self._pending_job = None
+        if flush:
+            self._flush_args()
         else:
-            self.optimizer.remove_argument(arg)
+            self._pending_args = {}
+
+    def _flush_args(self):
+        self._pending_job = None
+        changes, self._pending_args = self._pending_args, {}
+        if not changes or not self.optimizer:
+            return
+        ok, msg = self.optimizer.set_arguments(changes)
+        if not ok:
+            messagebox.showerror("commandline.txt", msg)
         self._cmdline_box.delete("1.0", "end")
         self._cmdline_box.insert("1.0", self.optimizer.read_commandline())
+        self._refresh_history()
 
     def _save_cmdline(self):
         if not self.optimizer:
             return
+        self._settle_args(flush=False)
         content = self._cmdline_box.get("1.0", "end").strip()
         ok, msg = self.optimizer.write_commandline(content)
         messagebox.showinfo("Salvar", msg)
@@ -634,6 +1059,7 @@ class GTAVLauncher(ctk.CTk):
         if not self.optimizer:
             return
         if messagebox.askyesno("Limpar", "Limpar todo o commandline.txt?"):
+            self._settle_args(flush=False)
             self.optimizer.clear_commandline()
             self._refresh_opt()
 
@@ -672,14 +1098,26 @@ class GTAVLauncher(ctk.CTk):
             ("🧹 Cache Launcher", C["orange"], C["orange_hover"], "#000", self._clear_lc),
             ("🔄 Resetar Settings", C["red"], C["red_hover"], "#fff", self._reset_sett),
         ]:
-            ctk.CTkButton(row, text=txt, font=ctk.CTkFont(FONT, 12, "bold"),
-                          height=38, corner_radius=8, fg_color=color, hover_color=hov,
-                          text_color=tcol,
-                          command=cmd).pack(side="left", padx=(0, 6))
+            btn = ctk.CTkButton(row, text=txt, font=ctk.CTkFont(FONT, 12, "bold"),
+                                height=38, corner_radius=8, fg_color=color, hover_color=hov,
+                                text_color=tcol,
+                                command=cmd)
+            btn.pack(side="left", padx=(0, 6))
+            if cmd == self._run_diag:
+                self._btn_diag = btn
 
         self._diag_frame = ctk.CTkFrame(p, fg_color="transparent")
         self._diag_frame.pack(fill="x", padx=28, pady=6)
 
+        # backups
+        bk = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                          border_width=1, border_color=C["card_border"])
+        bk.pack(fill="x", padx=28, pady=6)
+        ctk.CTkLabel(bk, text="💾  BACKUPS", font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(14, 6))
+        self._backup_list = ctk.CTkFrame(bk, fg_color="transparent")
+        self._backup_list.pack(fill="x", padx=18, pady=(0, 14))
+
         # tips
         tip = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
                            border_width=1, border_color=C["card_border"])
@@ -699,21 +1137,105 @@ class GTAVLauncher(ctk.CTk):
     def _run_diag(self):
         for w in self._diag_frame.winfo_children():
             w.destroy()
-        results = self.sc_fixer.run_diagnostics()
-        for r in results:
-            st = r["status"]
-            col = {"ok": C["accent"], "warning": C["orange"],
-                   "error": C["red"], "info": C["blue"]}.get(st, C["t3"])
-            ico = {"ok": "✅", "warning": "⚠️", "error": "❌", "info": "ℹ️"}.get(st, "•")
+        # Um card por verificação, preenchido conforme os resultados chegam
+        slots = {}
+        for check in self.sc_fixer.diagnostics.checks:
             card = ctk.CTkFrame(self._diag_frame, fg_color=C["card"], corner_radius=10,
                                 border_width=1, border_color=C["card_border"])
             card.pack(fill="x", pady=3)
             inn = ctk.CTkFrame(card, fg_color="transparent")
             inn.pack(fill="x", padx=14, pady=10)
-            ctk.CTkLabel(inn, text=f"{ico}  {r['name']}", font=ctk.CTkFont(FONT, 13, "bold"),
-                         text_color=col).pack(anchor="w")
-            ctk.CTkLabel(inn, text=r["message"], font=ctk.CTkFont(FONT, 11),
-                         text_color=C["t2"]).pack(anchor="w", padx=(24, 0))
+            title = ctk.CTkLabel(inn, text=f"⏳  {check.name}", font=ctk.CTkFont(FONT, 13, "bold"),
+                                 text_color=C["t3"])
+            title.pack(anchor="w")
+            msg = ctk.CTkLabel(inn, text="Verificando…", font=ctk.CTkFont(FONT, 11),
+                               text_color=C["t3"], justify="left")
+            msg.pack(anchor="w", padx=(24, 0))
+            slots[check.key] = (title, msg)
+        self._btn_diag.configure(state="disabled")
+
+        def show(r):
+            st = r["status"]
+            col = {"ok": C["accent"], "warning": C["orange"],
+                   "error": C["red"], "info": C["blue"]}.get(st, C["t3"])
+            ico = {"ok": "✅", "warning": "⚠️", "error": "❌", "info": "ℹ️"}.get(st, "•")
+            title, msg = slots[r["key"]]
+            # Diferença em relação à execução anterior
+            delta = ""
+            prev = r.get("previous")
+            if prev:
+                if r.get("metric") is not None and prev.get("metric") is not None \
+                        and r["metric"] != prev["metric"]:
+                    delta += f"   ·  Δ {r['metric'] - prev['metric']:+g} {r.get('unit', '')}".rstrip()
+                if prev["status"] != st:
+                    before = {"ok": "✅", "warning": "⚠️", "error": "❌", "info": "ℹ️"}.get(prev["status"], "•")
+                    delta += f"   ·  antes {before}"
+            title.configure(text=f"{ico}  {r['name']}   ·  {r['duration'] * 1000:.0f} ms{delta}",
+                            text_color=col)
+            msg.configure(text=r["message"], text_color=C["t2"])
+            if r.get("fixes"):
+                ctk.CTkButton(msg.master, text="Aplicar correções", width=130, height=26,
+                              corner_radius=6, font=ctk.CTkFont(FONT, 11),
+                              fg_color=C["card_hover"], hover_color=C["t4"],
+                              command=self._fix_from_logs).pack(anchor="w", padx=(24, 0), pady=(6, 0))
+
+        def t():
+            self.sc_fixer.run_diagnostics(on_result=lambda r: self.after(0, lambda: show(r)))
+            self.after(0, lambda: self._btn_diag.configure(state="normal"))
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _fix_from_logs(self):
+        def t():
+            results = self.sc_fixer.fix_from_logs()
+            self.after(0, lambda: done(results))
+
+        def done(results):
+            text = "\n\n".join(f"{name}\n{msg}" for name, _, msg in results) or "Nada a corrigir."
+            messagebox.showinfo("Correções", text)
+            self._run_diag()
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _refresh_backups(self):
+        for w in self._backup_list.winfo_children():
+            w.destroy()
+        # Catálogo reconstruído em segundo plano: atualiza a lista quando terminar
+        backups = self.sc_fixer.get_backup_list(
+            on_rebuilt=lambda: self.after(0, self._refresh_backups))[:6]
+        if not backups:
+            ctk.CTkLabel(self._backup_list, text="Nenhum backup criado ainda",
+                         font=ctk.CTkFont(FONT, 11), text_color=C["t3"]).pack(anchor="w")
+            return
+        for b in backups:
+            row = ctk.CTkFrame(self._backup_list, fg_color=C["input_bg"], corner_radius=8)
+            row.pack(fill="x", pady=2)
+            ri = ctk.CTkFrame(row, fg_color="transparent")
+            ri.pack(fill="x", padx=12, pady=6)
+            date = time.strftime("%d/%m/%Y %H:%M", time.localtime(b["date"]))
+            ctk.CTkLabel(ri, text=f'{b.get("label") or b["name"].rsplit("_", 2)[0]}  ·  {date}  ·  {b["size_mb"]:.1f} MB',
+                         font=ctk.CTkFont(FONT_MONO, 11), text_color=C["t2"]).pack(side="left")
+            if b.get("id"):
+                ctk.CTkButton(ri, text="Restaurar", width=80, height=26, corner_radius=6,
+                              font=ctk.CTkFont(FONT, 11), fg_color=C["card_hover"],
+                              hover_color=C["t4"],
+                              command=lambda sid=b["id"]: self._restore_backup(sid)
+                              ).pack(side="right")
+
+    def _restore_backup(self, snapshot_id):
+        _, preview = self.sc_fixer.restore_backup(snapshot_id, dry_run=True)
+        if not messagebox.askyesno("Restaurar backup", f"{preview}\n\nRestaurar este backup?"):
+            return
+
+        def t():
+            ok, msg = self.sc_fixer.restore_backup(snapshot_id)
+            self.after(0, lambda: done(ok, msg))
+
+        def done(ok, msg):
+            self._refresh_backups()
+            messagebox.showinfo("Backup", msg) if ok else messagebox.showerror("Backup", msg)
+
+        threading.Thread(target=t, daemon=True).start()
 
     def _clear_sc(self):
         _, m = self.sc_fixer.clear_social_club_cache()
@@ -724,6 +1246,13 @@ class GTAVLauncher(ctk.CTk):
         messagebox.showinfo("Cache", m)
 
     def _reset_sett(self):
+        report = self.sc_fixer.settings.check()
+        if report["repairable"] and messagebox.askyesno(
+                "Reparar", "O settings.xml tem problemas que podem ser reparados.\n"
+                           "Reparar apenas os elementos afetados? (backup criado)"):
+            ok, m = self.sc_fixer.repair_settings()
+            messagebox.showinfo("Reparar", m) if ok else messagebox.showerror("Reparar", m)
+            return
         if messagebox.askyesno("Reset", "Remover settings.xml? (backup criado)"):
             _, m = self.sc_fixer.reset_settings()
             messagebox.showinfo("Reset", m)
@@ -811,6 +1340,10 @@ class GTAVLauncher(ctk.CTk):
     def _refresh_fw(self):
         self.net_mgr.game_path = self.config.get("game_path", "")
         s = self.net_mgr.get_block_status()
+        if self.profiles:
+            self.profiles.note_firewall(s["is_blocked"])
+        if self.health:
+            self.health.acknowledge("firewall")
         if s["is_blocked"]:
             self._fw_st.configure(text="🔒  GTA V BLOQUEADO — sem acesso à internet",
                                   text_color=C["red"])
@@ -909,6 +1442,91 @@ class GTAVLauncher(ctk.CTk):
         if self.config.get("custom_args"):
             self._args_entry.insert(0, self.config["custom_args"])
 
+        # population density (settings.xml)
+        dc = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                          border_width=1, border_color=C["card_border"])
+        dc.pack(fill="x", padx=28, pady=6)
+        ctk.CTkLabel(dc, text="🏙️  DENSIDADE POPULACIONAL",
+                     font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(14, 4))
+        ctk.CTkLabel(dc, text="Gravada no settings.xml do jogo ao salvar (menos pedestres e carros = mais FPS na CPU)",
+                     font=ctk.CTkFont(FONT, 11), text_color=C["t4"]
+                     ).pack(anchor="w", padx=18, pady=(0, 6))
+        dr = ctk.CTkFrame(dc, fg_color="transparent")
+        dr.pack(fill="x", padx=18, pady=(0, 14))
+        self._density_lbl = ctk.CTkLabel(dr, text="", width=48, font=ctk.CTkFont(FONT_MONO, 12),
+                                         text_color=C["t1"])
+        self._density_lbl.pack(side="right")
+        self._density = ctk.CTkSlider(dr, from_=0, to=1, number_of_steps=20,
+                                      progress_color=C["accent"], button_color=C["t1"],
+                                      button_hover_color=C["accent_hover"],
+                                      command=lambda v: self._density_lbl.configure(text=f"{v:.0%}"))
+        self._density.pack(side="left", fill="x", expand=True, padx=(0, 8))
+        self._density.set(self.config.get("population_density", 1.0))
+        self._density_lbl.configure(text=f"{self._density.get():.0%}")
+
+        # mod sets
+        mc = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                          border_width=1, border_color=C["card_border"])
+        mc.pack(fill="x", padx=28, pady=6)
+        mc_head = ctk.CTkFrame(mc, fg_color="transparent")
+        mc_head.pack(fill="x", padx=18, pady=(14, 4))
+        ctk.CTkLabel(mc_head, text="🧩  CONJUNTOS DE MODS",
+                     font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(side="left")
+        ctk.CTkButton(mc_head, text="➕ Novo a partir de pasta", height=30, corner_radius=8,
+                      font=ctk.CTkFont(FONT, 11),
+                      fg_color=C["card_hover"], hover_color=C["t4"],
+                      command=self._mods_new).pack(side="right")
+        ctk.CTkLabel(mc, text="Ativar/desativar apenas renomeia os arquivos — instantâneo mesmo para mods de vários GB",
+                     font=ctk.CTkFont(FONT, 11), text_color=C["t4"]
+                     ).pack(anchor="w", padx=18, pady=(0, 6))
+        self._mods_list = ctk.CTkFrame(mc, fg_color="transparent")
+        self._mods_list.pack(fill="x", padx=18, pady=(0, 14))
+
+        # background health checks
+        hc = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                          border_width=1, border_color=C["card_border"])
+        hc.pack(fill="x", padx=28, pady=6)
+        hc_head = ctk.CTkFrame(hc, fg_color="transparent")
+        hc_head.pack(fill="x", padx=18, pady=(14, 4))
+        ctk.CTkLabel(hc_head, text="🩺  VERIFICAÇÃO EM SEGUNDO PLANO",
+                     font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(side="left")
+        self._health_var = ctk.BooleanVar(value=self.config.get("health_checks", False))
+        ctk.CTkSwitch(hc_head, text="", variable=self._health_var, width=44,
+                      fg_color=C["t4"], progress_color=C["accent"],
+                      button_color=C["t1"], button_hover_color=C["accent_hover"],
+                      command=self._toggle_health).pack(side="right")
+        ctk.CTkLabel(hc, text=(f"Cache, settings.xml, mods e firewall a cada "
+                               f"{self.config.get('health_interval_min', 30)} min, com prioridade baixa "
+                               "e nunca com o jogo aberto — avisa só quando algo muda"),
+                     font=ctk.CTkFont(FONT, 11), text_color=C["t4"]
+                     ).pack(anchor="w", padx=18, pady=(0, 6))
+        self._health_lbl = ctk.CTkLabel(hc, text="", font=ctk.CTkFont(FONT_MONO, 11),
+                                        text_color=C["t3"], justify="left")
+        self._health_lbl.pack(anchor="w", padx=18, pady=(0, 14))
+
+        # storage
+        stc = ctk.CTkFrame(p, fg_color=C["card"], corner_radius=14,
+                           border_width=1, border_color=C["card_border"])
+        stc.pack(fill="x", padx=28, pady=6)
+        ctk.CTkLabel(stc, text="💽  ARMAZENAMENTO", font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=18, pady=(14, 6))
+        self._storage_btns = ctk.CTkFrame(stc, fg_color="transparent")
+        self._storage_btns.pack(fill="x", padx=18, pady=(0, 6))
+        ctk.CTkButton(self._storage_btns, text="🔗 Deduplicar instalações", height=36,
+                      corner_radius=8, font=ctk.CTkFont(FONT, 12, "bold"),
+                      fg_color=C["blue"], hover_color=C["blue_hover"],
+                      command=self._dedup).pack(side="left", padx=(0, 6))
+        ctk.CTkButton(self._storage_btns, text="📦 Mover instalação", height=36,
+                      corner_radius=8, font=ctk.CTkFont(FONT, 12, "bold"),
+                      fg_color=C["card_hover"], hover_color=C["t4"],
+                      command=self._move_install).pack(side="left", padx=(0, 6))
+        self._storage_msg = ctk.CTkLabel(stc, text="", font=ctk.CTkFont(FONT, 11),
+                                         text_color=C["t3"], justify="left")
+        self._storage_msg.pack(anchor="w", padx=18, pady=(0, 14))
+
         # save
         ctk.CTkButton(p, text="💾   SALVAR CONFIGURAÇÕES",
                       font=ctk.CTkFont(FONT, 16, "bold"), height=52, corner_radius=12,
@@ -916,6 +1534,195 @@ class GTAVLauncher(ctk.CTk):
                       text_color="#000", command=self._save_cfg
                       ).pack(fill="x", padx=28, pady=14)
 
+    # ── background health checks ──
+    def _start_health(self):
+        if not self.health:
+            self.health = HealthScheduler(
+                self.sc_fixer, self.net_mgr,
+                interval=self.config.get("health_interval_min", 30) * 60,
+                is_game_running=lambda: bool(self.game_manager) and self.game_manager.is_game_running(),
+                on_change=lambda changes: self.after(0, lambda: self._notify_health(changes)))
+        self.health.start()
+
+    def _toggle_health(self):
+        self.config["health_checks"] = self._health_var.get()
+        save_config(self.config)
+        if self.config["health_checks"]:
+            self._start_health()
+        elif self.health:
+            self.health.stop()
+        self._refresh_health()
+
+    def _refresh_health(self):
+        if not self.health or not self.health.stats["runs"]:
+            text = "Ativa, primeira verificação em instantes" if self.health and self.health.running else ""
+            self._health_lbl.configure(text=text)
+            return
+        o = self.health.overhead()
+        last = time.strftime("%H:%M", time.localtime(self.health.stats["last_run"]))
+        self._health_lbl.configure(text=(
+            f"Última: {last}  ·  {o['runs']} rodada(s), {o['skipped']} pulada(s) com o jogo aberto\n"
+            f"Custo médio: {o['cpu_ms']:.0f} ms de CPU por rodada ({o['core_share'] * 100:.4f}% de um núcleo)"))
+
+    def _notify_health(self, changes):
+        ico = {"ok": "✅", "warning": "⚠️", "error": "❌", "info": "ℹ️"}
+        text = "\n".join(f"{ico.get(c['status'], '•')}  {c['name']}: {c['message'].splitlines()[0]}"
+                         for c in changes)
+        statuses = {c["status"] for c in changes}
+        color = C["red"] if "error" in statuses else C["orange"] if "warning" in statuses else C["accent"]
+        toast = ctk.CTkFrame(self, fg_color=C["card"], corner_radius=10,
+                             border_width=1, border_color=color)
+        ctk.CTkLabel(toast, text="🩺  Mudança detectada", font=ctk.CTkFont(FONT, 10, "bold"),
+                     text_color=C["t3"]).pack(anchor="w", padx=14, pady=(10, 2))
+        ctk.CTkLabel(toast, text=text, font=ctk.CTkFont(FONT, 12), text_color=C["t1"],
+                     justify="left").pack(anchor="w", padx=14, pady=(0, 10))
+        toast.place(relx=1.0, rely=1.0, x=-20, y=-20, anchor="se")
+        self.after(10000, toast.destroy)
+
+    def _refresh_mods(self):
+        for w in self._mods_list.winfo_children():
+            w.destroy()
+        sets = self.mod_mgr.get_sets() if self.mod_mgr.game_path else []
+        if not sets:
+            ctk.CTkLabel(self._mods_list, text="Nenhum conjunto cadastrado",
+                         font=ctk.CTkFont(FONT, 11), text_color=C["t3"]).pack(anchor="w")
+            return
+        for ms in sets:
+            row = ctk.CTkFrame(self._mods_list, fg_color=C["input_bg"], corner_radius=8)
+            row.pack(fill="x", pady=2)
+            ri = ctk.CTkFrame(row, fg_color="transparent")
+            ri.pack(fill="x", padx=12, pady=8)
+            var = ctk.BooleanVar(value=ms["enabled"])
+            ctk.CTkSwitch(ri, text="", variable=var, width=44,
+                          fg_color=C["t4"], progress_color=C["accent"],
+                          button_color=C["t1"], button_hover_color=C["accent_hover"],
+                          command=lambda n=ms["name"]: self._mods_toggle(n)).pack(side="left")
+            ctk.CTkLabel(ri, text=ms["name"], font=ctk.CTkFont(FONT, 12, "bold"),
+                         text_color=C["t1"]).pack(side="left", padx=(8, 6))
+            ctk.CTkLabel(ri, text=f'{ms["file_count"]} arquivo(s) · {ms["mode"]}',
+                         font=ctk.CTkFont(FONT, 10), text_color=C["t3"]).pack(side="right")
+
+    def _mods_toggle(self, name):
+        ok, msg = self.mod_mgr.toggle_set(name)
+        if not ok:
+            messagebox.showerror("Mods", msg)
+        self._refresh_mods()
+
+    def _mods_new(self):
+        gp = self.mod_mgr.game_path
+        if not gp:
+            messagebox.showerror("Mods", "Configure o caminho do GTA V primeiro.")
+            return
+        d = filedialog.askdirectory(title="Pasta do mod (dentro da pasta do jogo)", initialdir=gp)
+        if not d:
+            return
+        d = os.path.normpath(d)
+        if os.path.commonpath([d, os.path.normpath(gp)]) != os.path.normpath(gp) or d == os.path.normpath(gp):
+            messagebox.showwarning("Mods", "Escolha uma subpasta da pasta do jogo.")
+            return
+        files = [os.path.relpath(os.path.join(r, f), gp)
+                 for r, _, fs in os.walk(d) for f in fs]
+        ok, msg = self.mod_mgr.create_set(os.path.basename(d), files)
+        messagebox.showinfo("Mods", msg) if ok else messagebox.showerror("Mods", msg)
+        self._refresh_mods()
+
+    def _dedup(self):
+        installs = detect_all_game_paths()
+        gp = self.config.get("game_path", "")
+        if gp and os.path.normcase(gp) not in [os.path.normcase(i) for i in installs]:
+            installs.insert(0, gp)
+        if len(installs) < 2:
+            messagebox.showinfo("Deduplicar", "É necessário ter pelo menos duas instalações do GTA V.")
+            return
+        dd = InstallDeduplicator(installs)
+        status = lambda txt: self.after(0, lambda: self._storage_msg.configure(text=txt))
+
+        def t():
+            report = dd.analyze(progress=status)
+            self.after(0, lambda: confirm(report))
+
+        def confirm(report):
+            gb = report["bytes_reclaimable"] / (1024 ** 3)
+            status(f"{report['files']} duplicata(s) · {gb:.2f} GB recuperáveis")
+            if not report["files"] or not messagebox.askyesno(
+                    "Deduplicar",
+                    f"{report['files']} arquivo(s) idênticos encontrados.\n"
+                    f"Espaço recuperável: {gb:.2f} GB\n\nSubstituir por links?"):
+                return
+
+            def apply():
+                _, msg = dd.apply(report, progress=status)
+                # Confere todos os links registrados (inclusive de execuções anteriores)
+                status("🔎 Verificando os arquivos deduplicados…")
+                verified, vmsg = dd.verify()
+                msg += f"\n{vmsg}"
+                show = messagebox.showinfo if verified else messagebox.showerror
+                self.after(0, lambda: (status(msg), show("Deduplicar", msg)))
+            threading.Thread(target=apply, daemon=True).start()
+
+        threading.Thread(target=t, daemon=True).start()
+
+    def _move_install(self):
+        src = self.config.get("game_path", "")
+        if not validate_game_path(src):
+            messagebox.showerror("Mover", "Configure o caminho do GTA V primeiro.")
+            return
+        d = filedialog.askdirectory(title="Novo local da instalação")
+        if not d:
+            return
+        dest = os.path.join(d, os.path.basename(os.path.normpath(src)))
+        if not messagebox.askyesno("Mover", f"Copiar a instalação para:\n{dest}\n\n"
+                                   "A cópia pode ser retomada se for interrompida."):
+            return
+        mover = InstallMover(src, dest)
+        status = lambda txt: self.after(0, lambda: self._storage_msg.configure(text=txt))
+
+        def on_progress(p):
+            eta = f"{p['eta_s'] / 60:.0f} min" if p["eta_s"] is not None else "—"
+            status(f"📦 {p['bytes_done'] / 1024 ** 3:.1f} / {p['bytes_total'] / 1024 ** 3:.1f} GB"
+                   f"  ·  {p['mb_per_s']:.0f} MB/s  ·  ETA {eta}")
+
+        def t():
+            ok, msg = mover.run(progress=on_progress)
+            if ok:
+                status("🔎 Relendo o destino para conferir a cópia…")
+                ok, msg = mover.write_manifest()
+            if ok:
+                verified, vmsg = mover.verify()
+                self.after(0, lambda: done(verified, vmsg))
+            else:
+                self.after(0, lambda: failed(msg))
+
+        def failed(msg):
+            status(msg)
+            messagebox.showerror("Mover", msg)
+
+        def done(verified, msg):
+            status(msg)
+            if not verified:
+                # Os arquivos divergentes saíram do checkpoint: mover de novo recopia só eles
+                messagebox.showerror("Mover", msg)
+                return
+            remove = messagebox.askyesno("Mover", f"Cópia concluída.\n{msg}\n\n"
+                                         "Apagar a instalação antiga?")
+
+            def fin():
+                ok, fmsg = mover.finalize(self.config, remove_source=remove)
+                self.after(0, lambda: finished(ok, fmsg))
+            status("📦 Finalizando…")
+            threading.Thread(target=fin, daemon=True).start()
+
+        def finished(ok, msg):
+            status(msg)
+            if ok:
+                self._path_entry.delete(0, "end")
+                self._path_entry.insert(0, self.config["game_path"])
+                self._save_cfg()
+            else:
+                messagebox.showerror("Mover", msg)
+
+        threading.Thread(target=t, daemon=True).start()
+
     def _browse(self):
         d = filedialog.askdirectory(title="Pasta do GTA V",
                                    initialdir=self.config.get("game_path", "C:\\"))
@@ -939,13 +1746,22 @@ class GTAVLauncher(ctk.CTk):
             return
         self.config["game_path"] = path
         self.config["custom_args"] = self._args_entry.get().strip()
+        self.config["population_density"] = round(self._density.get(), 2)
         save_config(self.config)
         if validate_game_path(path):
             self.game_manager = GameManager(path)
             self.net_mgr.game_path = path
+            self.sc_fixer.game_path = path
+            self.mod_mgr.game_path = path
             self.optimizer = OptimizationManager(path)
         self._refresh_status()
-        messagebox.showinfo("Salvo", "Configurações salvas! ✅")
+        msg = "Configurações salvas! ✅"
+        if self.optimizer and self.optimizer.settings.exists():
+            ok, xml_msg = self.optimizer.settings.apply(
+                {"population_density": self.config["population_density"]})
+            if not ok:
+                msg += f"\n{xml_msg}"
+        messagebox.showinfo("Salvo", msg)
 
     # ══════════════════════════════════════════════════
     #  PAGE — SOBRE
@@ -1024,12 +1840,13 @@ class GTAVLauncher(ctk.CTk):
     # ══════════════════════════════════════════════════
     #  ACTIONS  (play / kill / status)
     # ══════════════════════════════════════════════════
-    def _on_play(self):
+    def _on_play(self, vanilla=False):
         if not self.game_manager:
             messagebox.showerror("Erro", "Configure o caminho do GTA V em Configurações.")
             self._show("settings")
             return
 
+        self._settle_args(flush=True)
         self.config["launch_mode"] = self._mode.get()
         self.config["windowed"] = self._ck_win.get()
         self.config["borderless"] = self._ck_brd.get()
@@ -1037,11 +1854,12 @@ class GTAVLauncher(ctk.CTk):
         save_config(self.config)
 
         self._btn_play.configure(state="disabled", text="⏳  LANÇANDO…")
+        self._btn_vanilla.configure(state="disabled")
         self._lbl_msg.configure(text="Preparando lançamento…", text_color=C["orange"])
         self.update()
 
         def t():
-            ok, msg = self.game_manager.launch_game(self.config)
+            ok, msg = self.game_manager.launch_game(self.config, vanilla=vanilla)
             self.after(0, lambda: self._play_done(ok, msg))
         threading.Thread(target=t, daemon=True).start()
 
@@ -1049,6 +1867,7 @@ class GTAVLauncher(ctk.CTk):
         m = self._mode.get()
         txt = "▶   JOGAR OFFLINE" if m == "offline" else "▶   JOGAR ONLINE"
         self._btn_play.configure(state="normal", text=txt)
+        self._btn_vanilla.configure(state="normal")
         if ok:
             self._lbl_msg.configure(text=msg, text_color=C["accent"])
             self._btn_kill.pack(fill="x", padx=28, pady=(6, 0))
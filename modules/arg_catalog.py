@@ -0,0 +1,217 @@
+"""
+Módulo Argument Catalog - Catálogo de argumentos de linha de comando do GTA V
+Carrega os argumentos e presets de modules/data/arguments.json uma única vez
+e mantém índices por flag, categoria e grupo de conflito, além de validar
+presets e filtrar os argumentos que valem para a build instalada do jogo.
+
+Formato de cada argumento no arquivo:
+    arg, category, name, description, icon, impact   (obrigatórios)
+    value, default      argumento com valor (ex.: "-frameLimit 1")
+    requires            flags que precisam estar presentes junto
+    min_build, max_build  faixa de builds do GTA5.exe em que o argumento existe
+"""
+
+import os
+import json
+import mmap
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+CATALOG_FILE = Path(__file__).parent / "data" / "arguments.json"
+SUPPORTED_VERSION = 1
+
+REQUIRED_FIELDS = ("arg", "category", "name", "description", "icon", "impact")
+
+# VS_FIXEDFILEINFO.dwSignature, seguido de dwStrucVersion, dwFileVersionMS e dwFileVersionLS
+_VERSION_SIGNATURE = b"\xbd\x04\xef\xfe"
+
+
+class ArgumentCatalog:
+    """
+    Argumentos e presets indexados.
+
+    Todos os índices são montados no carregamento; consultas por flag,
+    categoria ou conflito são O(1) e a lista por build é calculada uma vez
+    por build.
+    """
+
+    def __init__(self, data: dict):
+        version = data.get("version")
+        if version != SUPPORTED_VERSION:
+            raise ValueError(f"Versão do catálogo não suportada: {version}")
+        self.version: int = version
+        self.arguments: List[dict] = data.get("arguments", [])
+        self.presets: Dict[str, dict] = data.get("presets", {})
+        self.conflict_groups: Dict[str, List[str]] = data.get("conflict_groups", {})
+
+        self._by_flag: Dict[str, dict] = {}
+        self._by_category: Dict[str, List[dict]] = {}
+        self._groups_of: Dict[str, List[str]] = {}
+        for a in self.arguments:
+            missing = [k for k in REQUIRED_FIELDS if k not in a]
+            if missing:
+                raise ValueError(f"Argumento {a.get('arg', '?')} sem {', '.join(missing)}")
+            key = a["arg"].lower()
+            if key in self._by_flag:
+                raise ValueError(f"Argumento duplicado no catálogo: {a['arg']}")
+            self._by_flag[key] = a
+            self._by_category.setdefault(a["category"], []).append(a)
+        for group, flags in self.conflict_groups.items():
+            for flag in flags:
+                if flag.lower() not in self._by_flag:
+                    raise ValueError(f"Grupo '{group}' cita argumento inexistente: {flag}")
+                self._groups_of.setdefault(flag.lower(), []).append(group)
+        self._applicable: Dict[Optional[int], List[dict]] = {}
+
+        for key, errors in self.validate_presets().items():
+            logger.warning(f"Preset '{key}' inconsistente com o catálogo: {'; '.join(errors)}")
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE) -> "ArgumentCatalog":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # ===== Consulta =====
+
+    def get(self, flag: str) -> Optional[dict]:
+        """Entrada do catálogo para a flag (sem diferenciar maiúsculas)."""
+        return self._by_flag.get(flag.lower())
+
+    def __contains__(self, flag: str) -> bool:
+        return flag.lower() in self._by_flag
+
+    def categories(self) -> List[str]:
+        """Categorias na ordem do arquivo."""
+        return list(self._by_category)
+
+    def in_category(self, category: str) -> List[dict]:
+        return self._by_category.get(category, [])
+
+    def by_category(self, build: Optional[int] = None) -> Dict[str, List[dict]]:
+        """Argumentos agrupados por categoria, só os que valem para a build."""
+        if build is None:
+            return self._by_category
+        grouped: Dict[str, List[dict]] = {}
+        for a in self.applicable(build):
+            grouped.setdefault(a["category"], []).append(a)
+        return grouped
+
+    def conflicts_with(self, flag: str) -> List[str]:
+        """Flags que não podem ser usadas junto com `flag`."""
+        out = []
+        for group in self._groups_of.get(flag.lower(), []):
+            out.extend(f for f in self.conflict_groups[group]
+                       if f.lower() != flag.lower() and f not in out)
+        return out
+
+    def default_values(self, flag: str) -> List[str]:
+        """Valor padrão de um argumento com valor (lista vazia para flags simples)."""
+        a = self.get(flag)
+        return [a["default"]] if a and "default" in a else []
+
+    # ===== Build do jogo =====
+
+    @staticmethod
+    def is_applicable(arg: dict, build: Optional[int]) -> bool:
+        if build is None:
+            return True
+        return (arg.get("min_build") or 0) <= build <= (arg.get("max_build") or build)
+
+    def applicable(self, build: Optional[int]) -> List[dict]:
+        """Argumentos disponíveis na build (todos, se a build for desconhecida)."""
+        if build not in self._applicable:
+            self._applicable[build] = [a for a in self.arguments if self.is_applicable(a, build)]
+        return self._applicable[build]
+
+    # ===== Validação =====
+
+    def check_args(self, args: List[str], build: Optional[int] = None) -> List[str]:
+        """
+        Problemas de uma lista de flags: desconhecidas, fora da build,
+        conflitantes ou sem as flags exigidas.
+        """
+        errors = []
+        present = {a.lower() for a in args}
+        seen_groups = {}
+        for flag in args:
+            a = self.get(flag)
+            if not a:
+                errors.append(f"{flag} não está no catálogo")
+                continue
+            if not self.is_applicable(a, build):
+                errors.append(f"{flag} não existe na build {build}")
+            for req in a.get("requires", []):
+                if req.lower() not in present:
+                    errors.append(f"{flag} exige {req}")
+            for group in self._groups_of.get(flag.lower(), []):
+                other = seen_groups.setdefault(group, flag)
+                if other.lower() != flag.lower():
+                    errors.append(f"{other} e {flag} não podem ser usados juntos")
+        return errors
+
+    def validate_preset(self, preset: dict, build: Optional[int] = None) -> List[str]:
+        return self.check_args(preset.get("args", []) + preset.get("commandline_extra", []), build)
+
+    def validate_presets(self, presets: Optional[dict] = None,
+                         build: Optional[int] = None) -> Dict[str, List[str]]:
+        """Presets com problemas ({chave: [erros]})."""
+        out = {}
+        for key, preset in (self.presets if presets is None else presets).items():
+            errors = self.validate_preset(preset, build)
+            if errors:
+                out[key] = errors
+        return out
+
+
+_catalog: Optional[ArgumentCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ArgumentCatalog:
+    """Catálogo carregado (lido do disco só na primeira chamada)."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ArgumentCatalog.load()
+            logger.info(f"Catálogo de argumentos v{_catalog.version}: "
+                        f"{len(_catalog.arguments)} argumentos, {len(_catalog.presets)} presets")
+        return _catalog
+
+
+_build_cache: Dict[str, Tuple[int, int, Optional[int]]] = {}
+
+
+def get_game_build(game_path: str) -> Optional[int]:
+    """
+    Build do GTA5.exe (terceiro número da versão, ex.: 1.0.3095.0 -> 3095).
+
+    Lida do recurso de versão do executável; o resultado fica em cache
+    enquanto tamanho e mtime do arquivo não mudarem.
+    """
+    exe = os.path.join(game_path, "GTA5.exe")
+    try:
+        st = os.stat(exe)
+    except OSError:
+        return None
+    cached = _build_cache.get(exe)
+    if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+
+    build = None
+    try:
+        with open(exe, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            # O recurso de versão fica perto do fim do executável
+            pos = m.rfind(_VERSION_SIGNATURE)
+            if pos >= 0 and pos + 16 <= len(m):
+                _, _, _, ls = struct.unpack_from("<4I", m, pos)
+                build = ls >> 16
+    except (OSError, ValueError) as e:
+        logger.warning(f"Não foi possível ler a versão do GTA5.exe: {e}")
+    _build_cache[exe] = (st.st_size, st.st_mtime_ns, build)
+    return build
@@ -0,0 +1,497 @@
+"""
+Módulo Backup Store - Backups incrementais com deduplicação e compressão
+Os arquivos são divididos em blocos, cada bloco é guardado uma única vez
+(endereçado pelo hash, comprimido com zlib) e cada snapshot é só um
+manifesto que lista os blocos dos seus arquivos. Fazer backup de uma pasta
+que não mudou grava apenas um novo manifesto.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+BACKUP_DIR = Path(os.environ.get("APPDATA", "")) / "GTAVLauncher" / "backups"
+CHUNKS_DIR = "chunks"
+SNAPSHOTS_DIR = "snapshots"
+CATALOG_FILE = "catalog.json"
+CATALOG_VERSION = 1
+
+CHUNK_SIZE = 1024 * 1024             # 1 MB por bloco
+COMPRESSION_LEVEL = 6
+KEEP_PER_LABEL = 10                  # snapshots mantidos por tipo de backup ("sc_cache", "settings"...)
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class BackupStore:
+    """
+    Repositório de backups.
+
+    Layout:
+        chunks/<2 primeiros>/<hash>   blocos comprimidos
+        snapshots/<id>.json           manifesto de cada snapshot
+        catalog.json                  resumo de todos os snapshots
+
+    O catálogo é mantido por quem grava os backups e guarda o mtime da
+    pasta de manifestos; listar os backups é uma única leitura dele. Se o
+    catálogo faltar ou não bater com a pasta, ele é reconstruído em
+    segundo plano a partir dos manifestos.
+
+    Arquivos com mesmo tamanho e mtime do snapshot anterior da mesma origem
+    reaproveitam a lista de blocos sem serem lidos de novo. A retenção
+    mantém os `keep_per_label` snapshots mais recentes de cada tipo e apaga
+    os blocos que deixaram de ser referenciados.
+    """
+
+    def __init__(self, root=BACKUP_DIR, chunk_size: int = CHUNK_SIZE,
+                 keep_per_label: int = KEEP_PER_LABEL):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.keep_per_label = keep_per_label
+        self._lock = threading.Lock()
+        self._known_chunks: set = set()
+        self._stored = 0                 # bytes gravados pelo backup em andamento
+        self._catalog: Optional[dict] = None
+        self._rebuild_thread: Optional[threading.Thread] = None
+
+    # ===== Caminhos =====
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.root / CHUNKS_DIR / digest[:2] / digest
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.root / SNAPSHOTS_DIR / f"{snapshot_id}.json"
+
+    # ===== Gravação =====
+
+    def _put_chunk(self, data: bytes) -> str:
+        digest = _hash(data)
+        if digest in self._known_chunks:
+            return digest
+        path = self._chunk_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(data, COMPRESSION_LEVEL))
+            os.replace(tmp, path)
+            self._stored += path.stat().st_size
+        self._known_chunks.add(digest)
+        return digest
+
+    def _store_file(self, path: str) -> dict:
+        chunks = []
+        h = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(self.chunk_size)
+                if not data:
+                    break
+                h.update(data)
+                chunks.append(self._put_chunk(data))
+        return {"chunks": chunks, "digest": h.hexdigest()}
+
+    def _walk(self, source: Path) -> Iterator[tuple]:
+        if source.is_file():
+            st = source.stat()
+            yield source.name, str(source), st
+            return
+        for dirpath, _, filenames in os.walk(source):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                yield os.path.relpath(full, source).replace(os.sep, "/"), full, st
+
+    def backup(self, source, label: str, origin=None) -> dict:
+        """
+        Cria um snapshot de `source` (pasta ou arquivo).
+
+        Args:
+            origin: Local original registrado no snapshot, quando `source` é
+                    uma cópia temporária (ex.: pasta em quarentena).
+
+        Returns:
+            O manifesto sem a lista de arquivos: id, label, source, created,
+            files, bytes (tamanho original) e stored_bytes (gravado agora).
+        """
+        source = Path(source)
+        origin = str(origin or source)
+        with self._lock:
+            self._stored = 0
+            previous = self._latest_files(origin)
+            files = []
+            total = 0
+            for rel, full, st in self._walk(source):
+                entry = {"path": rel, "size": st.st_size, "mtime": st.st_mtime_ns}
+                prev = previous.get(rel)
+                if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime_ns \
+                        and all(self._chunk_path(c).exists() for c in prev["chunks"]):
+                    entry["chunks"], entry["digest"] = prev["chunks"], prev["digest"]
+                else:
+                    try:
+                        entry.update(self._store_file(full))
+                    except OSError as e:
+                        logger.warning(f"Backup: '{full}' ignorado: {e}")
+                        continue
+                files.append(entry)
+                total += st.st_size
+
+            created = datetime.now()
+            snapshot_id = f"{label}_{created:%Y%m%d_%H%M%S}"
+            n = 1
+            while self._manifest_path(snapshot_id).exists():
+                n += 1
+                snapshot_id = f"{label}_{created:%Y%m%d_%H%M%S}_{n}"
+            manifest = {
+                "id": snapshot_id,
+                "label": label,
+                "source": origin,
+                "kind": "file" if source.is_file() else "dir",
+                "created": created.isoformat(timespec="milliseconds"),
+                "files": files,
+                "bytes": total,
+                "stored_bytes": self._stored,
+            }
+            self._write_manifest(manifest)
+            self._catalog_update(add=manifest)
+            self._apply_retention(label)
+
+        summary = self._summary(manifest)
+        logger.info(f"Backup {snapshot_id}: {len(files)} arquivo(s), "
+                    f"{total / 1024 / 1024:.1f} MB, {self._stored / 1024 / 1024:.1f} MB gravados")
+        return summary
+
+    def _write_manifest(self, manifest: dict):
+        path = self._manifest_path(manifest["id"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    # ===== Consulta =====
+
+    def _manifest_ids(self) -> List[str]:
+        folder = self.root / SNAPSHOTS_DIR
+        if not folder.is_dir():
+            return []
+        return sorted(e.name[:-5] for e in os.scandir(folder) if e.name.endswith(".json"))
+
+    def get_manifest(self, snapshot_id: str) -> Optional[dict]:
+        try:
+            with open(self._manifest_path(snapshot_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    # ===== Catálogo =====
+
+    @staticmethod
+    def _summary(manifest: dict) -> dict:
+        summary = {k: v for k, v in manifest.items() if k != "files"}
+        summary["files"] = len(manifest["files"])
+        return summary
+
+    def _snapshots_mtime(self) -> Optional[int]:
+        try:
+            return (self.root / SNAPSHOTS_DIR).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_catalog(self) -> Optional[dict]:
+        if self._catalog is None:
+            try:
+                with open(self.root / CATALOG_FILE, "r", encoding="utf-8") as f:
+                    catalog = json.load(f)
+                if catalog.get("version") == CATALOG_VERSION:
+                    self._catalog = catalog
+            except (OSError, json.JSONDecodeError):
+                pass
+        return self._catalog
+
+    def _save_catalog(self, snapshots: Dict[str, dict]):
+        self._catalog = {
+            "version": CATALOG_VERSION,
+            "snapshots_mtime": self._snapshots_mtime(),
+            "snapshots": snapshots,
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / CATALOG_FILE
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._catalog, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _catalog_update(self, add: Optional[dict] = None, remove: List[str] = ()):
+        # Chamado com o catálogo já consistente antes da alteração
+        catalog = self._load_catalog()
+        if catalog is None:
+            self.rebuild_catalog(locked=True)
+            return
+        snapshots = dict(catalog["snapshots"])
+        if add:
+            snapshots[add["id"]] = self._summary(add)
+        for sid in remove:
+            snapshots.pop(sid, None)
+        self._save_catalog(snapshots)
+
+    def is_catalog_consistent(self) -> bool:
+        """True se o catálogo existe e corresponde à pasta de manifestos."""
+        catalog = self._load_catalog()
+        return catalog is not None and catalog["snapshots_mtime"] == self._snapshots_mtime()
+
+    def rebuild_catalog(self, locked: bool = False) -> int:
+        """Reconstrói o catálogo lendo todos os manifestos; retorna quantos snapshots há."""
+        if not locked:
+            with self._lock:
+                return self.rebuild_catalog(locked=True)
+        snapshots = {}
+        for sid in self._manifest_ids():
+            m = self.get_manifest(sid)
+            if m:
+                snapshots[sid] = self._summary(m)
+        self._save_catalog(snapshots)
+        logger.info(f"Catálogo de backups reconstruído: {len(snapshots)} snapshot(s)")
+        return len(snapshots)
+
+    def _rebuild_in_background(self, on_rebuilt: Optional[Callable[[], None]]):
+        if self._rebuild_thread and self._rebuild_thread.is_alive():
+            return
+
+        def run():
+            try:
+                self.rebuild_catalog()
+            except OSError as e:
+                logger.warning(f"Falha ao reconstruir o catálogo de backups: {e}")
+                return
+            if on_rebuilt:
+                on_rebuilt()
+
+        self._rebuild_thread = threading.Thread(target=run, daemon=True)
+        self._rebuild_thread.start()
+
+    def list_snapshots(self, on_rebuilt: Optional[Callable[[], None]] = None) -> List[dict]:
+        """
+        Snapshots (sem a lista de arquivos), do mais recente para o mais antigo.
+
+        Lê só o catálogo. Se ele estiver ausente ou desatualizado, retorna o
+        que houver e o reconstrói em segundo plano, chamando `on_rebuilt`
+        ao terminar.
+        """
+        catalog = self._load_catalog()
+        if not self.is_catalog_consistent():
+            if self._snapshots_mtime() is not None:
+                self._rebuild_in_background(on_rebuilt)
+        snapshots = list(catalog["snapshots"].values()) if catalog else []
+        return sorted(snapshots, key=lambda m: m["created"], reverse=True)
+
+    def _latest_files(self, source: str) -> Dict[str, dict]:
+        if not self.is_catalog_consistent():
+            self.rebuild_catalog(locked=True)
+        candidates = [m for m in self._catalog["snapshots"].values() if m["source"] == source]
+        for summary in sorted(candidates, key=lambda m: m["created"], reverse=True):
+            latest = self.get_manifest(summary["id"])
+            if latest:
+                return {f["path"]: f for f in latest["files"]}
+        return {}
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Conteúdo original de um bloco (ValueError se estiver corrompido)."""
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if _hash(data) != digest:
+            raise ValueError(f"Bloco corrompido: {digest}")
+        return data
+
+    def read_file(self, entry: dict) -> Iterator[bytes]:
+        """Conteúdo de um arquivo do manifesto, bloco a bloco."""
+        for digest in entry["chunks"]:
+            yield self.read_chunk(digest)
+
+    # ===== Restauração =====
+
+    def _file_digest(self, path: str) -> str:
+        h = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as f:
+            for data in iter(lambda: f.read(self.chunk_size), b""):
+                h.update(data)
+        return h.hexdigest()
+
+    def plan_restore(self, snapshot_id: str, target=None) -> Optional[dict]:
+        """
+        Diferenças entre o snapshot e o destino atual (modo simulação).
+
+        Returns:
+            Dict com "target", "kind", "add", "modify", "delete" (caminhos
+            relativos) e "unchanged" (quantidade), ou None se o snapshot
+            não existir.
+        """
+        manifest = self.get_manifest(snapshot_id)
+        if not manifest:
+            return None
+        target = Path(target or manifest["source"])
+        current = {}
+        if manifest["kind"] == "file":
+            if target.is_file():
+                current[manifest["files"][0]["path"] if manifest["files"] else target.name] = str(target)
+        elif target.is_dir():
+            current = {rel: full for rel, full, _ in self._walk(target)}
+
+        plan = {"target": str(target), "kind": manifest["kind"],
+                "add": [], "modify": [], "delete": [], "unchanged": 0}
+        for entry in manifest["files"]:
+            full = current.pop(entry["path"], None)
+            if full is None:
+                plan["add"].append(entry["path"])
+                continue
+            st = os.stat(full)
+            same = st.st_size == entry["size"] and (
+                st.st_mtime_ns == entry["mtime"] or self._file_digest(full) == entry["digest"])
+            if same:
+                plan["unchanged"] += 1
+            else:
+                plan["modify"].append(entry["path"])
+        plan["delete"] = sorted(current)
+        return plan
+
+    def _restore_file(self, entry: dict, dest: str):
+        """Grava um arquivo do snapshot conferindo o hash enquanto escreve."""
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        h = hashlib.blake2b(digest_size=32)
+        with open(dest, "wb") as f:
+            for data in self.read_file(entry):
+                h.update(data)
+                f.write(data)
+        if h.hexdigest() != entry["digest"]:
+            raise ValueError(f"Hash não confere: {entry['path']}")
+        os.utime(dest, ns=(entry["mtime"], entry["mtime"]))
+
+    def restore(self, snapshot_id: str, target=None, workers: int = 4) -> Tuple[bool, str]:
+        """
+        Restaura um snapshot no local de origem (ou em `target`).
+
+        Os arquivos são gravados em paralelo numa pasta irmã do destino, com
+        o hash conferido durante a escrita; só depois a pasta atual é trocada
+        pela restaurada (renomeações). Uma falha em qualquer ponto deixa o
+        destino como estava.
+        """
+        manifest = self.get_manifest(snapshot_id)
+        if not manifest:
+            return False, f"❌ Backup '{snapshot_id}' não encontrado."
+        target = Path(target or manifest["source"])
+        staging = target.with_name(f".{target.name}.restore-tmp")
+        previous = target.with_name(f".{target.name}.restore-old")
+
+        if manifest["kind"] == "file":
+            if not manifest["files"]:
+                return False, f"❌ Backup '{snapshot_id}' está vazio."
+            entry = manifest["files"][0]
+            try:
+                self._restore_file(entry, str(staging))
+                os.replace(staging, target)
+            except (OSError, ValueError) as e:
+                staging.unlink(missing_ok=True)
+                return False, f"❌ Falha ao restaurar {target.name}: {str(e)}"
+            return True, f"✅ {target.name} restaurado do backup de {manifest['created'][:16].replace('T', ' ')}."
+
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            staging.mkdir(parents=True)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [pool.submit(self._restore_file, e, str(staging / e["path"]))
+                           for e in manifest["files"]]
+                for future in futures:
+                    future.result()
+        except (OSError, ValueError) as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False, f"❌ Falha ao restaurar (nada foi alterado): {str(e)}"
+
+        # Troca: destino atual -> .restore-old, restaurado -> destino
+        shutil.rmtree(previous, ignore_errors=True)
+        try:
+            if target.exists():
+                os.rename(target, previous)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                if previous.exists():
+                    os.rename(previous, target)
+                raise
+        except OSError as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False, (f"❌ Não foi possível substituir {target}: {str(e)}\n"
+                           "Feche o Social Club / Rockstar Launcher e tente novamente.")
+        shutil.rmtree(previous, ignore_errors=True)
+        logger.info(f"Backup {snapshot_id} restaurado em {target}")
+        return True, (f"✅ {len(manifest['files'])} arquivo(s) restaurado(s) do backup de "
+                      f"{manifest['created'][:16].replace('T', ' ')}.")
+
+    # ===== Retenção =====
+
+    def _apply_retention(self, label: str):
+        snapshots = [m for m in self._catalog["snapshots"].values() if m["label"] == label]
+        snapshots.sort(key=lambda m: m["created"], reverse=True)
+        expired = [m["id"] for m in snapshots[self.keep_per_label:]]
+        if not expired:
+            return
+        for sid in expired:
+            self._manifest_path(sid).unlink(missing_ok=True)
+        self._catalog_update(remove=expired)
+        removed = self.collect_garbage()
+        logger.info(f"Backups '{label}': {len(expired)} snapshot(s) antigo(s) e "
+                    f"{removed} bloco(s) sem uso removidos")
+
+    def delete(self, snapshot_id: str) -> bool:
+        """Remove um snapshot e os blocos que só ele usava."""
+        with self._lock:
+            path = self._manifest_path(snapshot_id)
+            if not path.exists():
+                return False
+            if not self.is_catalog_consistent():
+                self.rebuild_catalog(locked=True)
+            path.unlink()
+            self._catalog_update(remove=[snapshot_id])
+            self.collect_garbage()
+            return True
+
+    def collect_garbage(self) -> int:
+        """Apaga os blocos não referenciados por nenhum manifesto."""
+        used = set()
+        for sid in self._manifest_ids():
+            m = self.get_manifest(sid)
+            if m:
+                for f in m["files"]:
+                    used.update(f["chunks"])
+        removed = 0
+        chunks = self.root / CHUNKS_DIR
+        if chunks.is_dir():
+            for sub in os.scandir(chunks):
+                if not sub.is_dir():
+                    continue
+                for e in os.scandir(sub.path):
+                    if e.name not in used:
+                        try:
+                            os.remove(e.path)
+                            removed += 1
+                        except OSError:
+                            pass
+        self._known_chunks &= used
+        return removed
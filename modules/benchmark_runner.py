@@ -0,0 +1,258 @@
+"""
+Módulo Benchmark Runner - Executa o benchmark integrado do GTA V
+Lança o jogo com -benchmark, aguarda o fim da sessão e importa os arquivos
+de resultado de Documents\\Rockstar Games\\GTA V\\Benchmarks.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+DOCUMENTS_DIR = Path(os.environ.get("USERPROFILE", "")) / "Documents" / "Rockstar Games" / "GTA V"
+BENCHMARKS_DIR = DOCUMENTS_DIR / "Benchmarks"
+SETTINGS_XML = DOCUMENTS_DIR / "settings.xml"
+INDEX_FILE = CONFIG_DIR / "benchmarks.json"
+
+BENCHMARK_ARGS = ["-benchmark", "-benchmarkFrameTimes"]
+
+_PASS_TRIPLE = re.compile(r"^Pass\s+(\d+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)")
+_PASS_FRAMES = re.compile(r"^Pass\s+(\d+)\s*:\s*(\d+)\s*/\s*(\d+)")
+_PERCENTILE_HEAD = re.compile(r"^Percentiles in ms for pass\s+(\d+)", re.I)
+_PERCENTILE = re.compile(r"^(\d+)%\s*,\s*([\d.]+)")
+_FRAME_TIMES_HEAD = re.compile(r"^Frame\s*Times.*pass\s+(\d+)", re.I)
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_benchmark_file(path: str) -> dict:
+    """
+    Converte um arquivo Benchmark-*.txt em dados estruturados por passe.
+
+    Returns:
+        Dict com "passes" (fps/frame time min-max-média, frames abaixo de
+        16/33 ms, percentis e, se presentes, os tempos de cada frame),
+        "system" e "settings".
+    """
+    passes: Dict[int, dict] = {}
+    system: List[str] = []
+    settings: Dict[str, str] = {}
+
+    def get(n: int) -> dict:
+        return passes.setdefault(n, {"pass": n})
+
+    section = None
+    current = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            lower = line.lower()
+
+            if lower.startswith("frames per second"):
+                section = "fps"
+                continue
+            if lower.startswith("time in milliseconds"):
+                section = "frame_ms"
+                continue
+            if lower.startswith("frames under 16ms"):
+                section = "under_16ms"
+                continue
+            if lower.startswith("frames under 33ms"):
+                section = "under_33ms"
+                continue
+            if lower.startswith("=== system"):
+                section = "system"
+                continue
+            if lower.startswith("=== settings"):
+                section = "settings"
+                continue
+            m = _PERCENTILE_HEAD.match(line)
+            if m:
+                section, current = "percentiles", get(int(m.group(1)))
+                current["percentiles"] = {}
+                continue
+            m = _FRAME_TIMES_HEAD.match(line)
+            if m:
+                section, current = "frame_times", get(int(m.group(1)))
+                current["frame_times"] = []
+                continue
+
+            if section in ("fps", "frame_ms"):
+                m = _PASS_TRIPLE.match(line)
+                if m:
+                    get(int(m.group(1)))[section] = {
+                        "min": float(m.group(2)),
+                        "max": float(m.group(3)),
+                        "avg": float(m.group(4)),
+                    }
+            elif section in ("under_16ms", "under_33ms"):
+                m = _PASS_FRAMES.match(line)
+                if m:
+                    get(int(m.group(1)))[section] = [int(m.group(2)), int(m.group(3))]
+            elif section == "percentiles":
+                m = _PERCENTILE.match(line)
+                if m:
+                    current["percentiles"][m.group(1)] = float(m.group(2))
+            elif section == "frame_times":
+                current["frame_times"].extend(float(x) for x in _NUMBER.findall(line))
+            elif section == "system":
+                system.append(line)
+            elif section == "settings":
+                key, sep, value = line.partition(":")
+                if sep:
+                    settings[key.strip()] = value.strip()
+
+    return {
+        "passes": [passes[n] for n in sorted(passes)],
+        "system": system,
+        "settings": settings,
+    }
+
+
+def _settings_hash() -> Optional[str]:
+    try:
+        return hashlib.blake2b(SETTINGS_XML.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+class BenchmarkRunner:
+    """Executa o benchmark e mantém um índice incremental dos resultados."""
+
+    def __init__(self, game_manager=None, optimizer=None,
+                 results_dir: Path = BENCHMARKS_DIR, index_path: Path = INDEX_FILE):
+        self.game_manager = game_manager
+        self.optimizer = optimizer
+        self.results_dir = Path(results_dir)
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._index: Optional[dict] = None
+
+    # ===== Índice =====
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            self._index = {"files": {}}
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as f:
+                        self._index = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"Índice de benchmarks ilegível, recriando: {e}")
+        return self._index
+
+    def _save_index(self):
+        if self.index_path == INDEX_FILE:
+            ensure_config_dir()
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def ingest(self) -> List[dict]:
+        """
+        Importa apenas os arquivos de resultado novos ou alterados.
+
+        Returns:
+            Lista dos resultados recém-importados.
+        """
+        new = []
+        with self._lock:
+            index = self._load_index()
+            files = index["files"]
+            if not self.results_dir.is_dir():
+                return new
+            with os.scandir(self.results_dir) as it:
+                for entry in it:
+                    if not entry.is_file() or not entry.name.lower().endswith(".txt"):
+                        continue
+                    st = entry.stat()
+                    known = files.get(entry.name)
+                    if known and known["size"] == st.st_size and known["mtime"] == st.st_mtime_ns:
+                        continue
+                    try:
+                        parsed = parse_benchmark_file(entry.path)
+                    except OSError as e:
+                        logger.warning(f"Falha ao ler {entry.name}: {e}")
+                        continue
+                    record = {
+                        "file": entry.name,
+                        "size": st.st_size,
+                        "mtime": st.st_mtime_ns,
+                        "date": datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"),
+                        "context": known.get("context") if known else None,
+                        **parsed,
+                    }
+                    files[entry.name] = record
+                    new.append(record)
+            if new:
+                self._save_index()
+        return new
+
+    def get_results(self) -> List[dict]:
+        """Todos os resultados conhecidos, do mais recente para o mais antigo."""
+        self.ingest()
+        with self._lock:
+            return sorted(self._load_index()["files"].values(),
+                          key=lambda r: r["mtime"], reverse=True)
+
+    # ===== Execução =====
+
+    def run(self, config: dict, preset_key: Optional[str] = None,
+            extra_args: Optional[List[str]] = None) -> Tuple[bool, str, List[dict]]:
+        """
+        Lança o benchmark, espera o jogo fechar e importa os resultados,
+        associando-os ao preset, argumentos e settings.xml usados.
+
+        Args:
+            extra_args: Argumentos adicionais do benchmark (ex.: ["-benchmarkPass", "2"]).
+        """
+        if not self.game_manager:
+            return False, "❌ Caminho do GTA V não configurado.", []
+
+        self.ingest()   # resultados antigos não são atribuídos a esta execução
+        started = time.time()
+        context = {
+            "preset": preset_key,
+            "commandline": self.optimizer.get_current_args() if self.optimizer else [],
+            "launch_args": [],
+            "settings_hash": _settings_hash(),
+            "started": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+        }
+
+        cfg = dict(config)
+        cfg["custom_args"] = " ".join([config.get("custom_args", "")] + BENCHMARK_ARGS
+                                      + list(extra_args or [])).strip()
+        context["launch_args"] = self.game_manager.build_launch_args(cfg)
+
+        ok, msg = self.game_manager.launch_game(cfg)
+        if not ok:
+            return False, msg, []
+
+        if not self.game_manager.wait_for_session_end():
+            return False, "❌ O benchmark não iniciou.", []
+
+        new = [r for r in self.ingest() if r["mtime"] >= int(started * 1e9)]
+        if not new:
+            return False, "⚠️ O jogo fechou sem gerar resultado de benchmark.", []
+
+        with self._lock:
+            for record in new:
+                record["context"] = context
+            self._save_index()
+
+        avg = [p["fps"]["avg"] for r in new for p in r["passes"] if "fps" in p]
+        summary = f" Média: {sum(avg) / len(avg):.1f} FPS." if avg else ""
+        return True, f"✅ Benchmark concluído ({len(new)} resultado(s)).{summary}", new
@@ -0,0 +1,178 @@
+"""
+Módulo CommandLine History - Histórico de versões do commandline.txt
+Guarda cada gravação como snapshot endereçado por conteúdo (conteúdos
+iguais são armazenados uma vez só), com data, origem, diff e restauração.
+"""
+
+import os
+import json
+import difflib
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+HISTORY_DIR = CONFIG_DIR / "cmdline_history"
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+
+MAX_VERSIONS = 200                   # por instalação
+MAX_BYTES = 1024 * 1024              # soma dos snapshots guardados
+
+
+def _digest(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CommandLineHistory:
+    """
+    Histórico de versões do commandline.txt.
+
+    O índice fica em memória: versões por id (dict) e a ordem por
+    instalação (lista), então consultar ou restaurar uma versão é O(1).
+    Cada snapshot é um arquivo nomeado pelo hash do conteúdo; a retenção
+    remove as versões mais antigas e apaga os snapshots sem referência.
+    """
+
+    def __init__(self, root=HISTORY_DIR, max_versions: int = MAX_VERSIONS,
+                 max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.max_versions = max_versions
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional[dict] = None
+
+    # ===== Índice =====
+
+    def _objects(self) -> str:
+        return os.path.join(self.root, OBJECTS_DIR)
+
+    def _load(self) -> dict:
+        if self._index is None:
+            self._index = {"next_id": 1, "versions": {}, "objects": {}}
+            path = os.path.join(self.root, INDEX_FILE)
+            if os.path.isfile(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._index = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"Histórico do commandline ilegível, recriando: {e}")
+            # Ordem por instalação, reconstruída a partir dos ids
+            self._by_path: Dict[str, List[str]] = {}
+            for vid in sorted(self._index["versions"], key=int):
+                self._by_path.setdefault(self._index["versions"][vid]["path"], []).append(vid)
+        return self._index
+
+    def _save(self):
+        if self.root == HISTORY_DIR:
+            ensure_config_dir()
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, INDEX_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    # ===== Gravação =====
+
+    def record(self, path: str, content: str, origin: str) -> Optional[dict]:
+        """
+        Registra uma versão do commandline.txt.
+
+        Args:
+            path: Caminho do commandline.txt (uma linha do tempo por instalação).
+            content: Conteúdo gravado.
+            origin: "preset:<chave>", "recommended", "manual", "rollback:<id>"...
+
+        Returns:
+            A versão criada, ou None se o conteúdo for igual ao da última.
+        """
+        key = os.path.normcase(os.path.normpath(path))
+        digest = _digest(content)
+        with self._lock:
+            index = self._load()
+            timeline = self._by_path.setdefault(key, [])
+            if timeline and index["versions"][timeline[-1]]["hash"] == digest:
+                return None
+
+            objects = index["objects"]
+            if digest not in objects:
+                os.makedirs(self._objects(), exist_ok=True)
+                obj = os.path.join(self._objects(), digest)
+                with open(obj + ".tmp", "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(obj + ".tmp", obj)
+                objects[digest] = {"refs": 0, "size": len(content.encode("utf-8"))}
+            objects[digest]["refs"] += 1
+
+            vid = str(index["next_id"])
+            index["next_id"] += 1
+            version = {
+                "id": vid,
+                "path": key,
+                "hash": digest,
+                "origin": origin,
+                "date": datetime.now().isoformat(timespec="seconds"),
+            }
+            index["versions"][vid] = version
+            timeline.append(vid)
+            self._apply_retention(timeline)
+            self._save()
+            return dict(version)
+
+    def _apply_retention(self, timeline: List[str]):
+        index = self._load()
+        stored = sum(o["size"] for o in index["objects"].values())
+        # Sempre mantém a versão mais recente
+        while len(timeline) > 1 and (len(timeline) > self.max_versions or stored > self.max_bytes):
+            vid = timeline.pop(0)
+            digest = index["versions"].pop(vid)["hash"]
+            obj = index["objects"][digest]
+            obj["refs"] -= 1
+            if obj["refs"] <= 0:
+                stored -= obj["size"]
+                del index["objects"][digest]
+                try:
+                    os.remove(os.path.join(self._objects(), digest))
+                except OSError:
+                    pass
+
+    # ===== Consulta =====
+
+    def get_versions(self, path: str, limit: Optional[int] = None) -> List[dict]:
+        """Versões de uma instalação, da mais recente para a mais antiga."""
+        key = os.path.normcase(os.path.normpath(path))
+        with self._lock:
+            index = self._load()
+            ids = self._by_path.get(key, [])
+            ids = ids[::-1] if limit is None else ids[:-limit - 1:-1]
+            return [dict(index["versions"][v]) for v in ids]
+
+    def get_version(self, version_id: str) -> Optional[dict]:
+        with self._lock:
+            v = self._load()["versions"].get(str(version_id))
+            return dict(v) if v else None
+
+    def get_content(self, version_id: str) -> Optional[str]:
+        """Conteúdo de uma versão."""
+        version = self.get_version(version_id)
+        if not version:
+            return None
+        try:
+            with open(os.path.join(self._objects(), version["hash"]), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Snapshot {version['hash']} ausente: {e}")
+            return None
+
+    def diff(self, old_id: str, new_content: str) -> str:
+        """Diff (unificado) entre uma versão e o conteúdo informado."""
+        old = self.get_content(old_id) or ""
+        return "\n".join(difflib.unified_diff(
+            old.splitlines(), new_content.splitlines(),
+            fromfile=f"versão {old_id}", tofile="atual", lineterm=""))
@@ -0,0 +1,212 @@
+"""
+Módulo CommandLine - Modelo em memória do commandline.txt do GTA V
+Mantém o arquivo carregado, agrupa edições em transações gravadas de uma
+vez (arquivo temporário + os.replace) e preserva valores e linhas que não
+são flags, como "-frameLimit 2".
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+class _Item:
+    """Uma flag com seus valores, ou uma linha que não começa com flag."""
+
+    __slots__ = ("flag", "values", "raw")
+
+    def __init__(self, flag: Optional[str], values: List[str], raw: Optional[str] = None):
+        self.flag = flag
+        self.values = values
+        self.raw = raw          # texto original da linha, mantido enquanto não for editado
+
+    @property
+    def key(self) -> Optional[str]:
+        return self.flag.lower() if self.flag else None
+
+    def text(self) -> str:
+        if self.raw is not None:
+            return self.raw
+        return " ".join(([self.flag] if self.flag else []) + self.values)
+
+
+def _is_flag(token: str) -> bool:
+    return token.startswith("-") and len(token) > 1 and not token[1:2].isdigit()
+
+
+def parse(content: str) -> List[_Item]:
+    """Converte o texto em itens; cada flag leva os tokens seguintes que não são flags."""
+    items: List[_Item] = []
+    for line in content.splitlines():
+        tokens = line.split()
+        if not tokens:
+            continue
+        line_items: List[_Item] = []
+        for tok in tokens:
+            if _is_flag(tok):
+                line_items.append(_Item(tok, []))
+            elif line_items:
+                line_items[-1].values.append(tok)
+            else:
+                line_items.append(_Item(None, [tok]))
+        if len(line_items) == 1:
+            line_items[0].raw = line.rstrip()
+        items.extend(line_items)
+    return items
+
+
+class Transaction:
+    """Conjunto de edições aplicadas juntas e gravadas em uma única escrita."""
+
+    def __init__(self):
+        self._ops: List[Callable[[List[_Item]], None]] = []
+
+    def add(self, flag: str, *values: str) -> "Transaction":
+        """Adiciona a flag (ou atualiza seus valores, se já existir)."""
+        def op(items):
+            for i, it in enumerate(items):
+                if it.key == flag.lower():
+                    if values and list(values) != it.values:
+                        # Item novo: o do documento só muda se a gravação der certo
+                        items[i] = _Item(it.flag, list(values))
+                    return
+            items.append(_Item(flag, list(values)))
+        self._ops.append(op)
+        return self
+
+    def remove(self, flag: str) -> "Transaction":
+        """Remove todas as ocorrências da flag (e seus valores)."""
+        self._ops.append(lambda items: items.__setitem__(
+            slice(None), [it for it in items if it.key != flag.lower()]))
+        return self
+
+    def set(self, flag: str, enabled: bool, *values: str) -> "Transaction":
+        return self.add(flag, *values) if enabled else self.remove(flag)
+
+    def move(self, flag: str, index: int) -> "Transaction":
+        """Reposiciona a flag na lista."""
+        def op(items):
+            for i, it in enumerate(items):
+                if it.key == flag.lower():
+                    items.insert(index, items.pop(i))
+                    return
+        self._ops.append(op)
+        return self
+
+    def replace(self, content: str) -> "Transaction":
+        """Substitui todo o conteúdo (ex.: editor de texto ou preset)."""
+        self._ops.append(lambda items: items.__setitem__(slice(None), parse(content)))
+        return self
+
+    def clear(self) -> "Transaction":
+        self._ops.append(lambda items: items.clear())
+        return self
+
+    def apply_to(self, items: List[_Item]) -> List[_Item]:
+        items = list(items)
+        for op in self._ops:
+            op(items)
+        return items
+
+
+class CommandLineDocument:
+    """
+    O commandline.txt mantido em memória.
+
+    Leituras usam a cópia em memória; o arquivo só é relido quando o mtime
+    muda (edição externa). As edições de uma transação são aplicadas sobre
+    o conteúdo mais recente e gravadas atomicamente uma única vez.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._items: List[_Item] = []
+        self._mtime: Optional[int] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Relê o arquivo se ele mudou no disco; retorna True se recarregou."""
+        with self._lock:
+            mtime = self._stat_mtime()
+            if self._loaded and not force and mtime == self._mtime:
+                return False
+            content = ""
+            if mtime is not None:
+                with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                    content = f.read()
+            self._items = parse(content)
+            self._mtime = mtime
+            self._loaded = True
+            return True
+
+    # ===== Leitura =====
+
+    def text(self) -> str:
+        self.refresh()
+        return "\n".join(it.text() for it in self._items)
+
+    @property
+    def flags(self) -> List[str]:
+        """Flags na ordem do arquivo (sem valores)."""
+        self.refresh()
+        return [it.flag for it in self._items if it.flag]
+
+    def has(self, flag: str) -> bool:
+        return flag.lower() in {f.lower() for f in self.flags}
+
+    def get_values(self, flag: str) -> Optional[List[str]]:
+        """Valores associados à flag (None se ausente)."""
+        self.refresh()
+        for it in self._items:
+            if it.key == flag.lower():
+                return list(it.values)
+        return None
+
+    # ===== Escrita =====
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa edições:
+
+            with doc.transaction() as tx:
+                tx.add("-high").remove("-DX10").move("-high", 0)
+
+        Nada é gravado se o bloco levantar exceção.
+        """
+        tx = Transaction()
+        yield tx
+        self.commit(tx)
+
+    def commit(self, tx: Transaction) -> bool:
+        """Aplica a transação e grava o arquivo; retorna False se nada mudou."""
+        with self._lock:
+            self.refresh()      # edições externas entram antes das nossas
+            before = [it.text() for it in self._items]
+            items = tx.apply_to(self._items)
+            if [it.text() for it in items] == before and self._mtime is not None:
+                return False
+            self._write(items)
+            self._items = items
+            return True
+
+    def _write(self, items: List[_Item]):
+        text = "\n".join(it.text() for it in items)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text + "\n" if text else "")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._mtime = self._stat_mtime()
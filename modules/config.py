@@ -5,9 +5,13 @@ Gerencia todas as configurações e caminhos do jogo.
 
 import json
 import os
-import winreg
 from pathlib import Path
 
+try:
+    import winreg
+except ImportError:  # fora do Windows (ferramentas e testes)
+    winreg = None
+
 
 CONFIG_DIR = Path(os.environ.get("APPDATA", "")) / "GTAVLauncher"
 CONFIG_FILE = CONFIG_DIR / "config.json"
@@ -27,6 +31,10 @@ DEFAULT_CONFIG = {
     "population_density": 1.0,
     "last_played_mode": "offline",
     "theme": "dark",
+    "known_installs": [],               # instalações conhecidas (ex.: após mover)
+    "storage_benchmark": None,          # último resultado do teste de disco
+    "health_checks": False,             # verificações periódicas em segundo plano
+    "health_interval_min": 30,
 }
 
 
@@ -51,10 +59,14 @@ def load_config() -> dict:
 
 
 def save_config(config: dict):
-    """Salva as configurações no arquivo JSON."""
+    """Salva as configurações no arquivo JSON (escrita atômica)."""
     ensure_config_dir()
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+    tmp = CONFIG_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(config, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CONFIG_FILE)
 
 
 def detect_game_path() -> str:
@@ -62,46 +74,60 @@ def detect_game_path() -> str:
     Tenta detectar automaticamente o caminho de instalação do GTA V.
     Verifica: Registry (Rockstar), Steam, Epic Games.
     """
+    paths = detect_all_game_paths()
+    return paths[0] if paths else ""
+
+
+def detect_all_game_paths() -> list:
+    """
+    Retorna todas as instalações do GTA V encontradas (ex.: Steam + Epic),
+    na ordem de prioridade usada por detect_game_path.
+    """
     possible_paths = []
 
-    # 1. Verificar Registry do Rockstar Games Launcher
-    try:
-        key = winreg.OpenKey(
-            winreg.HKEY_LOCAL_MACHINE,
-            r"SOFTWARE\WOW6432Node\Rockstar Games\Grand Theft Auto V"
-        )
-        path, _ = winreg.QueryValueEx(key, "InstallFolder")
-        winreg.CloseKey(key)
-        if path:
-            possible_paths.append(path)
-    except (OSError, FileNotFoundError):
-        pass
-
-    # 2. Verificar Registry do Rockstar (32-bit)
-    try:
-        key = winreg.OpenKey(
-            winreg.HKEY_LOCAL_MACHINE,
-            r"SOFTWARE\Rockstar Games\Grand Theft Auto V"
-        )
-        path, _ = winreg.QueryValueEx(key, "InstallFolder")
-        winreg.CloseKey(key)
-        if path:
-            possible_paths.append(path)
-    except (OSError, FileNotFoundError):
-        pass
-
-    # 3. Verificar Steam
-    try:
-        key = winreg.OpenKey(
-            winreg.HKEY_LOCAL_MACHINE,
-            r"SOFTWARE\WOW6432Node\Valve\Steam"
-        )
-        steam_path, _ = winreg.QueryValueEx(key, "InstallPath")
-        winreg.CloseKey(key)
-        steam_gta = os.path.join(steam_path, "steamapps", "common", "Grand Theft Auto V")
-        possible_paths.append(steam_gta)
-    except (OSError, FileNotFoundError):
-        pass
+    # 0. Instalações já conhecidas pelo launcher (ex.: movidas pelo launcher)
+    if CONFIG_FILE.exists():
+        possible_paths.extend(load_config().get("known_installs", []))
+
+    if winreg is not None:
+        # 1. Verificar Registry do Rockstar Games Launcher
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\WOW6432Node\Rockstar Games\Grand Theft Auto V"
+            )
+            path, _ = winreg.QueryValueEx(key, "InstallFolder")
+            winreg.CloseKey(key)
+            if path:
+                possible_paths.append(path)
+        except (OSError, FileNotFoundError):
+            pass
+
+        # 2. Verificar Registry do Rockstar (32-bit)
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\Rockstar Games\Grand Theft Auto V"
+            )
+            path, _ = winreg.QueryValueEx(key, "InstallFolder")
+            winreg.CloseKey(key)
+            if path:
+                possible_paths.append(path)
+        except (OSError, FileNotFoundError):
+            pass
+
+        # 3. Verificar Steam
+        try:
+            key = winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\WOW6432Node\Valve\Steam"
+            )
+            steam_path, _ = winreg.QueryValueEx(key, "InstallPath")
+            winreg.CloseKey(key)
+            steam_gta = os.path.join(steam_path, "steamapps", "common", "Grand Theft Auto V")
+            possible_paths.append(steam_gta)
+        except (OSError, FileNotFoundError):
+            pass
 
     # 4. Verificar Epic Games
     epic_manifest_dir = Path(os.environ.get("PROGRAMDATA", "")) / "Epic" / "EpicGamesLauncher" / "Data" / "Manifests"
@@ -129,13 +155,19 @@ def detect_game_path() -> str:
     ]
     possible_paths.extend(common_paths)
 
-    # Verificar qual caminho realmente tem o executável
+    # Verificar quais caminhos realmente têm o executável
+    found = []
+    seen = set()
     for path in possible_paths:
+        key = os.path.normcase(os.path.normpath(path))
+        if key in seen:
+            continue
+        seen.add(key)
         gta_exe = os.path.join(path, "GTA5.exe")
         if os.path.isfile(gta_exe):
-            return path
+            found.append(path)
 
-    return ""
+    return found
 
 
 def detect_platform(game_path: str) -> str:
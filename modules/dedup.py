@@ -0,0 +1,350 @@
+"""
+Módulo Dedup - Deduplicação de arquivos entre instalações do GTA V
+Substitui arquivos idênticos (ex.: cópia Steam + Epic) por hardlinks ou
+reflinks, liberando o espaço duplicado.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+TMP_SUFFIX = ".dedup-tmp"
+HEAD_SIZE = 64 * 1024                # pré-filtro: hash só do início do arquivo
+CHUNK_SIZE = 4 * 1024 * 1024
+MIN_FILE_SIZE = 1024 * 1024          # arquivos pequenos não compensam
+
+METHOD_AUTO = "auto"
+METHOD_HARDLINK = "hardlink"
+METHOD_REFLINK = "reflink"
+
+_FICLONE = 0x40049409                # ioctl de reflink (Linux: btrfs, xfs)
+
+
+def _hash_file(path: str, limit: Optional[int] = None) -> str:
+    """Calcula o hash do arquivo em blocos (ou apenas dos primeiros `limit` bytes)."""
+    h = hashlib.blake2b(digest_size=32)
+    remaining = limit
+    with open(path, "rb") as f:
+        while True:
+            size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+            if size <= 0:
+                break
+            data = f.read(size)
+            if not data:
+                break
+            h.update(data)
+            if remaining is not None:
+                remaining -= len(data)
+    return h.hexdigest()
+
+
+def _reflink(src: str, dst: str):
+    """Cria `dst` como reflink (cópia copy-on-write) de `src`."""
+    if not sys.platform.startswith("linux"):
+        raise OSError("Reflink não suportado nesta plataforma.")
+    import fcntl
+    with open(src, "rb") as fs, open(dst, "wb") as fd:
+        fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+
+
+class InstallDeduplicator:
+    """
+    Encontra e elimina arquivos duplicados entre instalações.
+
+    Etapas: agrupa por tamanho, filtra pelo hash do início do arquivo e
+    confirma pelo hash completo (calculado em paralelo). Cada substituição é
+    atômica (link temporário + os.replace), então interromper o processo
+    nunca deixa um arquivo pela metade.
+
+    Atenção: hardlinks compartilham o conteúdo — um patch que altere o
+    arquivo no lugar afeta as duas instalações. Reflinks (copy-on-write)
+    não têm esse problema e são preferidos quando o sistema de arquivos suporta.
+    """
+
+    def __init__(self, installs: List[str], workers: int = 4,
+                 min_size: int = MIN_FILE_SIZE):
+        self.installs = [os.path.normpath(p) for p in installs if p and os.path.isdir(p)]
+        self.workers = max(1, workers)
+        self.min_size = min_size
+        self._cancel = threading.Event()
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.installs[0], ".gtavlauncher_dedup.json") if self.installs else ""
+
+    def cancel(self):
+        """Interrompe a análise/aplicação em andamento (no próximo arquivo)."""
+        self._cancel.set()
+
+    # ===== Análise =====
+
+    def _list_files(self) -> List[dict]:
+        files = []
+        for root in self.installs:
+            for dirpath, dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    if name.endswith(TMP_SUFFIX):
+                        continue        # sobra de uma aplicação interrompida (ver cleanup)
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if st.st_size < self.min_size:
+                        continue
+                    files.append({
+                        "path": path,
+                        "install": root,
+                        "size": st.st_size,
+                        "mtime": st.st_mtime_ns,
+                        "dev": st.st_dev,
+                        "ino": st.st_ino,
+                    })
+        return files
+
+    def _hash_many(self, files: List[dict], key: str, limit: Optional[int]):
+        def work(f):
+            if self._cancel.is_set():
+                return
+            try:
+                f[key] = _hash_file(f["path"], limit)
+            except OSError as e:
+                logger.warning(f"Falha ao ler {f['path']}: {e}")
+                f[key] = None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(work, files))
+
+    @staticmethod
+    def _group(files: List[dict], key: str) -> List[List[dict]]:
+        groups: Dict[object, List[dict]] = {}
+        for f in files:
+            value = f.get(key)
+            if value is not None:
+                groups.setdefault((f["size"], value), []).append(f)
+        return [g for g in groups.values()
+                if len(g) > 1 and len({x["install"] for x in g}) > 1]
+
+    def analyze(self, progress: Optional[Callable[[str], None]] = None) -> dict:
+        """
+        Analisa as instalações sem alterar nada (dry-run).
+
+        Returns:
+            Relatório com os grupos de duplicatas e os bytes recuperáveis.
+        """
+        self._cancel.clear()
+        report = {
+            "installs": self.installs,
+            "groups": [],
+            "files": 0,
+            "bytes_reclaimable": 0,
+            "bytes_cross_volume": 0,
+            "cancelled": False,
+        }
+        if len(self.installs) < 2:
+            return report
+
+        if progress:
+            progress("Listando arquivos…")
+        files = self._list_files()
+
+        # 1) Tamanho
+        by_size: Dict[int, List[dict]] = {}
+        for f in files:
+            by_size.setdefault(f["size"], []).append(f)
+        candidates = [f for group in by_size.values()
+                      if len({x["install"] for x in group}) > 1 for f in group]
+
+        # 2) Hash do início  3) Hash completo
+        if progress:
+            progress(f"Comparando {len(candidates)} arquivo(s)…")
+        self._hash_many(candidates, "head", HEAD_SIZE)
+        candidates = [f for g in self._group(candidates, "head") for f in g]
+        self._hash_many(candidates, "hash", None)
+
+        if self._cancel.is_set():
+            report["cancelled"] = True
+            return report
+
+        for group in self._group(candidates, "hash"):
+            group.sort(key=lambda f: (self.installs.index(f["install"]), f["path"]))
+            keep = group[0]
+            dups = []
+            for f in group[1:]:
+                if f["dev"] == keep["dev"] and f["ino"] == keep["ino"]:
+                    continue  # já deduplicado
+                same_volume = f["dev"] == keep["dev"]
+                dups.append({"path": f["path"], "mtime": f["mtime"], "same_volume": same_volume})
+                if same_volume:
+                    report["bytes_reclaimable"] += f["size"]
+                else:
+                    report["bytes_cross_volume"] += f["size"]
+            if dups:
+                report["groups"].append({
+                    "keep": keep["path"],
+                    "keep_mtime": keep["mtime"],
+                    "size": keep["size"],
+                    "hash": keep["hash"],
+                    "duplicates": dups,
+                })
+                report["files"] += len(dups)
+        return report
+
+    # ===== Aplicação =====
+
+    def cleanup(self) -> int:
+        """Remove os links temporários deixados por uma aplicação interrompida."""
+        removed = 0
+        for root in self.installs:
+            for dirpath, dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    if name.endswith(TMP_SUFFIX):
+                        try:
+                            os.remove(os.path.join(dirpath, name))
+                            removed += 1
+                        except OSError:
+                            pass
+        return removed
+
+    def apply(self, report: dict, method: str = METHOD_AUTO,
+              progress: Optional[Callable[[str], None]] = None) -> Tuple[bool, str]:
+        """
+        Substitui as duplicatas do relatório por links para o arquivo mantido.
+        Os links de cada grupo são registrados assim que o grupo termina, para
+        que verify() cubra também uma aplicação interrompida.
+        """
+        self._cancel.clear()
+        self.cleanup()
+        linked = []
+        saved = 0
+        errors = []
+
+        for group in report["groups"]:
+            if self._cancel.is_set():
+                break
+            group_linked = []
+            # O arquivo mantido também pode ter mudado (atualização do jogo, mods):
+            # linkar agora trocaria a duplicata por um conteúdo diferente
+            try:
+                st = os.stat(group["keep"])
+                changed = st.st_size != group["size"] or st.st_mtime_ns != group["keep_mtime"]
+            except OSError:
+                changed = True
+            if changed:
+                errors.append(f"{group['keep']}: alterado desde a análise")
+                continue
+            for dup in group["duplicates"]:
+                if self._cancel.is_set():
+                    break
+                if not dup["same_volume"]:
+                    continue
+                path = dup["path"]
+                try:
+                    st = os.stat(path)
+                    # Arquivo alterado depois da análise: não arriscar
+                    if st.st_size != group["size"] or st.st_mtime_ns != dup["mtime"]:
+                        errors.append(f"{path}: alterado desde a análise")
+                        continue
+                    used = self._link(group["keep"], path, method)
+                    group_linked.append({"keep": group["keep"], "path": path,
+                                         "method": used, "hash": group["hash"]})
+                    linked.append(group_linked[-1])
+                    saved += group["size"]
+                    if progress:
+                        progress(f"{len(linked)} arquivo(s) deduplicado(s)")
+                except OSError as e:
+                    errors.append(f"{path}: {e}")
+            self._record(group_linked)
+
+        msg = f"✅ {len(linked)} arquivo(s) deduplicado(s), {saved / (1024 ** 3):.2f} GB liberados."
+        if self._cancel.is_set():
+            msg += "\n⚠️ Operação interrompida — execute novamente para continuar."
+        if errors:
+            msg += f"\n⚠️ {len(errors)} arquivo(s) ignorado(s)."
+            logger.warning("Dedup: " + "; ".join(errors[:20]))
+        return not errors, msg
+
+    @staticmethod
+    def _link(keep: str, path: str, method: str) -> str:
+        tmp = path + TMP_SUFFIX
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        used = method
+        try:
+            if method in (METHOD_AUTO, METHOD_REFLINK):
+                try:
+                    _reflink(keep, tmp)
+                    used = METHOD_REFLINK
+                except OSError:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                    if method == METHOD_REFLINK:
+                        raise
+                    used = METHOD_HARDLINK
+            if used == METHOD_HARDLINK:
+                os.link(keep, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return used
+
+    def _record(self, linked: List[dict]):
+        """Acrescenta os links criados ao registro usado pela verificação."""
+        if not linked or not self.state_path:
+            return
+        state = self._load_state()
+        entries = {e["path"]: e for e in state.get("linked", [])}
+        for item in linked:
+            entries[item["path"]] = {**item, "date": datetime.now().isoformat(timespec="seconds")}
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"linked": list(entries.values())}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    def _load_state(self) -> dict:
+        if self.state_path and os.path.isfile(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return {}
+
+    # ===== Verificação =====
+
+    def verify(self) -> Tuple[bool, str]:
+        """
+        Confere os arquivos deduplicados: hardlinks precisam apontar para o
+        mesmo arquivo; reflinks são conferidos pelo hash.
+        """
+        linked = self._load_state().get("linked", [])
+        if not linked:
+            return True, "ℹ️ Nenhum arquivo deduplicado registrado."
+
+        def check(item) -> Optional[str]:
+            try:
+                if item["method"] == METHOD_HARDLINK:
+                    ok = os.path.samefile(item["keep"], item["path"])
+                else:
+                    ok = _hash_file(item["path"]) == item["hash"]
+            except OSError as e:
+                return f"{item['path']}: {e}"
+            return None if ok else f"{item['path']}: diverge do original"
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            problems = [p for p in pool.map(check, linked) if p]
+
+        if problems:
+            return False, f"❌ {len(problems)} arquivo(s) divergente(s):\n" + "\n".join(problems[:10])
+        return True, f"✅ {len(linked)} arquivo(s) deduplicado(s) verificados."
@@ -0,0 +1,236 @@
+"""
+Módulo Diag History - Histórico dos diagnósticos em SQLite
+Cada execução grava, por verificação, o status, a métrica (ex.: MB do cache)
+e a duração. As linhas só são inseridas, nunca alteradas, e ficam agrupadas
+por verificação e data na própria chave primária, então consultas de
+tendência leem só o intervalo pedido mesmo com anos de histórico.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+HISTORY_DB = CONFIG_DIR / "diagnostics.db"
+SCHEMA_VERSION = 1
+
+# Status gravado como inteiro (ordem de gravidade)
+STATUS_CODES = {"ok": 0, "info": 1, "warning": 2, "error": 3}
+STATUS_NAMES = {v: k for k, v in STATUS_CODES.items()}
+BAD_STATUS = STATUS_CODES["warning"]
+
+DAY = 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id  INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    check_id INTEGER NOT NULL,
+    ts       REAL    NOT NULL,
+    status   INTEGER NOT NULL,
+    metric   REAL,
+    duration REAL,
+    PRIMARY KEY (check_id, ts)
+) WITHOUT ROWID;
+"""
+
+
+class DiagnosticsHistory:
+    """
+    Série temporal dos resultados de diagnóstico.
+
+    Tabela `results` sem rowid, com chave (verificação, data): os registros
+    de uma verificação ficam contíguos e em ordem, e "último resultado",
+    "série dos últimos N dias" ou "desde quando está com problema" viram
+    buscas por intervalo na chave. A conexão é aberta sob demanda e
+    compartilhada entre threads com um lock.
+    """
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._check_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ===== Conexão =====
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path == HISTORY_DB:
+                ensure_config_dir()
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._check_ids = dict(conn.execute("SELECT key, id FROM checks").fetchall())
+            self._conn = conn
+        return self._conn
+
+    def _check_id(self, key: str, create: bool = False) -> Optional[int]:
+        if key not in self._check_ids and create:
+            cur = self._db().execute("INSERT INTO checks (key) VALUES (?)", (key,))
+            self._check_ids[key] = cur.lastrowid
+        return self._check_ids.get(key)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ===== Gravação =====
+
+    def record(self, results: List[dict], ts: Optional[float] = None) -> bool:
+        """
+        Grava os resultados de uma execução (uma transação).
+
+        Cada resultado precisa de "key" e "status"; "metric" e "duration"
+        são opcionais.
+        """
+        ts = ts or time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        "INSERT OR IGNORE INTO results (check_id, ts, status, metric, duration) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(self._check_id(r["key"], create=True), ts,
+                          STATUS_CODES.get(r.get("status"), STATUS_CODES["info"]),
+                          r.get("metric"), r.get("duration")) for r in results])
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível gravar o histórico de diagnóstico: {e}")
+            return False
+
+    # ===== Consultas =====
+
+    def _query(self, sql: str, params=()) -> list:
+        try:
+            with self._lock:
+                return self._db().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Erro ao consultar o histórico de diagnóstico: {e}")
+            return []
+
+    def latest(self) -> Dict[str, dict]:
+        """Último resultado de cada verificação ({chave: {ts, status, metric}})."""
+        # Uma busca pelo fim do intervalo de cada verificação na chave primária
+        latest = {}
+        try:
+            with self._lock:
+                db = self._db()
+                for key, check_id in self._check_ids.items():
+                    row = db.execute("SELECT ts, status, metric FROM results WHERE check_id = ? "
+                                     "ORDER BY ts DESC LIMIT 1", (check_id,)).fetchone()
+                    if row:
+                        latest[key] = {"ts": row[0], "status": STATUS_NAMES.get(row[1], "info"),
+                                       "metric": row[2]}
+        except sqlite3.Error as e:
+            logger.warning(f"Erro ao consultar o histórico de diagnóstico: {e}")
+        return latest
+
+    def series(self, key: str, days: Optional[float] = None) -> List[dict]:
+        """Resultados de uma verificação, do mais antigo ao mais recente."""
+        since = time.time() - days * DAY if days else 0
+        rows = self._query(
+            "SELECT r.ts, r.status, r.metric, r.duration FROM results r "
+            "JOIN checks c ON c.id = r.check_id WHERE c.key = ? AND r.ts >= ? ORDER BY r.ts",
+            (key, since))
+        return [{"ts": ts, "status": STATUS_NAMES.get(status, "info"), "metric": metric,
+                 "duration": duration} for ts, status, metric, duration in rows]
+
+    def daily(self, key: str, days: float = 30) -> List[dict]:
+        """Métrica agregada por dia (mínimo, máximo, média e pior status)."""
+        rows = self._query(
+            "SELECT CAST(r.ts / 86400 AS INTEGER) AS day, MIN(r.metric), MAX(r.metric), "
+            "AVG(r.metric), MAX(r.status), COUNT(*) FROM results r "
+            "JOIN checks c ON c.id = r.check_id WHERE c.key = ? AND r.ts >= ? "
+            "GROUP BY day ORDER BY day",
+            (key, time.time() - days * DAY))
+        return [{"day": day * DAY, "min": lo, "max": hi, "avg": avg,
+                 "worst": STATUS_NAMES.get(worst, "info"), "runs": runs}
+                for day, lo, hi, avg, worst, runs in rows]
+
+    def growth_per_day(self, key: str, days: float = 30) -> Optional[float]:
+        """
+        Inclinação da métrica por dia (mínimos quadrados) nos últimos `days`
+        dias; None com menos de dois pontos ou de um dia de histórico.
+        """
+        rows = self._query(
+            "SELECT COUNT(*), SUM(x), SUM(y), SUM(x * x), SUM(x * y), MAX(x) - MIN(x) FROM "
+            "(SELECT (r.ts - ?) / 86400.0 AS x, r.metric AS y FROM results r "
+            "JOIN checks c ON c.id = r.check_id "
+            "WHERE c.key = ? AND r.ts >= ? AND r.metric IS NOT NULL)",
+            (time.time(), key, time.time() - days * DAY))
+        if not rows:
+            return None
+        n, sx, sy, sxx, sxy, span = rows[0]
+        if n < 2 or not span or span < 1:
+            return None
+        denominator = n * sxx - sx * sx
+        return (n * sxy - sx * sy) / denominator if denominator else None
+
+    def bad_since(self, key: str) -> Optional[float]:
+        """
+        Início da sequência atual de resultados com problema (warning/erro),
+        ou None se o último resultado estiver OK.
+        """
+        rows = self._query(
+            "SELECT MIN(r.ts) FROM results r JOIN checks c ON c.id = r.check_id "
+            "WHERE c.key = ? AND r.status >= ? AND r.ts > COALESCE("
+            "(SELECT MAX(r2.ts) FROM results r2 WHERE r2.check_id = c.id AND r2.status < ?), 0)",
+            (key, BAD_STATUS, BAD_STATUS))
+        return rows[0][0] if rows else None
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    # Uso: python -m modules.diag_history
+    path = os.path.join(tempfile.mkdtemp(prefix="diaghist_"), "diagnostics.db")
+    history = DiagnosticsHistory(path)
+    rnd = random.Random(1)
+    keys = ["directories", "cache", "profiles", "settings", "services", "registry", "mods", "logs"]
+    now = time.time()
+    runs = 3 * 365 * 24 * 4              # três anos, a cada 15 minutos
+    print(f"Gravando {runs:,} execuções ({runs * len(keys):,} resultados)…")
+    t0 = time.perf_counter()
+    cache = 50.0
+    for i in range(runs):
+        ts = now - (runs - i) * 900
+        cache = 50.0 if rnd.random() < 0.001 else cache + rnd.random() * 0.05
+        history.record([{"key": k, "status": "ok", "metric": cache if k == "cache" else None,
+                         "duration": 0.01} for k in keys], ts=ts)
+    t_write = time.perf_counter() - t0
+
+    def timed(fn, *args):
+        start = time.perf_counter()
+        for _ in range(20):
+            value = fn(*args)
+        return value, (time.perf_counter() - start) / 20 * 1000
+
+    _, t_latest = timed(history.latest)
+    growth, t_growth = timed(history.growth_per_day, "cache", 30)
+    _, t_daily = timed(history.daily, "cache", 365)
+    _, t_bad = timed(history.bad_since, "settings")
+    size = os.path.getsize(path) + os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") \
+        else os.path.getsize(path)
+    print(f"gravação: {t_write / runs * 1000:.3f} ms por execução; banco: {size / 1024 / 1024:.1f} MB")
+    print(f"latest():                 {t_latest:6.2f} ms")
+    print(f"growth_per_day(30 dias):  {t_growth:6.2f} ms ({growth:+.2f} MB/dia)")
+    print(f"daily(365 dias):          {t_daily:6.2f} ms")
+    print(f"bad_since():              {t_bad:6.2f} ms")
+    history.close()
@@ -0,0 +1,131 @@
+"""
+Módulo Diagnostics - Execução concorrente de verificações de diagnóstico
+As verificações são registradas com nome e tempo limite, rodam em paralelo
+e cada resultado é entregue assim que fica pronto, com a duração medida.
+O tempo total passa a ser o da verificação mais lenta, não a soma de todas.
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+DEFAULT_TIMEOUT = 10.0       # segundos por verificação
+
+
+class Check:
+    """Uma verificação registrada: função sem argumentos que retorna o dict de resultado."""
+
+    __slots__ = ("key", "name", "fn", "timeout")
+
+    def __init__(self, key: str, name: str, fn: Callable[[], dict], timeout: float = DEFAULT_TIMEOUT):
+        self.key = key
+        self.name = name
+        self.fn = fn
+        self.timeout = timeout
+
+
+def _timed(check: Check) -> dict:
+    start = time.perf_counter()
+    try:
+        result = dict(check.fn())
+    except Exception as e:
+        logger.warning(f"Diagnóstico '{check.name}' falhou: {e}")
+        result = {
+            "name": check.name,
+            "status": "error",
+            "message": f"❌ Falha na verificação: {str(e)}",
+            "fixable": False,
+        }
+    result.setdefault("metric", None)
+    result["key"] = check.key
+    result["duration"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+class DiagnosticsRunner:
+    """
+    Registro de verificações executadas em um pool de threads.
+
+    Uma verificação que passa do tempo limite é reportada como tal e a
+    execução segue sem esperá-la (a thread termina em segundo plano).
+    """
+
+    def __init__(self):
+        self._checks: Dict[str, Check] = {}
+
+    def register(self, key: str, name: str, fn: Callable[[], dict],
+                 timeout: float = DEFAULT_TIMEOUT) -> "DiagnosticsRunner":
+        self._checks[key] = Check(key, name, fn, timeout)
+        return self
+
+    @property
+    def checks(self) -> List[Check]:
+        """Verificações na ordem de registro."""
+        return list(self._checks.values())
+
+    def run_check(self, key: str) -> dict:
+        """Executa uma verificação na thread atual (sem tempo limite)."""
+        return _timed(self._checks[key])
+
+    def run(self, on_result: Optional[Callable[[dict], None]] = None,
+            keys: Optional[List[str]] = None) -> List[dict]:
+        """
+        Executa as verificações em paralelo.
+
+        Args:
+            on_result: Chamado (na thread do runner) com cada resultado assim
+                       que ele fica pronto.
+            keys: Executa só essas verificações (padrão: todas).
+
+        Returns:
+            Resultados na ordem de registro; cada um com "key", "duration" (s)
+            e "metric" (valor numérico da verificação, ou None).
+        """
+        checks = [c for c in self._checks.values() if keys is None or c.key in keys]
+        if not checks:
+            return []
+        results: Dict[str, dict] = {}
+
+        def emit(result: dict):
+            results[result["key"]] = result
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.warning(f"Erro ao entregar resultado do diagnóstico: {e}")
+
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="diag")
+        pending = {pool.submit(_timed, c): c for c in checks}
+        try:
+            while pending:
+                deadline = min(start + c.timeout for c in pending.values())
+                done, _ = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    emit(future.result())
+                now = time.perf_counter()
+                for future, check in list(pending.items()):
+                    if now - start >= check.timeout:
+                        pending.pop(future)
+                        emit({
+                            "name": check.name,
+                            "status": "warning",
+                            "message": f"⚠️ A verificação excedeu o tempo limite ({check.timeout:.0f} s).",
+                            "fixable": False,
+                            "key": check.key,
+                            "duration": round(now - start, 3),
+                            "metric": None,
+                        })
+        finally:
+            # Não espera verificações que estouraram o tempo
+            pool.shutdown(wait=False)
+
+        logger.info(f"Diagnóstico: {len(checks)} verificação(ões) em "
+                    f"{time.perf_counter() - start:.2f} s")
+        return [results[c.key] for c in checks]
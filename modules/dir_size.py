@@ -0,0 +1,205 @@
+"""
+Módulo Dir Size - Tamanho de diretórios com os.scandir, em paralelo e com cache
+Usado nas verificações de cache do Social Club e na lista de backups.
+Reaproveita os dados de stat das entradas do scandir, percorre subárvores
+em paralelo, pode parar assim que um limite é ultrapassado e guarda o
+resultado de cada pasta enquanto o mtime dela não muda.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+# (mtime da pasta, bytes dos arquivos diretos, nº de arquivos diretos, subpastas)
+_Node = Tuple[int, int, int, List[str]]
+
+_local = threading.local()
+
+
+@contextmanager
+def serial_scans():
+    """
+    Dentro do bloco, as medições da thread atual rodam nela mesma, sem pool:
+    herdam a prioridade da thread (ex.: verificações em segundo plano).
+    """
+    previous = getattr(_local, "serial", False)
+    _local.serial = True
+    try:
+        yield
+    finally:
+        _local.serial = previous
+
+
+class DirSizeCache:
+    """
+    Mede o tamanho de árvores de diretórios.
+
+    O cache é por pasta: se o mtime de uma pasta não mudou, a lista de
+    entradas dela também não, e o total dos arquivos diretos é reutilizado
+    sem listar a pasta de novo (só um stat). Arquivos reescritos no lugar
+    sem mudar a pasta não alteram o mtime dela; use `refresh=True` quando
+    isso importar.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self.workers = workers
+        self._nodes: Dict[str, _Node] = {}
+        self._lock = threading.Lock()
+
+    def _scan_dir(self, path: str, refresh: bool) -> Tuple[_Node, bool]:
+        mtime = os.stat(path).st_mtime_ns      # antes de listar: mudanças durante a leitura invalidam
+        if not refresh:
+            with self._lock:
+                node = self._nodes.get(path)
+            if node and node[0] == mtime:
+                return node, True
+
+        size = files = 0
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        # No Windows o stat vem da própria listagem, sem chamada extra
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+        node = (mtime, size, files, subdirs)
+        with self._lock:
+            self._nodes[path] = node
+        return node, False
+
+    def measure(self, path, threshold: Optional[int] = None, refresh: bool = False) -> dict:
+        """
+        Tamanho total de `path`.
+
+        Args:
+            threshold: Para de contar assim que o total passa desse valor (bytes).
+            refresh: Ignora o cache e relista todas as pastas.
+
+        Returns:
+            Dict com "bytes", "files", "dirs", "complete" (False se parou no
+            limite), "cached_dirs" e "elapsed" (s).
+        """
+        path = os.fspath(path)
+        start = time.perf_counter()
+        result = {"path": path, "bytes": 0, "files": 0, "dirs": 0,
+                  "complete": True, "cached_dirs": 0, "elapsed": 0.0}
+        if not os.path.isdir(path):
+            return result
+
+        if getattr(_local, "serial", False):
+            stack = [path]
+            while stack:
+                try:
+                    (_, size, files, subdirs), cached = self._scan_dir(stack.pop(), refresh)
+                except OSError:
+                    continue
+                result["bytes"] += size
+                result["files"] += files
+                result["dirs"] += 1
+                result["cached_dirs"] += cached
+                stack.extend(subdirs)
+                if threshold is not None and result["bytes"] > threshold:
+                    result["complete"] = False
+                    break
+            result["elapsed"] = round(time.perf_counter() - start, 4)
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, path, refresh)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        (_, size, files, subdirs), cached = future.result()
+                    except OSError:
+                        continue        # pasta removida ou sem permissão
+                    result["bytes"] += size
+                    result["files"] += files
+                    result["dirs"] += 1
+                    result["cached_dirs"] += cached
+                    pending.update(pool.submit(self._scan_dir, d, refresh) for d in subdirs)
+                if threshold is not None and result["bytes"] > threshold:
+                    result["complete"] = False
+                    for future in pending:
+                        future.cancel()
+                    break
+
+        result["elapsed"] = round(time.perf_counter() - start, 4)
+        return result
+
+    def size(self, path, threshold: Optional[int] = None) -> int:
+        """Atalho: só o total em bytes."""
+        return self.measure(path, threshold)["bytes"]
+
+    def forget(self, path=None):
+        """Descarta o cache de `path` (e subpastas) ou todo o cache."""
+        with self._lock:
+            if path is None:
+                self._nodes.clear()
+                return
+            prefix = os.fspath(path)
+            for key in [k for k in self._nodes if k == prefix or k.startswith(prefix + os.sep)]:
+                del self._nodes[key]
+
+
+_default = DirSizeCache()
+
+
+def dir_size(path, threshold: Optional[int] = None) -> dict:
+    """DirSizeCache.measure com o cache compartilhado do launcher."""
+    return _default.measure(path, threshold)
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    from pathlib import Path
+
+    # Uso: python -m modules.dir_size
+    root = tempfile.mkdtemp(prefix="dirsize_")
+    try:
+        print("Criando 200.000 arquivos…")
+        payload = b"x" * 512
+        for a in range(20):
+            for b in range(10):
+                d = os.path.join(root, f"d{a}", f"s{b}")
+                os.makedirs(d)
+                for i in range(1000):
+                    with open(os.path.join(d, f"f{i}.bin"), "wb") as f:
+                        f.write(payload)
+
+        t0 = time.perf_counter()
+        baseline = sum(f.stat().st_size for f in Path(root).rglob("*") if f.is_file())
+        t_rglob = time.perf_counter() - t0
+
+        sizer = DirSizeCache()
+        cold = sizer.measure(root)
+        warm = sizer.measure(root)
+        capped = DirSizeCache().measure(root, threshold=10 * 1024 * 1024)
+        serial = DirSizeCache(workers=1).measure(root)
+
+        assert cold["bytes"] == warm["bytes"] == serial["bytes"] == baseline
+        print(f"rglob + is_file + stat:  {t_rglob * 1000:8.0f} ms")
+        print(f"scandir, 1 thread:       {serial['elapsed'] * 1000:8.0f} ms")
+        print(f"scandir, {sizer.workers} threads:     {cold['elapsed'] * 1000:8.0f} ms")
+        print(f"cache (mtime):           {warm['elapsed'] * 1000:8.0f} ms "
+              f"({warm['cached_dirs']}/{warm['dirs']} pastas do cache)")
+        print(f"limite de 10 MB:         {capped['elapsed'] * 1000:8.0f} ms "
+              f"(parou em {capped['files']:,} arquivos)")
+        print(f"{cold['files']:,} arquivos, {cold['bytes'] / 1024 / 1024:.1f} MB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,312 @@
+"""
+Módulo Frame-time Analytics - Estatísticas de frame time com NumPy
+Calcula FPS médio, 1% / 0.1% low, percentis e travadas (stutters) a partir
+do benchmark do GTA V ou de logs CSV do PresentMon / CapFrameX, lendo o CSV
+em blocos para que capturas de horas caibam em memória fixa.
+"""
+
+import io
+import time
+import logging
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+# Colunas de frame time (ms) reconhecidas, em ordem de preferência
+FRAME_TIME_COLUMNS = ["MsBetweenPresents", "msBetweenPresents", "FrameTime", "frametime"]
+
+CHUNK_ROWS = 131072                  # linhas por bloco do CSV
+HIST_RESOLUTION = 100                # bins por ms (0,01 ms)
+HIST_MAX_MS = 1000                   # frames acima disso caem no último bin
+STUTTER_WINDOW = 21                  # frames anteriores usados na mediana móvel (ímpar)
+STUTTER_FACTOR = 2.0                 # travada = frame > fator × mediana móvel
+MAX_STUTTERS_KEPT = 100              # eventos guardados para exibição
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class FrameTimeStats:
+    """
+    Acumulador de frame times alimentado bloco a bloco.
+
+    Percentis vêm de um histograma fixo (resolução de 0,01 ms), então a
+    memória não cresce com o tamanho da captura. A mediana móvel das
+    travadas usa os últimos frames do bloco anterior, dando o mesmo
+    resultado que uma única passada sobre a série inteira.
+    """
+
+    def __init__(self, stutter_window: int = STUTTER_WINDOW,
+                 stutter_factor: float = STUTTER_FACTOR):
+        self.stutter_window = stutter_window | 1
+        self.stutter_factor = stutter_factor
+        self._bins = HIST_MAX_MS * HIST_RESOLUTION + 1
+        self._hist = np.zeros(self._bins, dtype=np.int64)
+        self._tail = np.empty(0, dtype=np.float64)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.stutter_count = 0
+        self.stutter_ms = 0.0
+        self.stutters: List[dict] = []
+
+    def update(self, frame_ms: np.ndarray):
+        """Acrescenta um bloco de frame times (ms); valores inválidos são ignorados."""
+        frame_ms = np.asarray(frame_ms, dtype=np.float64)
+        frame_ms = frame_ms[np.isfinite(frame_ms) & (frame_ms > 0)]
+        if not frame_ms.size:
+            return
+
+        offset = self.count
+        self.count += frame_ms.size
+        self.total_ms += float(frame_ms.sum())
+        self.min_ms = min(self.min_ms, float(frame_ms.min()))
+        self.max_ms = max(self.max_ms, float(frame_ms.max()))
+
+        idx = np.minimum((frame_ms * HIST_RESOLUTION).astype(np.int64), self._bins - 1)
+        self._hist += np.bincount(idx, minlength=self._bins)
+
+        # Mediana dos `window` frames anteriores a cada frame
+        w = self.stutter_window
+        series = np.concatenate((self._tail, frame_ms))
+        if series.size > w:
+            windows = np.lib.stride_tricks.sliding_window_view(series[:-1], w)
+            # Ordenar janelas pequenas é mais rápido que np.median/partition
+            median = np.sort(windows, axis=1)[:, w // 2]
+            current = series[w:]
+            mask = current > self.stutter_factor * median
+            # Os primeiros frames do bloco foram avaliados junto com a cauda anterior
+            first = offset - self._tail.size + w
+            hits = np.flatnonzero(mask)
+            if hits.size:
+                self.stutter_count += int(hits.size)
+                self.stutter_ms += float(current[hits].sum())
+                room = MAX_STUTTERS_KEPT - len(self.stutters)
+                for i in hits[:max(room, 0)]:
+                    self.stutters.append({
+                        "frame": int(first + i),
+                        "ms": round(float(current[i]), 2),
+                        "median_ms": round(float(median[i]), 2),
+                    })
+        self._tail = series[-w:].copy()
+
+    def percentile(self, q: float) -> float:
+        """Frame time (ms) do percentil `q` (0-100)."""
+        if not self.count:
+            return 0.0
+        target = int(np.ceil(q / 100.0 * self.count))
+        b = int(np.searchsorted(np.cumsum(self._hist), max(target, 1)))
+        return min((b + 0.5) / HIST_RESOLUTION, self.max_ms)
+
+    def result(self) -> dict:
+        """
+        Resumo da série.
+
+        Os "lows" seguem o método por percentil (PresentMon / CapFrameX):
+        1% low = 1000 / frame time do percentil 99.
+        """
+        if not self.count:
+            return {"frames": 0}
+        p = {str(q): round(self.percentile(q), 2) for q in PERCENTILES}
+        return {
+            "frames": self.count,
+            "duration_s": round(self.total_ms / 1000, 2),
+            "avg_fps": round(1000 * self.count / self.total_ms, 1),
+            "low_1_fps": round(1000 / self.percentile(99), 1),
+            "low_01_fps": round(1000 / self.percentile(99.9), 1),
+            "min_ms": round(self.min_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2),
+            "percentiles_ms": p,
+            "stutter_count": self.stutter_count,
+            "stutter_pct_time": round(100 * self.stutter_ms / self.total_ms, 2),
+            "stutters": self.stutters,
+        }
+
+
+def analyze_series(frame_ms: Iterable[float], **kwargs) -> dict:
+    """Analisa uma série de frame times (ms) já carregada em memória."""
+    stats = FrameTimeStats(**kwargs)
+    arr = np.asarray(frame_ms if isinstance(frame_ms, np.ndarray) else list(frame_ms),
+                     dtype=np.float64)
+    for start in range(0, arr.size, CHUNK_ROWS):
+        stats.update(arr[start:start + CHUNK_ROWS])
+    return stats.result()
+
+
+def _find_column(header: List[str], column: Optional[str]) -> int:
+    names = [h.strip().strip('"') for h in header]
+    for name in ([column] if column else FRAME_TIME_COLUMNS):
+        if name in names:
+            return names.index(name)
+    raise ValueError(f"Coluna de frame time não encontrada (esperado: "
+                     f"{column or ', '.join(FRAME_TIME_COLUMNS)})")
+
+
+def _parse_chunk(lines: List[str], col: int) -> np.ndarray:
+    try:
+        return np.loadtxt(lines, delimiter=",", usecols=col, dtype=np.float64, ndmin=1)
+    except ValueError:
+        # Linhas com "NA", comentários ou colunas faltando: converte uma a uma
+        values = []
+        for line in lines:
+            parts = line.split(",")
+            try:
+                values.append(float(parts[col]))
+            except (IndexError, ValueError):
+                continue
+        return np.asarray(values, dtype=np.float64)
+
+
+def analyze_csv(path: str, column: Optional[str] = None,
+                chunk_rows: int = CHUNK_ROWS, **kwargs) -> dict:
+    """
+    Analisa um log CSV do PresentMon / CapFrameX lendo-o em blocos.
+
+    Args:
+        path: Arquivo CSV.
+        column: Coluna de frame time (ms); detectada automaticamente se omitida.
+        chunk_rows: Linhas por bloco — define o teto de memória.
+    """
+    stats = FrameTimeStats(**kwargs)
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        header = ""
+        for header in f:
+            if header.strip() and not header.startswith("//"):
+                break
+        col = _find_column(header.split(","), column)
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                break
+            stats.update(_parse_chunk(lines, col))
+    result = stats.result()
+    result["source"] = path
+    return result
+
+
+def analyze_benchmark_record(record: dict) -> List[dict]:
+    """
+    Analisa cada passe de um resultado do BenchmarkRunner que tenha os
+    tempos de frame individuais (-benchmarkFrameTimes).
+    """
+    results = []
+    for p in record.get("passes", []):
+        times = p.get("frame_times")
+        if not times:
+            continue
+        arr = np.asarray(times, dtype=np.float64)
+        if arr.max() < 1.0:
+            arr = arr * 1000     # arquivo em segundos
+        results.append({"pass": p["pass"], **analyze_series(arr)})
+    return results
+
+
+def summarize_record(record: dict) -> Optional[dict]:
+    """Une todos os passes de um resultado em uma única análise."""
+    series = [np.asarray(p["frame_times"], dtype=np.float64)
+              for p in record.get("passes", []) if p.get("frame_times")]
+    if not series:
+        return None
+    arr = np.concatenate(series)
+    if arr.max() < 1.0:
+        arr = arr * 1000
+    return analyze_series(arr)
+
+
+def compare_presets(results: Dict[str, dict], baseline: Optional[str] = None) -> List[dict]:
+    """
+    Compara análises de diferentes presets (chaves de OPTIMIZATION_PRESETS).
+
+    Returns:
+        Linhas ordenadas pelo 1% low, com a variação percentual em relação
+        ao preset base (o primeiro informado, se `baseline` for omitido).
+    """
+    from modules.optimizer import OPTIMIZATION_PRESETS
+
+    valid = {k: r for k, r in results.items() if r and r.get("frames")}
+    if not valid:
+        return []
+    base = valid.get(baseline) or next(iter(valid.values()))
+
+    def delta(value, ref):
+        return round(100 * (value - ref) / ref, 1) if ref else 0.0
+
+    rows = []
+    for key, r in valid.items():
+        rows.append({
+            "preset": key,
+            "name": OPTIMIZATION_PRESETS.get(key, {}).get("name", key),
+            "avg_fps": r["avg_fps"],
+            "low_1_fps": r["low_1_fps"],
+            "low_01_fps": r["low_01_fps"],
+            "stutter_count": r["stutter_count"],
+            "avg_fps_delta": delta(r["avg_fps"], base["avg_fps"]),
+            "low_1_delta": delta(r["low_1_fps"], base["low_1_fps"]),
+        })
+    rows.sort(key=lambda row: (row["low_1_fps"], row["avg_fps"]), reverse=True)
+    return rows
+
+
+def compare_benchmark_results(records: List[dict]) -> List[dict]:
+    """Agrupa resultados do BenchmarkRunner por preset e compara os grupos."""
+    grouped: Dict[str, List[np.ndarray]] = {}
+    for record in records:
+        preset = (record.get("context") or {}).get("preset")
+        if not preset:
+            continue
+        for p in record.get("passes", []):
+            if p.get("frame_times"):
+                grouped.setdefault(preset, []).append(np.asarray(p["frame_times"], dtype=np.float64))
+    results = {}
+    for preset, series in grouped.items():
+        arr = np.concatenate(series)
+        results[preset] = analyze_series(arr * 1000 if arr.max() < 1.0 else arr)
+    return compare_presets(results)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import json
+    import tempfile
+    import tracemalloc
+    # Uso: python -m modules.frametime_analytics [linhas]   (padrão: 10 milhões)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(0x6A5)
+    series = rng.gamma(16.0, 1.0, rows)                   # ~16 ms de média
+    spikes = rng.random(rows) < 0.002
+    series[spikes] *= rng.uniform(3, 8, int(spikes.sum()))
+
+    t0 = time.perf_counter()
+    res = analyze_series(series)
+    t_mem = time.perf_counter() - t0
+    print(f"Em memória: {rows:,} frames em {t_mem:.2f}s ({rows / t_mem / 1e6:.1f} M frames/s)")
+
+    path = os.path.join(tempfile.mkdtemp(), "synthetic_presentmon.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Application,ProcessID,SwapChainAddress,MsBetweenPresents\n")
+        for start in range(0, rows, 1_000_000):
+            buf = io.StringIO()
+            for v in series[start:start + 1_000_000]:
+                buf.write(f"GTA5.exe,4242,0x1,{v:.3f}\n")
+            f.write(buf.getvalue())
+    size_mb = os.path.getsize(path) / 1024 ** 2
+
+    t0 = time.perf_counter()
+    res_csv = analyze_csv(path)
+    t_csv = time.perf_counter() - t0
+    # Segunda leitura só para medir o pico de memória (tracemalloc deixa tudo lento)
+    tracemalloc.start()
+    analyze_csv(path)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    os.remove(path)
+    print(f"CSV: {size_mb:.0f} MB em {t_csv:.2f}s ({size_mb / t_csv:.0f} MB/s), "
+          f"pico de memória {peak:.0f} MB")
+    res_csv.pop("stutters")
+    print(json.dumps(res_csv, indent=2))
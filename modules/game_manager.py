@@ -7,8 +7,11 @@ import os
 import subprocess
 import time
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
+
+from modules.mod_detector import ModDetector
 
 logger = logging.getLogger("GTAVLauncher")
 
@@ -38,9 +41,14 @@ class GameManager:
     GTA5_EXE = "GTA5.exe"
     GTA5_LAUNCHER_EXE = "GTAVLauncher.exe"
 
+    # Tempo máximo esperando o GTA5.exe aparecer após o lançamento
+    SESSION_START_TIMEOUT = 180
+    SESSION_POLL_INTERVAL = 5
+
     def __init__(self, game_path: str):
         self.game_path = game_path
         self._process: Optional[subprocess.Popen] = None
+        self.mod_detector = ModDetector(game_path)
 
     @property
     def play_exe_path(self) -> str:
@@ -95,12 +103,13 @@ class GameManager:
 
         return args
 
-    def launch_game(self, config: dict) -> Tuple[bool, str]:
+    def launch_game(self, config: dict, vanilla: bool = False) -> Tuple[bool, str]:
         """
         Lança o GTA V com as configurações especificadas.
 
         Args:
             config: Dicionário de configurações.
+            vanilla: Desativa os mods durante a sessão e os restaura ao sair.
 
         Returns:
             Tupla (sucesso: bool, mensagem: str)
@@ -130,20 +139,39 @@ class GameManager:
             if mode == "offline" and config.get("auto_fix_socialclub"):
                 self._prepare_offline_mode()
 
+            # Modo vanilla: desativar mods por renomeação
+            if vanilla:
+                self.mod_detector.game_path = self.game_path
+                ok, msg = self.mod_detector.disable_mods()
+                if not ok:
+                    return False, msg
+
             # Lançar o jogo
-            self._process = subprocess.Popen(
-                cmd,
-                cwd=self.game_path,
-                creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
-            )
+            try:
+                self._process = subprocess.Popen(
+                    cmd,
+                    cwd=self.game_path,
+                    creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
+                )
+            except Exception:
+                if vanilla:
+                    self.mod_detector.restore_mods()
+                raise
 
             time.sleep(2)
 
             # Verificar se o processo iniciou
             if self._process.poll() is not None:
+                if vanilla:
+                    self.mod_detector.restore_mods()
                 return False, "❌ O jogo fechou inesperadamente após o lançamento."
 
+            if vanilla:
+                self.watch_session(lambda: self.mod_detector.restore_mods())
+
             mode_text = "🔒 Offline (Single Player)" if mode == "offline" else "🌐 Online (GTA Online)"
+            if vanilla:
+                mode_text += " · Vanilla (sem mods)"
             return True, f"✅ GTA V lançado com sucesso!\nModo: {mode_text}"
 
         except FileNotFoundError:
@@ -176,6 +204,43 @@ class GameManager:
         if sc_settings_dir.exists():
             logger.info("Diretório Social Club encontrado, verificando configurações...")
 
+    def wait_for_session_end(self, start_timeout: Optional[float] = None,
+                             poll_interval: Optional[float] = None) -> bool:
+        """
+        Aguarda o GTA5.exe iniciar e depois encerrar.
+
+        Returns:
+            True se a sessão foi observada (o jogo abriu e fechou),
+            False se o jogo não iniciou dentro do tempo limite.
+        """
+        start_timeout = self.SESSION_START_TIMEOUT if start_timeout is None else start_timeout
+        poll_interval = self.SESSION_POLL_INTERVAL if poll_interval is None else poll_interval
+
+        deadline = time.monotonic() + start_timeout
+        while not self.is_game_running():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+        while self.is_game_running():
+            time.sleep(poll_interval)
+        return True
+
+    def watch_session(self, on_exit: Callable[[], object]) -> threading.Thread:
+        """Executa `on_exit` em segundo plano quando a sessão do jogo terminar."""
+        def watchdog():
+            observed = self.wait_for_session_end()
+            if not observed:
+                logger.warning("GTA5.exe não foi detectado; encerrando a sessão monitorada.")
+            try:
+                on_exit()
+            except Exception as e:
+                logger.error(f"Erro ao finalizar sessão: {e}")
+
+        t = threading.Thread(target=watchdog, daemon=True)
+        t.start()
+        return t
+
     def is_game_running(self) -> bool:
         """Verifica se o GTA V está em execução."""
         try:
@@ -0,0 +1,260 @@
+"""
+Módulo Health Scheduler - Verificações de saúde periódicas em segundo plano
+Roda uma seleção das verificações do SocialClubFixer (cache, settings.xml,
+mods) e o estado do firewall a cada intervalo, numa única thread em modo de
+fundo (prioridade de CPU e de E/S reduzidas), pulando a rodada enquanto o
+GTA5.exe estiver aberto. Só mudanças de estado viram notificação, e o custo
+de cada rodada é medido.
+"""
+
+import time
+import ctypes
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from modules.diagnostics import DiagnosticsRunner
+from modules.dir_size import serial_scans
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+DEFAULT_INTERVAL = 30 * 60          # segundos entre rodadas
+FIRST_RUN_DELAY = 2 * 60            # não concorre com a abertura do launcher
+HEALTH_CHECKS = ("cache", "settings", "mods")
+
+# Verificações em que a métrica também conta como mudança de estado
+METRIC_CHANGES = ("firewall",)
+
+# SetThreadPriority: baixa CPU, E/S e prioridade de memória da thread
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+THREAD_MODE_BACKGROUND_END = 0x00020000
+
+
+def _set_background_mode(enabled: bool) -> bool:
+    """Modo de fundo para a thread atual (somente Windows)."""
+    try:
+        kernel32 = ctypes.windll.kernel32
+        mode = THREAD_MODE_BACKGROUND_BEGIN if enabled else THREAD_MODE_BACKGROUND_END
+        return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), mode))
+    except (AttributeError, OSError):
+        return False
+
+
+class HealthScheduler:
+    """
+    Agenda verificações de saúde periódicas.
+
+    O estado de referência vem do histórico de diagnósticos (último resultado
+    de cada verificação), então uma mudança ocorrida com o launcher fechado
+    também é notificada. Os resultados das rodadas entram no histórico.
+    """
+
+    def __init__(self, fixer, net_mgr=None, interval: float = DEFAULT_INTERVAL,
+                 checks=HEALTH_CHECKS,
+                 is_game_running: Optional[Callable[[], bool]] = None,
+                 on_change: Optional[Callable[[List[dict]], None]] = None):
+        self.fixer = fixer
+        self.net_mgr = net_mgr
+        self.interval = interval
+        self.is_game_running = is_game_running or (lambda: False)
+        self.on_change = on_change
+        self.runner = self._build_runner(checks)
+        self._acknowledged = set()
+        self._stop = threading.Event()
+        self._round = threading.Lock()      # uma rodada por vez, mesmo entre threads
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"runs": 0, "skipped": 0, "cpu": 0.0, "wall": 0.0,
+                      "last_run": None, "last_cpu": 0.0, "last_wall": 0.0, "started": None}
+
+    def _build_runner(self, checks) -> DiagnosticsRunner:
+        runner = DiagnosticsRunner()
+        for check in self.fixer.diagnostics.checks:
+            if check.key in checks:
+                runner.register(check.key, check.name, check.fn, check.timeout)
+        if self.net_mgr is not None:
+            runner.register("firewall", "Firewall do GTA V", self._check_firewall)
+        return runner
+
+    def _check_firewall(self) -> dict:
+        blocked = self.net_mgr.get_block_status()["is_blocked"]
+        return {
+            "name": "Firewall do GTA V",
+            "status": "ok",
+            "message": "🔒 GTA V bloqueado no firewall." if blocked else "🔓 GTA V com acesso à internet.",
+            "fixable": False,
+            "metric": int(blocked),
+        }
+
+    # ===== Controle =====
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, first_delay: float = FIRST_RUN_DELAY):
+        if self.running and not self._stop.is_set():
+            return
+        # Sem esperar a thread anterior (pode estar no meio de uma rodada): ela
+        # tem o próprio sinal de parada e sai sozinha após a verificação atual
+        self._stop = threading.Event()
+        self.stats["started"] = time.time()
+        self._thread = threading.Thread(target=self._loop, args=(first_delay, self._stop),
+                                        name="health", daemon=True)
+        self._thread.start()
+        logger.info(f"Verificações em segundo plano a cada {self.interval / 60:.0f} min")
+
+    def stop(self):
+        self._stop.set()
+
+    def acknowledge(self, key: str):
+        """
+        O próprio launcher alterou esse estado (ex.: bloqueou o firewall): a
+        próxima rodada adota o novo valor sem notificar.
+        """
+        self._acknowledged.add(key)
+
+    def _loop(self, first_delay: float, stop: threading.Event):
+        background = _set_background_mode(True)
+        if not background:
+            logger.debug("Modo de fundo indisponível; verificações com prioridade normal")
+        if not stop.wait(first_delay):
+            while True:
+                self.run_once(stop)
+                if stop.wait(self.interval):
+                    break
+        if background:
+            _set_background_mode(False)
+
+    # ===== Rodada =====
+
+    def run_once(self, stop: Optional[threading.Event] = None) -> Optional[List[dict]]:
+        """
+        Executa uma rodada na thread atual; `stop` interrompe entre uma
+        verificação e outra.
+
+        Returns:
+            As mudanças de estado notificadas, ou None se a rodada foi pulada
+            porque o jogo está aberto.
+        """
+        stop = stop or self._stop
+        with self._round:
+            if stop.is_set():
+                return []
+            return self._run_round(stop)
+
+    def _run_round(self, stop: threading.Event) -> Optional[List[dict]]:
+        if self.is_game_running():
+            self.stats["skipped"] += 1
+            logger.debug("Verificação em segundo plano pulada: GTA V em execução")
+            return None
+
+        wall, cpu = time.perf_counter(), time.thread_time()
+        previous = self.fixer.history.latest()
+        results = []
+        for check in self.runner.checks:
+            # O jogo pode ter aberto no meio da rodada
+            if stop.is_set() or (results and self.is_game_running()):
+                break
+            # Medições de pasta na própria thread, em modo de fundo
+            with serial_scans():
+                results.append(self.runner.run_check(check.key))
+        self.fixer.history.record(results)
+
+        changes = []
+        for result in results:
+            prev = previous.get(result["key"])
+            if result["key"] in self._acknowledged:
+                self._acknowledged.discard(result["key"])
+                continue
+            if prev is None:
+                continue
+            changed = prev["status"] != result["status"]
+            if result["key"] in METRIC_CHANGES:
+                changed = changed or prev["metric"] != result.get("metric")
+            if changed:
+                result["previous"] = prev
+                changes.append(result)
+
+        cpu, wall = time.thread_time() - cpu, time.perf_counter() - wall
+        self.stats.update(runs=self.stats["runs"] + 1, cpu=self.stats["cpu"] + cpu,
+                          wall=self.stats["wall"] + wall, last_run=time.time(),
+                          last_cpu=cpu, last_wall=wall)
+        logger.info(f"Verificação em segundo plano: {len(results)} verificação(ões), "
+                    f"{len(changes)} mudança(s), CPU {cpu * 1000:.0f} ms, total {wall * 1000:.0f} ms")
+
+        if changes and self.on_change:
+            try:
+                self.on_change(changes)
+            except Exception as e:
+                logger.warning(f"Erro ao notificar mudanças de saúde: {e}")
+        return changes
+
+    def overhead(self) -> Dict[str, float]:
+        """
+        Custo médio por rodada e fração de um núcleo usada no intervalo
+        configurado (CPU da thread; processos externos como netsh não entram).
+        """
+        runs = self.stats["runs"] or 1
+        cpu = self.stats["cpu"] / runs
+        return {"cpu_ms": cpu * 1000, "wall_ms": self.stats["wall"] / runs * 1000,
+                "core_share": cpu / self.interval, "runs": self.stats["runs"],
+                "skipped": self.stats["skipped"]}
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    from pathlib import Path
+
+    from modules.dir_size import DirSizeCache
+    from modules.settings_xml import SettingsXml
+    from modules.diag_history import DiagnosticsHistory
+
+    # Uso: python -m modules.health_scheduler
+    root = Path(tempfile.mkdtemp(prefix="health_"))
+    try:
+        cache = root / "cache"
+        for a in range(50):
+            d = cache / f"d{a}"
+            d.mkdir(parents=True)
+            for i in range(400):
+                (d / f"f{i}").write_bytes(b"x" * 2048)
+        (root / "settings.xml").write_text(
+            "<Settings>\n  <graphics>\n" + "".join(
+                f'    <{k} value="1" />\n' for k in ("TextureQuality", "ShaderQuality", "MSAA")) +
+            "  </graphics>\n  <video>\n    <ScreenWidth value=\"1920\" />\n  </video>\n</Settings>\n",
+            encoding="utf-8")
+
+        sizer = DirSizeCache()
+        settings = SettingsXml(root / "settings.xml")
+
+        class Fixer:
+            history = DiagnosticsHistory(root / "diagnostics.db")
+            diagnostics = (DiagnosticsRunner()
+                           .register("cache", "Cache", lambda: {
+                               "name": "Cache", "status": "ok", "message": "",
+                               "metric": sizer.measure(cache)["bytes"] / 1024 / 1024})
+                           .register("settings", "settings.xml", lambda: {
+                               "name": "settings.xml", "message": "",
+                               "status": "ok" if settings.check()["status"] == "ok" else "error"}))
+
+        changes_seen = []
+        scheduler = HealthScheduler(Fixer(), interval=DEFAULT_INTERVAL,
+                                    on_change=changes_seen.extend)
+        scheduler.run_once()
+        cold = scheduler.stats["last_cpu"]
+        for _ in range(20):
+            scheduler.run_once()
+        warm = scheduler.overhead()
+        (root / "settings.xml").write_text("<Settings><graphics>", encoding="utf-8")
+        scheduler.run_once()
+
+        print(f"{sum(1 for _ in cache.rglob('*')):,} entradas no cache de teste")
+        print(f"primeira rodada:      CPU {cold * 1000:6.1f} ms")
+        print(f"rodadas seguintes:    CPU {warm['cpu_ms']:6.1f} ms, total {warm['wall_ms']:6.1f} ms")
+        print(f"a cada {DEFAULT_INTERVAL // 60} min:       {warm['core_share'] * 100:.5f}% de um núcleo")
+        print(f"mudanças notificadas: {[c['key'] for c in changes_seen]}")
+        Fixer.history.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
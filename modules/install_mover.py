@@ -0,0 +1,430 @@
+"""
+Módulo Install Mover - Move a instalação do GTA V para outro disco
+Cópia paralela com buffers grandes, checkpoints para retomar após
+interrupção e verificação por hash: calculado durante a própria cópia e
+conferido relendo o destino antes de a origem poder ser apagada.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.config import save_config
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+CHECKPOINT_FILE = ".gtavlauncher_move.json"
+MANIFEST_FILE = ".gtavlauncher_manifest.json"
+PARTIAL_SUFFIX = ".move-partial"
+
+BUFFER_SIZE = 8 * 1024 * 1024
+SEGMENT_SIZE = 64 * 1024 * 1024      # unidade de checkpoint dentro de um arquivo
+CHECKPOINT_INTERVAL = 2.0            # segundos entre gravações do checkpoint
+
+SPARSE_BLOCK = 64 * 1024             # granularidade da detecção de trechos zerados
+
+_ZERO_BLOCK = bytes(SPARSE_BLOCK)
+
+
+def _write_sparse(fout, buf: bytes):
+    """Escreve `buf` pulando (seek) os blocos zerados: preserva arquivos esparsos."""
+    view = memoryview(buf)
+    start = 0                       # início do trecho com dados ainda não escrito
+    for pos in range(0, len(buf), SPARSE_BLOCK):
+        length = min(SPARSE_BLOCK, len(buf) - pos)
+        # startswith compara com memcmp; memoryview == bytes compara byte a byte
+        if buf.startswith(_ZERO_BLOCK[:length], pos):
+            if start < pos:
+                fout.write(view[start:pos])
+            fout.seek(length, os.SEEK_CUR)
+            start = pos + length
+    if start < len(view):
+        fout.write(view[start:])
+
+
+def _combine(segment_hashes: List[str]) -> str:
+    """Hash do arquivo = hash da lista de hashes dos segmentos."""
+    return hashlib.blake2b("".join(segment_hashes).encode(), digest_size=32).hexdigest()
+
+
+class InstallMover:
+    """
+    Copia uma instalação do GTA V para um novo destino e atualiza a config.
+
+    Cada arquivo é copiado em segmentos de 64 MB; o hash de cada segmento é
+    calculado sobre os bytes lidos durante a cópia e gravado no checkpoint.
+    Uma cópia interrompida é retomada a partir do último segmento concluído,
+    inclusive no meio de arquivos grandes.
+    """
+
+    def __init__(self, source: str, destination: str, streams: int = 4,
+                 buffer_size: int = BUFFER_SIZE):
+        self.source = os.path.normpath(source)
+        self.destination = os.path.normpath(destination)
+        self.streams = max(1, streams)
+        self.buffer_size = buffer_size
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._state: Dict[str, dict] = {}
+        self._last_checkpoint = 0.0
+        self._bytes_done = 0
+        self._verified = False
+
+    @property
+    def checkpoint_path(self) -> str:
+        return os.path.join(self.destination, CHECKPOINT_FILE)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.destination, MANIFEST_FILE)
+
+    def cancel(self):
+        """Interrompe a cópia; ela pode ser retomada chamando run() de novo."""
+        self._cancel.set()
+
+    # ===== Planejamento =====
+
+    def _plan(self) -> List[dict]:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.source):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                st = os.stat(path)
+                files.append({
+                    "rel": os.path.relpath(path, self.source),
+                    "size": st.st_size,
+                    "mtime": st.st_mtime_ns,
+                })
+        # Arquivos grandes primeiro: melhor distribuição entre os streams
+        files.sort(key=lambda f: f["size"], reverse=True)
+        return files
+
+    def _load_checkpoint(self) -> Dict[str, dict]:
+        if os.path.isfile(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if os.path.normcase(data.get("source", "")) == os.path.normcase(self.source):
+                    return data.get("files", {})
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Checkpoint ilegível, recomeçando: {e}")
+        return {}
+
+    def _save_checkpoint(self, force: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_checkpoint < CHECKPOINT_INTERVAL:
+                return
+            self._last_checkpoint = now
+            data = json.dumps({"source": self.source, "files": self._state})
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ===== Cópia =====
+
+    def _copy_file(self, item: dict):
+        rel = item["rel"]
+        src = os.path.join(self.source, rel)
+        dst = os.path.join(self.destination, rel)
+        partial = dst + PARTIAL_SUFFIX
+
+        with self._lock:
+            state = self._state.get(rel)
+            if not state or state["size"] != item["size"] or state["mtime"] != item["mtime"]:
+                # Arquivo novo ou alterado na origem desde o checkpoint
+                state = {"size": item["size"], "mtime": item["mtime"],
+                         "segments": [], "done": False}
+                self._state[rel] = state
+            state["done"] = False
+            segments = list(state["segments"])
+
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        offset = len(segments) * SEGMENT_SIZE
+        if offset and not os.path.isfile(partial):
+            segments, offset = [], 0
+
+        with open(src, "rb") as fin, open(partial, "r+b" if offset else "wb") as fout:
+            fin.seek(offset)
+            fout.seek(offset)
+            fout.truncate()
+            while offset < item["size"]:
+                if self._cancel.is_set():
+                    return
+                h = hashlib.blake2b(digest_size=32)
+                seg_end = min(offset + SEGMENT_SIZE, item["size"])
+                while offset < seg_end:
+                    buf = fin.read(min(self.buffer_size, seg_end - offset))
+                    if not buf:
+                        raise IOError(f"Arquivo encolheu durante a cópia: {src}")
+                    h.update(buf)
+                    _write_sparse(fout, buf)
+                    offset += len(buf)
+                    with self._lock:
+                        self._bytes_done += len(buf)
+                fout.truncate(offset)
+                fout.flush()
+                os.fsync(fout.fileno())
+                segments.append(h.hexdigest())
+                with self._lock:
+                    state["segments"] = list(segments)
+                self._save_checkpoint()
+
+        os.replace(partial, dst)
+        shutil.copystat(src, dst)
+        with self._lock:
+            state["hash"] = _combine(segments)
+            state["done"] = True
+        self._save_checkpoint()
+
+    def run(self, progress: Optional[Callable[[dict], None]] = None) -> Tuple[bool, str]:
+        """
+        Copia (ou retoma a cópia de) toda a instalação.
+
+        Args:
+            progress: Callback chamado periodicamente com bytes copiados,
+                      total, throughput (MB/s) e ETA (segundos).
+        """
+        self._cancel.clear()
+        if not os.path.isfile(os.path.join(self.source, "GTA5.exe")):
+            return False, "❌ A origem não é uma instalação válida do GTA V."
+        if os.path.normcase(self.destination).startswith(os.path.normcase(self.source) + os.sep):
+            return False, "❌ O destino não pode ficar dentro da pasta de origem."
+
+        os.makedirs(self.destination, exist_ok=True)
+        files = self._plan()
+        total = sum(f["size"] for f in files)
+
+        self._state = self._load_checkpoint()
+        pending = []
+        already = 0
+        for f in files:
+            st = self._state.get(f["rel"])
+            dst = os.path.join(self.destination, f["rel"])
+            if (st and st.get("done") and st["size"] == f["size"] and st["mtime"] == f["mtime"]
+                    and os.path.isfile(dst) and os.path.getsize(dst) == f["size"]):
+                already += f["size"]
+            else:
+                if st and not st.get("done"):
+                    already += len(st.get("segments", [])) * SEGMENT_SIZE
+                pending.append(f)
+
+        needed = total - already
+        free = shutil.disk_usage(self.destination).free
+        if needed > free:
+            return False, (f"❌ Espaço insuficiente no destino: "
+                           f"{needed / 1024 ** 3:.1f} GB necessários, {free / 1024 ** 3:.1f} GB livres.")
+
+        self._bytes_done = 0
+        start = time.monotonic()
+        errors = []
+
+        def report():
+            elapsed = max(time.monotonic() - start, 1e-6)
+            speed = self._bytes_done / elapsed
+            done = min(already + self._bytes_done, total)
+            progress({
+                "bytes_done": done,
+                "bytes_total": total,
+                "mb_per_s": speed / (1024 * 1024),
+                "eta_s": (total - done) / speed if speed > 0 else None,
+            })
+
+        def work(item):
+            try:
+                self._copy_file(item)
+            except OSError as e:
+                errors.append(f"{item['rel']}: {e}")
+                self._cancel.set()
+
+        with ThreadPoolExecutor(max_workers=self.streams) as pool:
+            futures = [pool.submit(work, f) for f in pending]
+            while progress and not all(fu.done() for fu in futures):
+                report()
+                time.sleep(0.5)
+        self._save_checkpoint(force=True)
+        if progress:
+            report()
+
+        if errors:
+            return False, "❌ Erro na cópia (retome para continuar):\n" + "\n".join(errors[:5])
+        if self._cancel.is_set():
+            return False, "⏸️ Cópia interrompida. Execute novamente para retomar."
+
+        elapsed = time.monotonic() - start
+        speed = self._bytes_done / max(elapsed, 1e-6) / (1024 * 1024)
+        return True, f"✅ {len(files)} arquivo(s) copiado(s) em {elapsed:.0f}s ({speed:.0f} MB/s)."
+
+    # ===== Finalização =====
+
+    def write_manifest(self) -> Tuple[bool, str]:
+        """Confere o checkpoint e grava o manifesto com o hash de cada arquivo planejado."""
+        files = self._plan()
+        state = self._load_checkpoint()
+        missing = [f["rel"] for f in files
+                   if not state.get(f["rel"], {}).get("done")
+                   or state[f["rel"]]["size"] != f["size"]]
+        if missing:
+            return False, f"❌ {len(missing)} arquivo(s) ainda não copiado(s). Execute a cópia novamente."
+
+        # Só os arquivos atuais da origem: entradas antigas do checkpoint ficam de fora
+        manifest = {f["rel"]: {"size": f["size"], "hash": state[f["rel"]]["hash"]} for f in files}
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "segment_size": SEGMENT_SIZE, "files": manifest}, f)
+        os.replace(tmp, self.manifest_path)
+        self._verified = False
+        return True, f"✅ Manifesto gravado ({len(manifest)} arquivo(s))."
+
+    def finalize(self, config: dict, remove_source: bool = False) -> Tuple[bool, str]:
+        """
+        Aponta a config para o novo destino em uma única escrita atômica do
+        config.json. A origem só é apagada se verify() tiver relido o destino
+        e conferido todos os arquivos.
+        """
+        if remove_source and not self._verified:
+            return False, "❌ O destino não foi verificado; a instalação antiga não será apagada."
+        if not os.path.isfile(self.manifest_path):
+            ok, msg = self.write_manifest()
+            if not ok:
+                return False, msg
+
+        old = self.source
+        installs = [p for p in config.get("known_installs", [])
+                    if os.path.normcase(p) != os.path.normcase(old)]
+        if not remove_source:
+            installs.append(old)
+        installs.insert(0, self.destination)
+        config["known_installs"] = installs
+        if os.path.normcase(config.get("game_path", "")) in ("", os.path.normcase(old)):
+            config["game_path"] = self.destination
+        save_config(config)
+        if os.path.isfile(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        if remove_source:
+            shutil.rmtree(old, ignore_errors=True)
+        logger.info(f"Instalação movida: {old} -> {self.destination}")
+        return True, f"✅ GTA V movido para {self.destination}"
+
+    def verify(self, workers: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Relê o destino e compara com o manifesto. Arquivos divergentes saem do
+        checkpoint, para a próxima execução de run() copiá-los de novo.
+        """
+        self._verified = False
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            return False, f"❌ Manifesto não encontrado: {e}"
+
+        def check(item) -> Optional[Tuple[str, str]]:
+            rel, info = item
+            segments = []
+            try:
+                with open(os.path.join(self.destination, rel), "rb") as f:
+                    while True:
+                        h = hashlib.blake2b(digest_size=32)
+                        remaining = manifest["segment_size"]
+                        while remaining:
+                            buf = f.read(min(self.buffer_size, remaining))
+                            if not buf:
+                                break
+                            h.update(buf)
+                            remaining -= len(buf)
+                        if remaining == manifest["segment_size"]:
+                            break
+                        segments.append(h.hexdigest())
+            except OSError as e:
+                return rel, f"{rel}: {e}"
+            return None if _combine(segments) == info["hash"] else (rel, f"{rel}: hash divergente")
+
+        with ThreadPoolExecutor(max_workers=workers or self.streams) as pool:
+            problems = [p for p in pool.map(check, manifest["files"].items()) if p]
+        if problems:
+            self._state = self._load_checkpoint()
+            if self._state:
+                for rel, _ in problems:
+                    self._state.pop(rel, None)
+                self._save_checkpoint(force=True)
+            return False, (f"❌ {len(problems)} arquivo(s) com problema no destino "
+                           f"(execute a cópia novamente):\n" + "\n".join(p[1] for p in problems[:10]))
+        self._verified = True
+        return True, f"✅ {len(manifest['files'])} arquivo(s) relidos no destino e conferidos."
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Uso: python -m modules.install_mover
+    # Árvore sintética com arquivos grandes e esparsos: cópia interrompida,
+    # retomada, verificação relendo o destino e esparsidade preservada.
+    root = tempfile.mkdtemp(prefix="mover_")
+    try:
+        src = os.path.join(root, "src", "Grand Theft Auto V")
+        os.makedirs(os.path.join(src, "update"))
+        with open(os.path.join(src, "GTA5.exe"), "wb") as f:
+            f.write(os.urandom(4 * 1024 * 1024))
+        sizes = {"x64a.rpf": 3 * 1024 ** 3, "x64b.rpf": 2 * 1024 ** 3,
+                 os.path.join("update", "update.rpf"): 1024 ** 3 + 12345}
+        for rel, size in sizes.items():
+            with open(os.path.join(src, rel), "wb") as f:
+                f.truncate(size)
+                for pos in (0, size // 3, size - 4096):      # poucos trechos com dados
+                    f.seek(pos)
+                    f.write(os.urandom(4096))
+
+        def allocated(path: str) -> int:
+            return sum(os.stat(os.path.join(d, n)).st_blocks * 512
+                       for d, _, names in os.walk(path) for n in names)
+
+        dest = os.path.join(root, "dest", "Grand Theft Auto V")
+        mover = InstallMover(src, dest)
+        mover.streams = 2
+
+        def interrupt(p):
+            if p["bytes_done"] > 2 * 1024 ** 3:
+                mover.cancel()
+
+        ok, msg = mover.run(progress=interrupt)
+        print(f"1ª execução:  {msg}")
+        assert not ok and os.path.isfile(mover.checkpoint_path)
+
+        ok, msg = InstallMover(src, dest).run()
+        print(f"retomada:     {msg}")
+        assert ok
+
+        mover = InstallMover(src, dest)
+        ok, msg = mover.finalize({}, remove_source=True)
+        print(f"sem verify:   {msg}")
+        assert not ok and os.path.isdir(src)
+
+        assert mover.write_manifest()[0]
+        t0 = time.perf_counter()
+        ok, msg = mover.verify()
+        print(f"verificação:  {msg} ({time.perf_counter() - t0:.1f}s)")
+        assert ok
+
+        logical = sum(sizes.values())
+        print(f"origem:  {logical / 1024 ** 3:.1f} GB lógicos, {allocated(src) / 1024 ** 2:.1f} MB alocados")
+        print(f"destino: {allocated(dest) / 1024 ** 2:.1f} MB alocados")
+        assert allocated(dest) < 2 * allocated(src), "destino deixou de ser esparso"
+
+        # Um byte alterado no destino: verify() acusa e tira o arquivo do checkpoint
+        with open(os.path.join(dest, "x64b.rpf"), "r+b") as f:
+            f.seek(2 * 1024 ** 3 // 3)
+            f.write(b"\xff")
+        ok, msg = mover.verify()
+        print(f"corrompido:   {msg.splitlines()[0]}")
+        assert not ok and not mover.finalize({}, remove_source=True)[0]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,349 @@
+"""
+Módulo Log Analyzer - Análise incremental dos logs do Launcher, Social Club e ELS
+Cada arquivo é lido a partir do último byte já analisado (só o que é novo),
+em blocos de tamanho fixo, e as linhas candidatas (filtradas por trechos
+fixos) são comparadas com uma única expressão regular que reúne todas as
+assinaturas de erro conhecidas. Cada assinatura aponta para a correção
+correspondente do SocialClubFixer.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+ROCKSTAR_DOCUMENTS = Path(os.environ.get("USERPROFILE", "")) / "Documents" / "Rockstar Games"
+
+# origem -> (pasta, padrão de arquivos)
+LOG_SOURCES = {
+    "launcher": (ROCKSTAR_DOCUMENTS / "Launcher", "launcher*.log"),
+    "socialclub": (ROCKSTAR_DOCUMENTS / "Social Club", "*.log"),
+    "els": (ROCKSTAR_DOCUMENTS / "GTA V" / "ELS", "*.log"),
+}
+
+LOG_STATE_FILE = CONFIG_DIR / "log_state.json"
+
+CHUNK_SIZE = 1024 * 1024        # leitura em blocos: memória constante
+MAX_LINE = 64 * 1024            # linhas maiores são cortadas
+HEAD_BYTES = 1024               # identifica o arquivo mesmo se renomeado (launcher_previous.log)
+INITIAL_TAIL = 32 * 1024 * 1024  # primeira leitura de um log: só os últimos 32 MB
+RECENT_DAYS = 7                 # ocorrências reportadas no diagnóstico
+
+# chave -> (trechos, padrão, severidade, descrição, correção do SocialClubFixer ou None)
+# Toda linha que casa com o padrão contém um dos trechos (em minúsculas): eles
+# servem de filtro rápido (bytes.find) antes do regex. Os padrões não podem ter
+# grupos de captura: a assinatura vem do grupo nomeado.
+SIGNATURES = {
+    "sc_init": ((b"social", b"sc_init_err"),
+                rb"social ?club (?:failed to initiali[sz]e|initiali[sz]ation failed)|err_no_social_club|sc_init_err",
+                "error", "O Social Club não inicializou", "clear_social_club_cache"),
+    "sc_cache": ((b"cache", b"cef"),
+                 rb"(?:cache|cef).{0,40}(?:corrupt|invalid|failed to (?:load|open))",
+                 "warning", "Cache do Social Club/Launcher corrompido", "clear_launcher_cache"),
+    "entitlement": ((b"entitlement", b"ownership"),
+                    rb"err_no_entitlement|entitlement (?:check )?failed|could not verify ownership",
+                    "error", "Falha ao verificar a licença do jogo", "clear_launcher_cache"),
+    "settings": ((b"settings.xml",),
+                 rb"settings\.xml.{0,60}(?:fail|error|invalid|corrupt)",
+                 "error", "Erro ao ler o settings.xml", "repair_settings"),
+    "d3d_init": ((b"d3d", b"direct3d"),
+                 rb"err_gfx_d3d_(?:init|nod3d\b|swapchain_alloc)|failed to create (?:d3d|direct3d) device",
+                 "error", "Falha ao iniciar o DirectX (configurações gráficas)", "repair_settings"),
+    "gfx_state": ((b"err_gfx_",),
+                  rb"err_gfx_(?:state|d3d_deferred_mem|d3d_nod3d1x)",
+                  "warning", "Erro do driver de vídeo (driver ou overclock)", None),
+    "memory": ((b"err_mem_", b"out of memory"),
+               rb"err_mem_(?:embeddedalloc|multialloc|virtual)\w*|out of memory",
+               "error", "Memória insuficiente", None),
+    "game_files": ((b"err_fil_pack", b"err_no_pack", b"hash mismatch", b"corrupt"),
+                   rb"err_fil_pack_\d|err_no_pack|hash mismatch|corrupt(?:ed)? (?:game )?files?",
+                   "error", "Arquivos do jogo corrompidos: verifique a integridade", None),
+    "network": ((b"err_net_", b"failed to connect", b"timed out"),
+                rb"err_net_\w+|failed to connect to (?:server|rockstar)|connection timed out",
+                "warning", "Falha de conexão com os servidores Rockstar", None),
+    "crash": ((b"exception", b"crashed"),
+              rb"exception_access_violation|unhandled exception|game (?:has )?crashed",
+              "error", "O jogo travou (exceção não tratada)", None),
+}
+
+PATTERN = re.compile(b"|".join(b"(?P<%s>%s)" % (key.encode(), sig[1])
+                               for key, sig in SIGNATURES.items()), re.IGNORECASE)
+NEEDLES = tuple(sorted({n for sig in SIGNATURES.values() for n in sig[0]}))
+
+
+def _head(path, length: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def scan_bytes(data: bytes, hits: Dict[str, list]):
+    """
+    Procura as assinaturas em `data` (só linhas completas); no máximo uma por
+    linha. `hits` acumula {chave: [ocorrências, última linha]}.
+
+    O regex combinado só roda nas linhas que contêm algum dos NEEDLES: buscar
+    trechos fixos com bytes.find é bem mais rápido que deixar o regex testar
+    todas as posições do bloco.
+    """
+    lowered = data.lower()
+    lines = set()
+    for needle in NEEDLES:
+        i = lowered.find(needle)
+        while i >= 0:
+            end = lowered.find(b"\n", i)
+            if end < 0:
+                end = len(data)
+            lines.add((lowered.rfind(b"\n", 0, i) + 1, end))
+            i = lowered.find(needle, end)
+    search = PATTERN.search
+    for start, end in sorted(lines):
+        m = search(data, start, end)
+        if m:
+            hit = hits.setdefault(m.lastgroup, [0, b""])
+            hit[0] += 1
+            hit[1] = data[start:end]
+
+
+class LogAnalyzer:
+    """
+    Analisa os logs de forma incremental.
+
+    O estado (log_state.json) guarda, por arquivo, até onde ele já foi lido e
+    um hash dos primeiros bytes: se o arquivo foi recriado a leitura recomeça
+    do zero, e se foi só renomeado (launcher.log → launcher_previous.log) o
+    ponto de leitura acompanha o arquivo. As ocorrências encontradas ficam
+    guardadas para o diagnóstico continuar mostrando-as nas execuções
+    seguintes, mesmo sem linhas novas.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, Tuple[Path, str]]] = None,
+                 state_path=LOG_STATE_FILE, initial_tail: Optional[int] = INITIAL_TAIL):
+        self.sources = sources if sources is not None else LOG_SOURCES
+        self.state_path = Path(state_path)
+        self.initial_tail = initial_tail
+        self._state: Optional[dict] = None
+
+    # ===== Estado =====
+
+    def _load_state(self) -> dict:
+        if self._state is None:
+            self._state = {"files": {}, "findings": {}}
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self._state.update(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                pass
+        return self._state
+
+    def _save_state(self):
+        if self.state_path == LOG_STATE_FILE:
+            ensure_config_dir()
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    def _start_offset(self, path: str, size: int) -> Tuple[int, bool]:
+        """
+        Byte a partir do qual o arquivo ainda não foi analisado e se ele cai no
+        meio de uma linha (primeira leitura de um log grande).
+        """
+        files = self._state["files"]
+        candidates = [files[path]] if path in files else []
+        candidates += [e for p, e in files.items() if p != path and e["head_len"]]
+        for entry in candidates:
+            length = entry["head_len"]
+            if size >= length and entry["offset"] <= size and _head(path, length) == entry["head"]:
+                return entry["offset"], False
+        if self.initial_tail is not None and size > self.initial_tail:
+            return size - self.initial_tail, True
+        return 0, False
+
+    def log_files(self) -> Iterable[Tuple[str, str]]:
+        """(origem, caminho) de cada log existente."""
+        for source, (folder, pattern) in self.sources.items():
+            if Path(folder).is_dir():
+                for path in sorted(Path(folder).glob(pattern)):
+                    if path.is_file():
+                        yield source, str(path)
+
+    # ===== Análise =====
+
+    def scan_file(self, path: str, start: int, hits: Dict[str, list], mid_line: bool = False) -> int:
+        """
+        Lê `path` a partir de `start` em blocos de CHUNK_SIZE. Com `mid_line`,
+        descarta o trecho até a primeira quebra de linha.
+
+        Returns:
+            Offset do fim da última linha completa (a linha parcial do final
+            é lida de novo na próxima vez).
+        """
+        consumed = 0
+        tail = b""
+        with open(path, "rb") as f:
+            f.seek(start)
+            if mid_line:
+                consumed += len(f.readline(MAX_LINE))
+            while True:
+                block = f.read(CHUNK_SIZE)
+                if not block:
+                    break
+                consumed += len(block)
+                data = tail + block
+                cut = data.rfind(b"\n") + 1
+                if cut:
+                    scan_bytes(data[:cut], hits)
+                    tail = data[cut:]
+                else:
+                    tail = data
+                if len(tail) > MAX_LINE:
+                    tail = tail[-MAX_LINE:]
+        return start + consumed - len(tail)
+
+    def analyze(self) -> dict:
+        """
+        Analisa o que há de novo em todos os logs.
+
+        Returns:
+            Dict com "new" ({chave: ocorrências nesta execução}), "findings"
+            (ocorrências dos últimos RECENT_DAYS dias, da mais grave para a
+            menos grave), "bytes" lidos, "files" e "elapsed" (s).
+        """
+        started = time.perf_counter()
+        state = self._load_state()
+        now = time.time()
+        new_counts: Dict[str, int] = {}
+        read = 0
+        seen_files = {}
+
+        for source, path in self.log_files():
+            try:
+                st = os.stat(path)
+                start, mid_line = self._start_offset(path, st.st_size)
+                hits: Dict[str, list] = {}
+                end = self.scan_file(path, start, hits, mid_line)
+            except OSError as e:
+                logger.debug(f"Log ilegível {path}: {e}")
+                continue
+            read += end - start
+            length = min(st.st_size, HEAD_BYTES)
+            seen_files[path] = {"offset": end, "head_len": length, "head": _head(path, length)}
+            for key, (count, line) in hits.items():
+                new_counts[key] = new_counts.get(key, 0) + count
+                finding = state["findings"].setdefault(key, {"count": 0})
+                finding.update(count=finding["count"] + count, last_seen=now, source=source,
+                               file=os.path.basename(path),
+                               line=line.decode("utf-8", "replace").strip()[:300])
+
+        # Só arquivos que ainda existem ficam no estado
+        state["files"] = seen_files
+        try:
+            self._save_state()
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o estado dos logs: {e}")
+
+        findings = self.recent_findings(now)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Logs: {read / 1024 / 1024:.1f} MB novos analisados em {elapsed:.2f} s")
+        return {"new": new_counts, "findings": findings, "bytes": read,
+                "files": len(seen_files), "elapsed": round(elapsed, 3)}
+
+    def recent_findings(self, now: Optional[float] = None) -> List[dict]:
+        """Ocorrências vistas nos últimos RECENT_DAYS dias, com severidade e correção."""
+        now = now or time.time()
+        result = []
+        for key, finding in self._load_state()["findings"].items():
+            if key not in SIGNATURES or now - finding.get("last_seen", 0) > RECENT_DAYS * 86400:
+                continue
+            _, _, severity, description, fix = SIGNATURES[key]
+            result.append({"key": key, "severity": severity, "description": description,
+                           "fix": fix, **finding})
+        result.sort(key=lambda f: (f["severity"] != "error", -f["last_seen"]))
+        return result
+
+    def dismiss(self, keys: Optional[Iterable[str]] = None):
+        """Esquece ocorrências (ex.: depois de aplicar a correção)."""
+        state = self._load_state()
+        if keys is None:
+            state["findings"].clear()
+        else:
+            for key in keys:
+                state["findings"].pop(key, None)
+        self._save_state()
+
+
+if __name__ == "__main__":
+    import shutil
+    import random
+    import tempfile
+
+    # Uso: python -m modules.log_analyzer
+    root = Path(tempfile.mkdtemp(prefix="logs_"))
+    try:
+        print("Gerando launcher.log de ~300 MB…")
+        rnd = random.Random(1)
+        normal = [b"[2024-05-01 12:00:%02d.123] [DISPLAY] Downloading manifest chunk %d of 4096 (ok)\n" % (i % 60, i)
+                  for i in range(2000)]
+        errors = [b"[2024-05-01 12:00:00.000] [ERROR] Social Club failed to initialize (code 1)\n",
+                  b"[2024-05-01 12:00:00.000] [ERROR] ERR_GFX_D3D_INIT while creating swapchain\n",
+                  b"[2024-05-01 12:00:00.000] [ERROR] settings.xml: parse error at line 42\n"]
+        target = 300 * 1024 * 1024
+        with open(root / "launcher.log", "wb") as f:
+            written = 0
+            while written < target:
+                block = b"".join(rnd.choice(normal) for _ in range(5000))
+                if rnd.random() < 0.02:
+                    block += rnd.choice(errors)
+                f.write(block)
+                written += len(block)
+
+        sources = {"launcher": (root, "launcher*.log")}
+        analyzer = LogAnalyzer(sources, state_path=root / "state.json", initial_tail=None)
+
+        import tracemalloc
+        tracemalloc.start()
+        full = analyzer.analyze()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # Referência: linha a linha, um regex por assinatura (nos primeiros 30 MB)
+        sample = 30 * 1024 * 1024
+        patterns = [re.compile(sig[1], re.IGNORECASE) for sig in SIGNATURES.values()]
+        t0 = time.perf_counter()
+        naive = 0
+        with open(root / "launcher.log", "rb") as f:
+            for line in f:
+                naive += any(p.search(line) for p in patterns)
+                sample -= len(line)
+                if sample <= 0:
+                    break
+            sample_end = f.tell()
+        t_naive = time.perf_counter() - t0
+        with open(root / "launcher.log", "rb") as f:
+            sample_hits: Dict[str, list] = {}
+            scan_bytes(f.read(sample_end), sample_hits)
+        assert naive == sum(count for count, _ in sample_hits.values())
+
+        with open(root / "launcher.log", "ab") as f:
+            f.write(errors[0] * 3)
+        incremental = analyzer.analyze()
+        assert incremental["new"] == {"sc_init": 3}
+
+        mb = full["bytes"] / 1024 / 1024
+        print(f"linha a linha, um regex por assinatura: {sample_end / 1024 / 1024 / t_naive:8.1f} MB/s")
+        print(f"blocos + filtro + regex único:          {mb / full['elapsed']:8.1f} MB/s "
+              f"({mb:.0f} MB em {full['elapsed']:.1f} s, pico de memória {peak / 1024 / 1024:.1f} MB)")
+        print(f"execução seguinte (só o novo):          {incremental['elapsed'] * 1000:8.1f} ms "
+              f"({incremental['bytes']} bytes lidos)")
+        print(f"ocorrências: {full['new']}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
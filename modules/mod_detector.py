@@ -0,0 +1,228 @@
+"""
+Módulo Mod Detector - Detecta mods, ASI loaders e plugins na pasta do GTA V
+Permite iniciar o jogo "vanilla", desativando os mods por renomeação.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from modules.rpf_reader import read_rpf_header
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+# Arquivos conhecidos na raiz do jogo -> (categoria, descrição)
+KNOWN_MOD_FILES = {
+    "dinput8.dll": ("loader", "ASI Loader (dinput8.dll)"),
+    "scripthookv.dll": ("loader", "Script Hook V"),
+    "scripthookvdotnet.asi": ("plugin", "Script Hook V .NET"),
+    "scripthookvdotnet2.dll": ("plugin", "Script Hook V .NET 2"),
+    "scripthookvdotnet3.dll": ("plugin", "Script Hook V .NET 3"),
+    "openiv.asi": ("plugin", "OpenIV.asi (carrega a pasta mods)"),
+    "dsound.dll": ("loader", "ASI Loader (dsound.dll)"),
+    "d3d11.dll": ("graphics", "Injetor gráfico (ReShade/ENB)"),
+    "dxgi.dll": ("graphics", "Injetor gráfico (ReShade)"),
+    "enbseries.ini": ("graphics", "Configuração ENB"),
+    "reshade.ini": ("graphics", "Configuração ReShade"),
+}
+
+# Pastas conhecidas na raiz do jogo
+KNOWN_MOD_DIRS = {
+    "mods": ("mods_folder", "Pasta mods/ (OpenIV)"),
+    "scripts": ("scripts", "Pasta scripts/ (Script Hook V .NET)"),
+}
+
+# Categorias que são desativadas no modo vanilla
+DISABLE_CATEGORIES = ("loader", "plugin", "graphics", "mods_folder", "scripts")
+
+DISABLED_SUFFIX = ".launcher-off"
+VANILLA_JOURNAL = ".gtavlauncher_vanilla.json"
+
+
+class ModDetector:
+    """Detecta e desativa temporariamente mods na pasta do jogo."""
+
+    def __init__(self, game_path: str = ""):
+        self.game_path = game_path
+        self._fingerprint: Optional[str] = None
+        self._cached: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.game_path, VANILLA_JOURNAL)
+
+    # ===== Detecção =====
+
+    def _scan_root(self) -> Tuple[str, List[os.DirEntry]]:
+        """Lê a raiz do jogo uma única vez e calcula a impressão digital."""
+        entries = []
+        digest = hashlib.blake2b(digest_size=16)
+        with os.scandir(self.game_path) as it:
+            for entry in it:
+                entries.append(entry)
+        entries.sort(key=lambda e: e.name.lower())
+        for entry in entries:
+            st = entry.stat(follow_symlinks=False)
+            size = 0 if entry.is_dir(follow_symlinks=False) else st.st_size
+            digest.update(f"{entry.name}\0{size}\0{st.st_mtime_ns}\n".encode("utf-8", "replace"))
+        return digest.hexdigest(), entries
+
+    def scan(self, force: bool = False) -> dict:
+        """
+        Procura mods na raiz do jogo.
+
+        O resultado é reaproveitado enquanto a impressão digital da pasta
+        (nomes + tamanhos + datas) não mudar.
+
+        Returns:
+            Dict com a lista de itens detectados e a impressão digital.
+        """
+        if not self.game_path or not os.path.isdir(self.game_path):
+            return {"fingerprint": None, "items": [], "modified_archives": [], "cached": False}
+
+        fingerprint, entries = self._scan_root()
+        with self._lock:
+            if not force and self._cached and fingerprint == self._fingerprint:
+                return {**self._cached, "cached": True}
+
+        items = []
+        modified_archives = []
+        for entry in entries:
+            name = entry.name
+            lower = name.lower()
+            if lower.endswith(DISABLED_SUFFIX):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                known = KNOWN_MOD_DIRS.get(lower)
+                if known:
+                    items.append(self._item(entry, *known))
+                continue
+
+            known = KNOWN_MOD_FILES.get(lower)
+            if known:
+                items.append(self._item(entry, *known))
+            elif lower.endswith(".asi"):
+                items.append(self._item(entry, "plugin", f"Plugin ASI ({name})"))
+            elif lower.endswith(".rpf"):
+                # Só o cabeçalho (16 bytes) é lido: "OPEN" = salvo pelo OpenIV
+                try:
+                    if read_rpf_header(entry.path)["encryption"] == "open":
+                        modified_archives.append(name)
+                except (OSError, ValueError):
+                    pass
+
+        result = {
+            "fingerprint": fingerprint,
+            "items": items,
+            "modified_archives": modified_archives,
+        }
+        with self._lock:
+            self._fingerprint = fingerprint
+            self._cached = result
+        return {**result, "cached": False}
+
+    @staticmethod
+    def _item(entry: os.DirEntry, category: str, description: str) -> dict:
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "category": category,
+            "description": description,
+            "is_dir": entry.is_dir(follow_symlinks=False),
+        }
+
+    def has_mods(self) -> bool:
+        """Retorna True se algum mod desativável foi encontrado."""
+        return any(i["category"] in DISABLE_CATEGORIES for i in self.scan()["items"])
+
+    # ===== Modo vanilla =====
+
+    def is_vanilla_active(self) -> bool:
+        """Verifica se existe uma sessão vanilla pendente de restauração."""
+        return bool(self.game_path) and os.path.isfile(self.journal_path)
+
+    def disable_mods(self) -> Tuple[bool, str]:
+        """
+        Desativa os mods renomeando arquivos e pastas (sem copiar nada).
+        As renomeações ficam registradas em um journal na pasta do jogo.
+        """
+        if self.is_vanilla_active():
+            return True, "ℹ️ Os mods já estão desativados."
+
+        items = [i for i in self.scan(force=True)["items"] if i["category"] in DISABLE_CATEGORIES]
+        if not items:
+            return True, "ℹ️ Nenhum mod encontrado."
+
+        renamed = []
+        self._write_journal(renamed)
+        try:
+            for item in items:
+                target = self._free_name(item["path"] + DISABLED_SUFFIX)
+                os.rename(item["path"], target)
+                renamed.append({"original": item["path"], "disabled": target})
+                self._write_journal(renamed)
+        except OSError as e:
+            logger.error(f"Falha ao desativar mods: {e}")
+            self.restore_mods()
+            return False, f"❌ Erro ao desativar mods: {str(e)}"
+
+        logger.info(f"Modo vanilla: {len(renamed)} item(ns) desativado(s)")
+        return True, f"✅ {len(renamed)} mod(s) desativado(s) temporariamente."
+
+    def restore_mods(self) -> Tuple[bool, str]:
+        """Desfaz as renomeações registradas no journal."""
+        if not self.is_vanilla_active():
+            return True, "ℹ️ Nenhum mod para restaurar."
+
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                renamed = json.load(f).get("renamed", [])
+        except (json.JSONDecodeError, IOError) as e:
+            return False, f"❌ Journal do modo vanilla ilegível: {str(e)}"
+
+        errors = []
+        pending = []            # continuam no journal para uma nova tentativa
+        for item in reversed(renamed):
+            if not os.path.exists(item["disabled"]):
+                continue
+            if os.path.exists(item["original"]):
+                # O jogo (ou o usuário) recriou o arquivo: não sobrescrever
+                errors.append(f"{item['disabled']}: já existe {item['original']}")
+                pending.append(item)
+                continue
+            try:
+                os.rename(item["disabled"], item["original"])
+            except OSError as e:
+                errors.append(f"{os.path.basename(item['original'])}: {e}")
+                pending.append(item)
+
+        if errors:
+            self._write_journal(list(reversed(pending)))
+            self._cached = None
+            return False, "❌ Alguns mods não foram restaurados:\n" + "\n".join(errors)
+
+        os.remove(self.journal_path)
+        self._cached = None
+        logger.info(f"Modo vanilla: {len(renamed)} item(ns) restaurado(s)")
+        return True, f"✅ {len(renamed)} mod(s) restaurado(s)."
+
+    def _write_journal(self, renamed: List[dict]):
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"renamed": renamed}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.journal_path)
+
+    @staticmethod
+    def _free_name(path: str) -> str:
+        candidate = path
+        n = 1
+        while os.path.exists(candidate):
+            candidate = f"{path}.{n}"
+            n += 1
+        return candidate
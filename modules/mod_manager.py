@@ -0,0 +1,369 @@
+"""
+Módulo Mod Manager - Ativa e desativa conjuntos de mods do GTA V
+Usa renomeações atômicas (ou hardlinks) no mesmo volume em vez de cópias,
+com journal para completar ou desfazer operações interrompidas.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+STORAGE_DIR_NAME = "_launcher_mods"
+SETS_FILE = "sets.json"
+JOURNAL_FILE = "journal.json"
+
+MODE_RENAME = "rename"
+MODE_HARDLINK = "hardlink"
+
+
+class ModManager:
+    """
+    Gerencia conjuntos de mods ("mod sets") dentro da pasta do jogo.
+
+    Mods desativados ficam em `<jogo>/_launcher_mods/<conjunto>/`, espelhando
+    o caminho relativo original. Como o armazenamento fica no mesmo volume,
+    ativar/desativar custa O(número de arquivos), e não O(bytes).
+    """
+
+    def __init__(self, game_path: str = ""):
+        self.game_path = game_path
+        self._lock = threading.Lock()
+
+    @property
+    def storage_dir(self) -> str:
+        return os.path.join(self.game_path, STORAGE_DIR_NAME)
+
+    @property
+    def sets_path(self) -> str:
+        return os.path.join(self.storage_dir, SETS_FILE)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.storage_dir, JOURNAL_FILE)
+
+    def _set_dir(self, name: str) -> str:
+        return os.path.join(self.storage_dir, name)
+
+    # ===== Persistência =====
+
+    def _load_sets(self) -> dict:
+        if os.path.isfile(self.sets_path):
+            try:
+                with open(self.sets_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"sets.json ilegível: {e}")
+        return {}
+
+    def _write_json(self, path: str, data: dict):
+        os.makedirs(self.storage_dir, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    # ===== Conjuntos =====
+
+    def get_sets(self) -> List[dict]:
+        """Lista os conjuntos de mods cadastrados."""
+        return [
+            {"name": name, **data, "file_count": len(data.get("files", []))}
+            for name, data in sorted(self._load_sets().items())
+        ]
+
+    def create_set(self, name: str, rel_paths: List[str],
+                   mode: str = MODE_RENAME) -> Tuple[bool, str]:
+        """
+        Cadastra um conjunto a partir de arquivos já presentes (ativos) no jogo.
+
+        Args:
+            name: Nome do conjunto.
+            rel_paths: Caminhos relativos à pasta do jogo (ex.: "mods/update/update.rpf").
+            mode: "rename" (move os arquivos) ou "hardlink" (mantém uma cópia
+                  no armazenamento e cria/remove links na pasta do jogo).
+        """
+        if not name or os.sep in name or "/" in name or name.startswith("."):
+            return False, "❌ Nome de conjunto inválido."
+        # A pasta do conjunto não pode coincidir com os arquivos do armazenamento
+        reserved = {f.lower() for f in (SETS_FILE, JOURNAL_FILE)}
+        if name.lower() in reserved | {f + ".tmp" for f in reserved}:
+            return False, f"❌ O nome '{name}' é reservado."
+        if mode not in (MODE_RENAME, MODE_HARDLINK):
+            return False, f"❌ Modo desconhecido: {mode}"
+
+        with self._lock:
+            sets = self._load_sets()
+            if name in sets:
+                return False, f"❌ O conjunto '{name}' já existe."
+
+            files = sorted({os.path.normpath(p) for p in rel_paths})
+            # Só arquivos dentro da pasta do jogo
+            outside = [p for p in files if os.path.isabs(p) or os.path.splitdrive(p)[0]
+                       or p == os.pardir or p.startswith(os.pardir + os.sep)]
+            if outside:
+                return False, "❌ Caminhos fora da pasta do jogo:\n" + "\n".join(outside[:10])
+            missing = [p for p in files if not os.path.isfile(os.path.join(self.game_path, p))]
+            if missing:
+                return False, "❌ Arquivos não encontrados:\n" + "\n".join(missing[:10])
+
+            ok, msg = self._check_same_volume()
+            if not ok:
+                return False, msg
+
+            if mode == MODE_HARDLINK:
+                # O armazenamento guarda um link para cada arquivo ativo
+                created = []
+                try:
+                    for rel in files:
+                        stored = os.path.join(self._set_dir(name), rel)
+                        os.makedirs(os.path.dirname(stored), exist_ok=True)
+                        if not os.path.exists(stored):
+                            os.link(os.path.join(self.game_path, rel), stored)
+                            created.append(stored)
+                except OSError as e:
+                    for stored in created:
+                        try:
+                            os.remove(stored)
+                        except OSError:
+                            pass
+                    self._prune_parents(created)
+                    return False, f"❌ Não foi possível criar os links do conjunto: {str(e)}"
+
+            sets[name] = {
+                "files": files,
+                "mode": mode,
+                "enabled": True,
+                "created": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._write_json(self.sets_path, sets)
+
+        logger.info(f"Conjunto de mods criado: {name} ({len(files)} arquivos)")
+        return True, f"✅ Conjunto '{name}' criado com {len(files)} arquivo(s)."
+
+    def remove_set(self, name: str) -> Tuple[bool, str]:
+        """Remove o cadastro de um conjunto (precisa estar ativo)."""
+        with self._lock:
+            sets = self._load_sets()
+            data = sets.get(name)
+            if not data:
+                return False, f"❌ Conjunto '{name}' não encontrado."
+            if not data["enabled"]:
+                return False, "❌ Ative o conjunto antes de removê-lo do gerenciador."
+
+            if data["mode"] == MODE_HARDLINK:
+                stored = [os.path.join(self._set_dir(name), rel) for rel in data["files"]]
+                for path in stored:
+                    if os.path.isfile(path):
+                        os.remove(path)
+                self._prune_parents(stored)
+
+            del sets[name]
+            self._write_json(self.sets_path, sets)
+        return True, f"✅ Conjunto '{name}' removido do gerenciador."
+
+    # ===== Ativar / desativar =====
+
+    def enable_set(self, name: str) -> Tuple[bool, str]:
+        """Ativa um conjunto de mods."""
+        return self._switch(name, enable=True)
+
+    def disable_set(self, name: str) -> Tuple[bool, str]:
+        """Desativa um conjunto de mods."""
+        return self._switch(name, enable=False)
+
+    def toggle_set(self, name: str) -> Tuple[bool, str]:
+        """Inverte o estado de um conjunto de mods."""
+        data = self._load_sets().get(name)
+        if not data:
+            return False, f"❌ Conjunto '{name}' não encontrado."
+        return self._switch(name, enable=not data["enabled"])
+
+    def _plan(self, name: str, data: dict, enable: bool) -> List[dict]:
+        """Monta a lista de passos (origem -> destino) de uma troca de estado."""
+        steps = []
+        for rel in data["files"]:
+            live = os.path.join(self.game_path, rel)
+            stored = os.path.join(self._set_dir(name), rel)
+            if data["mode"] == MODE_HARDLINK:
+                if enable:
+                    steps.append({"action": "link", "src": stored, "dst": live})
+                else:
+                    steps.append({"action": "unlink", "src": stored, "dst": live})
+            elif enable:
+                steps.append({"action": "rename", "src": stored, "dst": live})
+            else:
+                steps.append({"action": "rename", "src": live, "dst": stored})
+        return steps
+
+    def _switch(self, name: str, enable: bool) -> Tuple[bool, str]:
+        label = "ativado" if enable else "desativado"
+        with self._lock:
+            if os.path.isfile(self.journal_path):
+                return False, "❌ Há uma operação interrompida. Use 'recuperar' antes de continuar."
+
+            sets = self._load_sets()
+            data = sets.get(name)
+            if not data:
+                return False, f"❌ Conjunto '{name}' não encontrado."
+            if data["enabled"] == enable:
+                return True, f"ℹ️ Conjunto '{name}' já está {label}."
+
+            steps = self._plan(name, data, enable)
+            conflicts = [s["dst"] for s in steps
+                         if s["action"] != "unlink" and os.path.exists(s["dst"])]
+            if conflicts:
+                return False, "❌ Arquivos já existem no destino:\n" + "\n".join(conflicts[:10])
+
+            # Journal gravado ANTES de qualquer alteração
+            self._write_json(self.journal_path, {
+                "set": name,
+                "enable": enable,
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "steps": steps,
+            })
+
+            try:
+                for step in steps:
+                    self._do_step(step)
+            except OSError as e:
+                logger.error(f"Falha ao trocar conjunto {name}: {e}")
+                failed = self._rollback(steps)
+                if failed:
+                    # O journal fica: é o registro necessário para recover()
+                    return False, (f"❌ Erro ao alterar o conjunto: {str(e)}\n"
+                                   f"⚠️ {len(failed)} arquivo(s) não puderam ser desfeitos. "
+                                   "Use 'recuperar' para concluir ou desfazer a operação.")
+                os.remove(self.journal_path)
+                return False, f"❌ Erro ao alterar o conjunto (desfeito): {str(e)}"
+
+            data["enabled"] = enable
+            self._write_json(self.sets_path, sets)
+            os.remove(self.journal_path)
+            self._prune_parents([s["src"] for s in steps if s["action"] == "rename"])
+            self._prune_parents([s["dst"] for s in steps if s["action"] == "unlink"])
+
+        logger.info(f"Conjunto de mods {label}: {name} ({len(steps)} arquivos)")
+        return True, f"✅ Conjunto '{name}' {label} ({len(steps)} arquivo(s))."
+
+    @staticmethod
+    def _do_step(step: dict):
+        src, dst = step["src"], step["dst"]
+        action = step["action"]
+        if action == "rename":
+            if os.path.exists(dst) and not os.path.exists(src):
+                return  # passo já concluído
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+        elif action == "link":
+            if os.path.exists(dst):
+                return
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.link(src, dst)
+        elif action == "unlink":
+            if not os.path.exists(dst):
+                return
+            if os.path.exists(src) and not os.path.samefile(src, dst):
+                # O arquivo ativo foi substituído: ele passa a ser a cópia guardada
+                os.replace(dst, src)
+            else:
+                os.remove(dst)
+
+    @staticmethod
+    def _undo_step(step: dict):
+        src, dst = step["src"], step["dst"]
+        action = step["action"]
+        if action == "rename":
+            if os.path.exists(dst) and not os.path.exists(src):
+                os.makedirs(os.path.dirname(src), exist_ok=True)
+                os.replace(dst, src)
+        elif action == "link":
+            if os.path.exists(dst) and os.path.exists(src) and os.path.samefile(src, dst):
+                os.remove(dst)
+        elif action == "unlink":
+            if not os.path.exists(dst) and os.path.exists(src):
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                os.link(src, dst)
+
+    def _rollback(self, steps: List[dict]) -> List[dict]:
+        """Desfaz os passos em ordem inversa; retorna os que falharam."""
+        failed = []
+        for step in reversed(steps):
+            try:
+                self._undo_step(step)
+            except OSError as e:
+                logger.error(f"Falha ao desfazer {step['dst']}: {e}")
+                failed.append(step)
+        return failed
+
+    # ===== Recuperação =====
+
+    def has_pending_operation(self) -> bool:
+        """Verifica se existe uma troca de estado interrompida."""
+        return bool(self.game_path) and os.path.isfile(self.journal_path)
+
+    def recover(self, complete: bool = True) -> Tuple[bool, str]:
+        """
+        Completa (ou desfaz) uma troca de estado interrompida.
+
+        Cada passo é idempotente: o estado real de cada arquivo é verificado
+        no disco, então a recuperação pode ser repetida com segurança.
+        """
+        with self._lock:
+            if not os.path.isfile(self.journal_path):
+                return True, "ℹ️ Nenhuma operação pendente."
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    journal = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                return False, f"❌ Journal ilegível: {str(e)}"
+
+            steps = journal["steps"]
+            try:
+                if complete:
+                    for step in steps:
+                        self._do_step(step)
+                else:
+                    failed = self._rollback(steps)
+                    if failed:
+                        return False, (f"❌ {len(failed)} arquivo(s) não puderam ser desfeitos:\n"
+                                       + "\n".join(s["dst"] for s in failed[:10]))
+            except OSError as e:
+                return False, f"❌ Erro na recuperação: {str(e)}"
+
+            sets = self._load_sets()
+            name = journal["set"]
+            if name in sets:
+                sets[name]["enabled"] = journal["enable"] if complete else not journal["enable"]
+                self._write_json(self.sets_path, sets)
+            os.remove(self.journal_path)
+
+        action = "concluída" if complete else "desfeita"
+        return True, f"✅ Operação no conjunto '{name}' {action}."
+
+    # ===== Utilitários =====
+
+    def _check_same_volume(self) -> Tuple[bool, str]:
+        os.makedirs(self.storage_dir, exist_ok=True)
+        if os.stat(self.storage_dir).st_dev != os.stat(self.game_path).st_dev:
+            return False, "❌ O armazenamento de mods precisa estar no mesmo volume do jogo."
+        return True, ""
+
+    def _prune_parents(self, paths: List[str]):
+        """Remove as pastas que ficaram vazias após mover os arquivos."""
+        stop = {os.path.normpath(self.game_path), os.path.normpath(self.storage_dir)}
+        for parent in sorted({os.path.dirname(p) for p in paths}, key=len, reverse=True):
+            parent = os.path.normpath(parent)
+            while parent not in stop and parent.startswith(os.path.normpath(self.game_path)):
+                try:
+                    os.rmdir(parent)
+                except OSError:
+                    break
+                parent = os.path.dirname(parent)
@@ -4,191 +4,37 @@ Gerencia commandline.txt e aplica otimizações baseadas no hardware.
 """
 
 import os
+import json
 import platform
 import subprocess
 import logging
 import ctypes
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+from modules.storage_bench import StorageBenchmark, get_storage_recommendation
+from modules.settings_xml import SettingsXml
+from modules.commandline import CommandLineDocument, Transaction
+from modules.cmdline_history import CommandLineHistory
+from modules.vram_estimator import solve as solve_vram_budget, DEFAULT_RESOLUTION
+from modules.arg_catalog import get_catalog, get_game_build
 
 logger = logging.getLogger("GTAVLauncher")
 
 
-# ===== Presets de Otimização =====
-
-OPTIMIZATION_PRESETS = {
-    "performance": {
-        "name": "🚀 Máxima Performance",
-        "description": "Prioriza FPS acima de tudo. Ideal para PCs mais fracos.",
-        "args": [
-            "-high",
-            "-noPauseOnFocusLoss",
-            "-noInGameUi",
-        ],
-        "commandline_extra": [
-            "-disableHyperthreading",
-        ],
-    },
-    "balanced": {
-        "name": "⚖️ Balanceado",
-        "description": "Equilíbrio entre qualidade visual e desempenho.",
-        "args": [
-            "-noPauseOnFocusLoss",
-        ],
-        "commandline_extra": [],
-    },
-    "quality": {
-        "name": "✨ Máxima Qualidade",
-        "description": "Prioriza gráficos. Para PCs de alto desempenho.",
-        "args": [
-            "-noPauseOnFocusLoss",
-            "-DX11",
-        ],
-        "commandline_extra": [],
-    },
-    "online_optimized": {
-        "name": "🌐 Otimizado para Online",
-        "description": "Melhor estabilidade para GTA Online.",
-        "args": [
-            "-noPauseOnFocusLoss",
-            "-StraightIntoFreemode",
-        ],
-        "commandline_extra": [],
-    },
-    "streaming": {
-        "name": "📺 Streaming / Gravação",
-        "description": "Otimizado para quem faz live ou grava gameplay.",
-        "args": [
-            "-noPauseOnFocusLoss",
-            "-windowed",
-            "-borderless",
-        ],
-        "commandline_extra": [],
-    },
-}
-
-
-# ===== Catálogo de Argumentos =====
-
-ALL_ARGUMENTS = [
-    # === Modo de Jogo ===
-    {
-        "arg": "-scOfflineOnly",
-        "category": "Modo de Jogo",
-        "name": "Modo Offline",
-        "description": "Força o modo offline, sem Social Club",
-        "icon": "🔒",
-        "impact": "neutro",
-    },
-    {
-        "arg": "-goStraightToSP",
-        "category": "Modo de Jogo",
-        "name": "Direto para Story Mode",
-        "description": "Pula menus e vai direto para Single Player",
-        "icon": "🎮",
-        "impact": "positivo",
-    },
-    {
-        "arg": "-StraightIntoFreemode",
-        "category": "Modo de Jogo",
-        "name": "Direto para GTA Online",
-        "description": "Pula menus e vai direto para Freemode",
-        "icon": "🌐",
-        "impact": "positivo",
-    },
-    # === Performance ===
-    {
-        "arg": "-high",
-        "category": "Performance",
-        "name": "Prioridade Alta",
-        "description": "Executa o jogo com prioridade alta do CPU",
-        "icon": "⚡",
-        "impact": "positivo",
-    },
-    {
-        "arg": "-noPauseOnFocusLoss",
-        "category": "Performance",
-        "name": "Não Pausar ao Perder Foco",
-        "description": "O jogo continua rodando em segundo plano",
-        "icon": "▶️",
-        "impact": "positivo",
-    },
-    {
-        "arg": "-disableHyperthreading",
-        "category": "Performance",
-        "name": "Desativar Hyperthreading",
-        "description": "Pode melhorar FPS em CPUs com hyperthreading",
-        "icon": "🔧",
-        "impact": "variável",
-    },
-    # === Gráficos ===
-    {
-        "arg": "-DX11",
-        "category": "Gráficos",
-        "name": "Forçar DirectX 11",
-        "description": "Usa DirectX 11 (melhor compatibilidade)",
-        "icon": "🎨",
-        "impact": "neutro",
-    },
-    {
-        "arg": "-DX10",
-        "category": "Gráficos",
-        "name": "Forçar DirectX 10",
-        "description": "Usa DirectX 10 (para GPUs antigas)",
-        "icon": "🎨",
-        "impact": "negativo",
-    },
-    # === Tela ===
-    {
-        "arg": "-fullscreen",
-        "category": "Tela",
-        "name": "Tela Cheia",
-        "description": "Executa em tela cheia exclusiva",
-        "icon": "🖥️",
-        "impact": "positivo",
-    },
-    {
-        "arg": "-windowed",
-        "category": "Tela",
-        "name": "Modo Janela",
-        "description": "Executa em modo janela",
-        "icon": "🪟",
-        "impact": "negativo",
-    },
-    {
-        "arg": "-borderless",
-        "category": "Tela",
-        "name": "Sem Bordas",
-        "description": "Remove bordas (usar com -windowed)",
-        "icon": "🪟",
-        "impact": "neutro",
-    },
-    # === Diagnóstico ===
-    {
-        "arg": "-safemode",
-        "category": "Diagnóstico",
-        "name": "Modo Seguro",
-        "description": "Inicia com configurações mínimas",
-        "icon": "🛡️",
-        "impact": "negativo",
-    },
-    {
-        "arg": "-benchmark",
-        "category": "Diagnóstico",
-        "name": "Benchmark",
-        "description": "Executa o benchmark integrado",
-        "icon": "📊",
-        "impact": "neutro",
-    },
-    {
-        "arg": "-benchmarkGpuMemoryTest",
-        "category": "Diagnóstico",
-        "name": "Teste de VRAM",
-        "description": "Testa a memória da GPU",
-        "icon": "📊",
-        "impact": "neutro",
-    },
-]
+# ===== Catálogo de Argumentos e Presets =====
+
+# Carregados de modules/data/arguments.json (ver arg_catalog)
+CATALOG = get_catalog()
+OPTIMIZATION_PRESETS = CATALOG.presets
+ALL_ARGUMENTS = CATALOG.arguments
+
+# Nota mínima (0 a 1) das opções gráficas que cabem na VRAM para o preset "quality"
+QUALITY_PRESET_MIN_SCORE = 0.85
+
+# Presets gerados para esta máquina (ex.: pelo ajuste automático)
+CUSTOM_PRESETS_FILE = CONFIG_DIR / "custom_presets.json"
 
 
 class SystemAnalyzer:
@@ -196,6 +42,16 @@ class SystemAnalyzer:
 
     def __init__(self):
         self._info = None
+        self.storage_info: Optional[dict] = None
+
+    def run_storage_benchmark(self, game_path: str) -> dict:
+        """Mede o disco do jogo (limitado a ~5 s) e guarda o resultado."""
+        self.storage_info = StorageBenchmark(game_path).run()
+        return self.storage_info
+
+    def get_storage_recommendation(self) -> Optional[str]:
+        """Recomendação de mover o jogo para um disco mais rápido, se for o caso."""
+        return get_storage_recommendation(self.storage_info)
 
     def get_system_info(self) -> dict:
         """Coleta informações do sistema."""
@@ -272,18 +128,32 @@ class SystemAnalyzer:
         self._info = info
         return info
 
-    def get_recommended_preset(self) -> str:
+    def get_graphics_budget(self, resolution=None) -> Optional[dict]:
+        """
+        Melhor combinação de opções do settings.xml que cabe na VRAM
+        (ver vram_estimator.solve), ou None se a VRAM for desconhecida.
+        """
+        vram = self.get_system_info()["vram_mb"]
+        if not vram:
+            return None
+        return solve_vram_budget(vram, resolution or DEFAULT_RESOLUTION)
+
+    def get_recommended_preset(self, resolution=None) -> str:
         """Recomenda um preset baseado no hardware."""
         info = self.get_system_info()
         ram = info["ram_gb"]
         cores = info["cpu_count"]
-        vram = info["vram_mb"]
+        budget = self.get_graphics_budget(resolution)
+        vram_ok = bool(budget) and budget["quality"] >= QUALITY_PRESET_MIN_SCORE
+
+        # HD mecânico: o streaming de texturas em alta qualidade causa stutter
+        slow_disk = bool(self.storage_info) and self.storage_info.get("drive_class") == "hdd"
 
         # PC fraco
         if ram < 8 or cores <= 4:
             return "performance"
         # PC gamer
-        elif ram >= 16 and cores >= 8 and vram >= 4000:
+        elif ram >= 16 and cores >= 8 and vram_ok and not slow_disk:
             return "quality"
         # PC médio
         else:
@@ -319,45 +189,108 @@ class OptimizationManager:
     def __init__(self, game_path: str = ""):
         self.game_path = game_path
         self.analyzer = SystemAnalyzer()
+        self.settings = SettingsXml()
+        self._cmdline: Optional[CommandLineDocument] = None
+        self.history = CommandLineHistory()
+        # Aplica as opções de settings.xml de um preset, quando houver
+        self.apply_settings: Optional[Callable[[dict], Tuple[bool, str]]] = self.settings.apply
 
     @property
     def commandline_path(self) -> str:
         return os.path.join(self.game_path, "commandline.txt")
 
+    @property
+    def commandline(self) -> CommandLineDocument:
+        """Documento do commandline.txt mantido em memória."""
+        if self._cmdline is None or self._cmdline.path != self.commandline_path:
+            self._cmdline = CommandLineDocument(self.commandline_path)
+        return self._cmdline
+
     def read_commandline(self) -> str:
         """Lê o commandline.txt atual."""
-        if os.path.isfile(self.commandline_path):
-            with open(self.commandline_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
-        return ""
+        return self.commandline.text().strip()
 
-    def write_commandline(self, content: str) -> Tuple[bool, str]:
-        """Escreve no commandline.txt."""
+    def edit_commandline(self, edit: Callable[[Transaction], object],
+                         origin: str = "manual") -> Tuple[bool, str]:
+        """
+        Aplica várias edições em uma única gravação atômica.
+
+        Exemplo: optimizer.edit_commandline(lambda tx: tx.add("-high").remove("-DX10"))
+
+        Args:
+            origin: Origem registrada no histórico ("preset:<chave>",
+                    "recommended", "manual"...).
+        """
+        tx = Transaction()
+        edit(tx)
         try:
-            with open(self.commandline_path, "w", encoding="utf-8") as f:
-                f.write(content.strip() + "\n")
-            return True, "✅ commandline.txt salvo com sucesso!"
+            # Conteúdo anterior (inclusive edições externas) entra no histórico
+            self._record_history(self.commandline.text(), "external")
+            changed = self.commandline.commit(tx)
         except PermissionError:
             return False, "❌ Sem permissão para escrever. Verifique as permissões da pasta."
         except Exception as e:
             return False, f"❌ Erro: {str(e)}"
+        if not changed:
+            return True, "ℹ️ commandline.txt já está assim."
+        self._record_history(self.commandline.text(), origin)
+        return True, "✅ commandline.txt salvo com sucesso!"
+
+    def _record_history(self, content: str, origin: str):
+        try:
+            self.history.record(self.commandline_path, content, origin)
+        except OSError as e:
+            logger.warning(f"Falha ao registrar histórico do commandline.txt: {e}")
+
+    def write_commandline(self, content: str, origin: str = "manual") -> Tuple[bool, str]:
+        """Escreve no commandline.txt."""
+        return self.edit_commandline(lambda tx: tx.replace(content), origin)
+
+    def get_history(self, limit: Optional[int] = None) -> List[dict]:
+        """Versões anteriores do commandline.txt, da mais recente para a mais antiga."""
+        return self.history.get_versions(self.commandline_path, limit)
+
+    def diff_version(self, version_id: str) -> str:
+        """Diferença entre uma versão do histórico e o commandline.txt atual."""
+        return self.history.diff(version_id, self.commandline.text())
+
+    def rollback(self, version_id: str) -> Tuple[bool, str]:
+        """Restaura uma versão do histórico."""
+        version = self.history.get_version(version_id)
+        if not version or version["path"] != os.path.normcase(os.path.normpath(self.commandline_path)):
+            return False, f"❌ Versão {version_id} não encontrada."
+        content = self.history.get_content(version_id)
+        if content is None:
+            return False, f"❌ O conteúdo da versão {version_id} não está mais disponível."
+        ok, msg = self.write_commandline(content, origin=f"rollback:{version_id}")
+        if ok:
+            msg = f"✅ commandline.txt restaurado para a versão de {version['date'].replace('T', ' ')}."
+        return ok, msg
 
     def get_current_args(self) -> List[str]:
-        """Retorna a lista de argumentos atuais."""
-        content = self.read_commandline()
-        if not content:
-            return []
-        return [arg.strip() for arg in content.split() if arg.strip().startswith("-")]
+        """Retorna a lista de argumentos (flags) atuais."""
+        return self.commandline.flags
+
+    def set_arguments(self, changes: Dict[str, bool]) -> Tuple[bool, str]:
+        """Liga/desliga vários argumentos de uma vez ({"-high": True, ...})."""
+        def edit(tx):
+            for arg, enabled in changes.items():
+                # Argumentos com valor entram com o padrão do catálogo
+                tx.set(arg, enabled, *CATALOG.default_values(arg))
+        return self.edit_commandline(edit)
 
     def apply_preset(self, preset_key: str) -> Tuple[bool, str]:
         """Aplica um preset de otimização."""
-        preset = OPTIMIZATION_PRESETS.get(preset_key)
+        preset = self.get_presets().get(preset_key)
         if not preset:
             return False, f"❌ Preset '{preset_key}' não encontrado."
 
         all_args = preset["args"] + preset.get("commandline_extra", [])
         content = "\n".join(all_args)
-        return self.write_commandline(content)
+        ok, msg = self.write_commandline(content, origin=f"preset:{preset_key}")
+        if ok and preset.get("settings") and self.apply_settings:
+            ok, msg = self.apply_settings(preset["settings"])
+        return ok, msg
 
     def apply_recommended(self) -> Tuple[bool, str]:
         """Aplica otimizações recomendadas pelo sistema."""
@@ -366,44 +299,86 @@ class OptimizationManager:
             return True, "ℹ️ Nenhuma otimização adicional necessária."
 
         content = "\n".join(args)
-        return self.write_commandline(content)
+        return self.write_commandline(content, origin="recommended")
 
     def add_argument(self, arg: str) -> Tuple[bool, str]:
         """Adiciona um argumento ao commandline.txt."""
-        current = self.get_current_args()
-        if arg in current:
+        if self.commandline.has(arg):
             return True, f"ℹ️ '{arg}' já está no commandline.txt"
-
-        current.append(arg)
-        content = "\n".join(current)
-        return self.write_commandline(content)
+        return self.edit_commandline(lambda tx: tx.add(arg, *CATALOG.default_values(arg)))
 
     def remove_argument(self, arg: str) -> Tuple[bool, str]:
         """Remove um argumento do commandline.txt."""
-        current = self.get_current_args()
-        if arg not in current:
+        if not self.commandline.has(arg):
             return True, f"ℹ️ '{arg}' não está no commandline.txt"
-
-        current.remove(arg)
-        content = "\n".join(current)
-        return self.write_commandline(content)
+        return self.edit_commandline(lambda tx: tx.remove(arg))
 
     def clear_commandline(self) -> Tuple[bool, str]:
         """Limpa o commandline.txt."""
-        return self.write_commandline("")
+        return self.write_commandline("", origin="clear")
 
     def get_system_info(self) -> dict:
         """Retorna info do sistema."""
         return self.analyzer.get_system_info()
 
+    def get_resolution(self) -> Optional[Tuple[int, int]]:
+        """Resolução configurada no settings.xml, se existir."""
+        w, h = self.settings.get("ScreenWidth"), self.settings.get("ScreenHeight")
+        return (w, h) if w and h else None
+
     def get_recommended_preset(self) -> str:
         """Retorna o preset recomendado."""
-        return self.analyzer.get_recommended_preset()
+        return self.analyzer.get_recommended_preset(self.get_resolution())
+
+    def get_recommended_graphics(self) -> Optional[dict]:
+        """Opções gráficas recomendadas para a VRAM e resolução atuais."""
+        return self.analyzer.get_graphics_budget(self.get_resolution())
+
+    def get_game_build(self) -> Optional[int]:
+        """Build do GTA5.exe instalado (None se não for possível ler)."""
+        return get_game_build(self.game_path) if self.game_path else None
 
     def get_all_arguments(self) -> List[dict]:
-        """Retorna catálogo completo de argumentos."""
-        return ALL_ARGUMENTS
+        """Retorna os argumentos do catálogo disponíveis na build instalada."""
+        return CATALOG.applicable(self.get_game_build())
+
+    def get_arguments_by_category(self) -> Dict[str, List[dict]]:
+        """Argumentos disponíveis na build instalada, agrupados por categoria."""
+        return CATALOG.by_category(self.get_game_build())
+
+    def validate_preset(self, preset: dict) -> List[str]:
+        """Problemas do preset em relação ao catálogo e à build instalada."""
+        return CATALOG.validate_preset(preset, self.get_game_build())
 
     def get_presets(self) -> dict:
-        """Retorna todos os presets."""
-        return OPTIMIZATION_PRESETS
+        """Retorna todos os presets (fixos + personalizados desta máquina)."""
+        return {**OPTIMIZATION_PRESETS, **self.get_custom_presets()}
+
+    def get_custom_presets(self) -> dict:
+        """Retorna os presets personalizados salvos."""
+        if CUSTOM_PRESETS_FILE.exists():
+            try:
+                with open(CUSTOM_PRESETS_FILE, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"custom_presets.json ilegível: {e}")
+        return {}
+
+    def save_custom_preset(self, key: str, preset: dict) -> Tuple[bool, str]:
+        """Salva (ou substitui) um preset personalizado."""
+        if key in OPTIMIZATION_PRESETS:
+            return False, f"❌ '{key}' é um preset fixo e não pode ser substituído."
+        errors = self.validate_preset(preset)
+        if errors:
+            return False, f"❌ Preset inválido: {'; '.join(errors)}"
+        presets = self.get_custom_presets()
+        presets[key] = preset
+        try:
+            ensure_config_dir()
+            tmp = CUSTOM_PRESETS_FILE.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(presets, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, CUSTOM_PRESETS_FILE)
+        except OSError as e:
+            return False, f"❌ Erro ao salvar o preset: {str(e)}"
+        return True, f"✅ Preset '{preset.get('name', key)}' salvo."
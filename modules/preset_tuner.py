@@ -0,0 +1,352 @@
+"""
+Módulo Preset Tuner - Ajuste automático de preset pelo benchmark do GTA V
+Procura a melhor combinação de argumentos do commandline.txt e opções
+gráficas do settings.xml rodando o benchmark integrado, com successive
+halving e cache de resultados por hardware, versão do jogo e configuração.
+"""
+
+import os
+import json
+import math
+import random
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.config import CONFIG_DIR, ensure_config_dir
+from modules.optimizer import ALL_ARGUMENTS, OPTIMIZATION_PRESETS, CATALOG
+from modules.benchmark_runner import BenchmarkRunner
+from modules.frametime_analytics import analyze_series
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+CACHE_FILE = CONFIG_DIR / "tuner_cache.json"
+TUNED_PRESET_KEY = "tuned"
+
+BENCHMARK_PASSES = [0, 1, 2, 3, 4]   # cenas do benchmark (-benchmarkPass N)
+HALVING_RATE = 2                     # fração mantida a cada rodada: 1/2
+DEFAULT_CANDIDATES = 8
+DEFAULT_TARGET_FPS = 60
+
+# Argumentos do catálogo que entram na busca
+TUNABLE_CATEGORIES = ("Performance", "Gráficos", "Tela")
+BASE_ARGS = ["-noPauseOnFocusLoss"]          # sempre presente: o benchmark não pausa
+EXCLUDED_ARGS = ["-UseAutoSettings"]        # sobrescreveria as opções do settings.xml em teste
+
+# Opções do settings.xml, da menor para a maior qualidade
+SETTINGS_SPACE = {
+    "TextureQuality": [0, 1, 2],
+    "ShaderQuality": [0, 1, 2],
+    "ShadowQuality": [1, 2, 3],
+    "ReflectionQuality": [0, 1, 2, 3],
+    "GrassQuality": [0, 1, 2, 3],
+    "PostFX": [0, 1, 2, 3],
+    "MSAA": [0, 2, 4],
+    "CityDensity": [0.5, 0.75, 1.0],
+}
+
+
+def hardware_fingerprint(system_info: dict) -> str:
+    """Identifica a máquina pelos componentes que afetam o desempenho."""
+    keys = ("processor", "cpu_count", "ram_gb", "gpu_name", "vram_mb")
+    data = json.dumps({k: system_info.get(k) for k in keys}, sort_keys=True)
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+def build_fingerprint(game_path: str) -> str:
+    """Identifica a versão do jogo pelo tamanho e data do GTA5.exe."""
+    try:
+        st = os.stat(os.path.join(game_path, "GTA5.exe"))
+    except OSError:
+        return "unknown"
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def _candidate_key(candidate: dict) -> str:
+    return json.dumps({"args": sorted(candidate["args"]), "settings": candidate["settings"]},
+                      sort_keys=True)
+
+
+class PresetTuner:
+    """
+    Busca a melhor configuração para esta máquina.
+
+    Objetivo: a maior qualidade visual cujo 1% low atinja o FPS alvo (com o
+    FPS médio como desempate). Cada candidato começa medido em uma cena do
+    benchmark; a cada rodada metade é descartada e os restantes são medidos
+    em mais cenas. Cada par (configuração, cena) roda no máximo uma vez: os
+    resultados ficam em cache, inclusive entre sessões.
+    """
+
+    def __init__(self, game_manager, optimizer, runner: Optional[BenchmarkRunner] = None,
+                 read_settings: Optional[Callable[[], dict]] = None,
+                 apply_settings: Optional[Callable[[dict], Tuple[bool, str]]] = None,
+                 target_fps: float = DEFAULT_TARGET_FPS, cache_path=CACHE_FILE):
+        self.game_manager = game_manager
+        self.optimizer = optimizer
+        self.runner = runner or BenchmarkRunner(game_manager, optimizer)
+        settings = getattr(optimizer, "settings", None)
+        if settings is not None and settings.exists():
+            read_settings = read_settings or settings.get_graphics
+            apply_settings = apply_settings or settings.apply
+        self.read_settings = read_settings
+        self.apply_settings = apply_settings
+        self.target_fps = target_fps
+        self.cache_path = cache_path
+        self._cancel = threading.Event()
+        self._cache: Optional[dict] = None
+
+    def cancel(self):
+        """Interrompe o ajuste após o benchmark em andamento."""
+        self._cancel.set()
+
+    # ===== Espaço de busca =====
+
+    def _arg_dimensions(self) -> List[List[Optional[str]]]:
+        # Argumentos com valor (resolução, GPU...) não entram na busca
+        tunable = [a["arg"] for a in ALL_ARGUMENTS
+                   if a["category"] in TUNABLE_CATEGORIES and "value" not in a
+                   and a["arg"] not in BASE_ARGS + EXCLUDED_ARGS]
+        dims = []
+        grouped = set()
+        for group in CATALOG.conflict_groups.values():
+            options = [a for a in group if a in tunable and a not in grouped]
+            if options:
+                dims.append([None] + options)
+                grouped.update(options)
+        dims.extend([None, a] for a in tunable if a not in grouped)
+        return dims
+
+    def _settings_space(self) -> Dict[str, list]:
+        # Sem acesso ao settings.xml, a busca fica só nos argumentos
+        return SETTINGS_SPACE if self.apply_settings else {}
+
+    @staticmethod
+    def _normalize(args: List[str]) -> List[str]:
+        args = [a for a in args if a not in BASE_ARGS]
+        args = [a for a in args
+                if all(r in args for r in (CATALOG.get(a) or {}).get("requires", []))]
+        return BASE_ARGS + sorted(set(args))
+
+    def sample_candidates(self, n: int, seed: int = 0) -> List[dict]:
+        """
+        Gera `n` candidatos distintos: os presets fixos (com as opções
+        gráficas atuais) primeiro, depois combinações aleatórias.
+        """
+        rng = random.Random(seed)
+        space = self._settings_space()
+        current = self.read_settings() if self.read_settings else {}
+        base_settings = {k: current.get(k, values[len(values) // 2]) for k, values in space.items()}
+
+        candidates, seen = [], set()
+
+        def add(args, settings):
+            cand = {"args": self._normalize(args), "settings": settings}
+            key = _candidate_key(cand)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(cand)
+
+        for key in ("performance", "balanced", "quality"):
+            preset = OPTIMIZATION_PRESETS[key]
+            add(preset["args"] + preset.get("commandline_extra", []), dict(base_settings))
+
+        dims = self._arg_dimensions()
+        attempts = 0
+        while len(candidates) < n and attempts < n * 50:
+            attempts += 1
+            args = [a for a in (rng.choice(d) for d in dims) if a]
+            settings = {k: rng.choice(values) for k, values in space.items()}
+            add(args, settings)
+        return candidates[:n]
+
+    def quality_score(self, candidate: dict) -> float:
+        """Qualidade visual relativa (0 a 1) das opções gráficas do candidato."""
+        space = self._settings_space()
+        if not space:
+            return 0.0
+        levels = []
+        for k, values in space.items():
+            v = candidate["settings"].get(k)
+            levels.append(values.index(v) / (len(values) - 1) if v in values else 0.5)
+        return sum(levels) / len(levels)
+
+    # ===== Cache =====
+
+    def _load_cache(self) -> dict:
+        if self._cache is None:
+            self._cache = {}
+            if os.path.isfile(self.cache_path):
+                try:
+                    with open(self.cache_path, "r", encoding="utf-8") as f:
+                        self._cache = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"Cache do ajuste ilegível, recriando: {e}")
+        return self._cache
+
+    def _save_cache(self):
+        if self.cache_path == CACHE_FILE:
+            ensure_config_dir()
+        tmp = str(self.cache_path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_path)
+
+    def _cache_key(self, candidate: dict, context: dict) -> str:
+        data = f"{context['hardware']}|{context['build']}|{_candidate_key(candidate)}"
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def _context(self) -> dict:
+        return {
+            "hardware": hardware_fingerprint(self.optimizer.get_system_info()),
+            "build": build_fingerprint(self.game_manager.game_path),
+        }
+
+    # ===== Medição =====
+
+    @staticmethod
+    def _pass_metrics(records: List[dict]) -> Optional[dict]:
+        times = [t for r in records for p in r["passes"] for t in p.get("frame_times") or []]
+        if times:
+            arr = np.asarray(times, dtype=np.float64)
+            stats = analyze_series(arr * 1000 if arr.max() < 1.0 else arr)
+            return {k: stats[k] for k in ("avg_fps", "low_1_fps", "stutter_count")}
+        # Sem -benchmarkFrameTimes: usa o resumo do próprio arquivo
+        passes = [p for r in records for p in r["passes"] if "fps" in p]
+        if not passes:
+            return None
+        p99 = [p["percentiles"]["99"] for p in passes if "99" in p.get("percentiles", {})]
+        return {
+            "avg_fps": round(sum(p["fps"]["avg"] for p in passes) / len(passes), 1),
+            "low_1_fps": round(1000 / max(p99), 1) if p99 else min(p["fps"]["min"] for p in passes),
+            "stutter_count": 0,
+        }
+
+    def _measure(self, candidate: dict, bench_pass: int, config: dict,
+                 context: dict) -> Tuple[bool, str]:
+        entry = self._load_cache().setdefault(self._cache_key(candidate, context), {
+            "candidate": candidate, **context, "passes": {},
+        })
+        if str(bench_pass) in entry["passes"]:
+            return True, ""
+
+        ok, msg = self.optimizer.write_commandline("\n".join(candidate["args"]), origin="tuner")
+        if ok and candidate["settings"] and self.apply_settings:
+            ok, msg = self.apply_settings(candidate["settings"])
+        if not ok:
+            return False, msg
+
+        ok, msg, records = self.runner.run(config, preset_key=TUNED_PRESET_KEY,
+                                           extra_args=["-benchmarkPass", str(bench_pass)])
+        if not ok:
+            return False, msg
+        metrics = self._pass_metrics(records)
+        if not metrics:
+            return False, "⚠️ O benchmark não gerou dados de FPS."
+        entry["passes"][str(bench_pass)] = metrics
+        self._save_cache()
+        return True, ""
+
+    def _score(self, candidate: dict, context: dict, passes: List[int]) -> Optional[dict]:
+        entry = self._load_cache().get(self._cache_key(candidate, context))
+        if not entry:
+            return None
+        measured = [entry["passes"][str(p)] for p in passes if str(p) in entry["passes"]]
+        if not measured:
+            return None
+        avg = sum(m["avg_fps"] for m in measured) / len(measured)
+        low = min(m["low_1_fps"] for m in measured)
+        if low >= self.target_fps:
+            score = 1.0 + self.quality_score(candidate) + avg / 10000
+        else:
+            score = low / self.target_fps      # abaixo do alvo: vence quem chega mais perto
+        return {"score": score, "avg_fps": round(avg, 1), "low_1_fps": round(low, 1)}
+
+    # ===== Busca =====
+
+    @staticmethod
+    def estimate_runs(candidates: int, passes: int = len(BENCHMARK_PASSES)) -> int:
+        """Número máximo de execuções do benchmark (sem contar o cache)."""
+        runs, alive, budget, done = 0, candidates, 1, 0
+        while True:
+            runs += alive * (budget - done)
+            if alive == 1 or budget == passes:
+                return runs
+            alive = math.ceil(alive / HALVING_RATE)
+            done, budget = budget, min(budget * HALVING_RATE, passes)
+
+    def run(self, config: dict, candidates: int = DEFAULT_CANDIDATES,
+            progress: Optional[Callable[[str], None]] = None) -> Tuple[bool, str, Optional[dict]]:
+        """
+        Executa a busca e salva o melhor resultado como preset "tuned".
+
+        O commandline.txt e as opções gráficas originais são restaurados ao
+        final; o preset gerado é aplicado pelo usuário como qualquer outro.
+        """
+        if not self.game_manager:
+            return False, "❌ Caminho do GTA V não configurado.", None
+        self._cancel.clear()
+        context = self._context()
+        alive = self.sample_candidates(candidates)
+        original_cmdline = self.optimizer.read_commandline()
+        original_settings = self.read_settings() if self.read_settings else None
+        if original_settings:
+            original_settings = {k: original_settings[k] for k in self._settings_space()
+                                 if k in original_settings}
+
+        budget = 1
+        scores: Dict[str, dict] = {}
+        try:
+            while True:
+                passes = BENCHMARK_PASSES[:budget]
+                for i, cand in enumerate(alive):
+                    for p in passes:
+                        if self._cancel.is_set():
+                            return False, "⏸️ Ajuste interrompido (resultados mantidos em cache).", None
+                        if progress:
+                            progress(f"Rodada {budget}: candidato {i + 1}/{len(alive)}, cena {p}")
+                        ok, msg = self._measure(cand, p, config, context)
+                        if not ok:
+                            return False, msg, None
+                scores = {_candidate_key(c): self._score(c, context, passes) for c in alive}
+                alive.sort(key=lambda c: scores[_candidate_key(c)]["score"], reverse=True)
+                if len(alive) == 1 or budget == len(BENCHMARK_PASSES):
+                    break
+                alive = alive[:math.ceil(len(alive) / HALVING_RATE)]
+                budget = min(budget * HALVING_RATE, len(BENCHMARK_PASSES))
+        finally:
+            self.optimizer.write_commandline(original_cmdline, origin="tuner")
+            if original_settings and self.apply_settings:
+                self.apply_settings(original_settings)
+
+        best = alive[0]
+        result = scores[_candidate_key(best)]
+        meets = result["low_1_fps"] >= self.target_fps
+        preset = {
+            "name": "🎯 Ajustado para este PC",
+            "description": (f"Gerado pelo benchmark: {result['avg_fps']:.0f} FPS médio, "
+                            f"1% low {result['low_1_fps']:.0f} (alvo {self.target_fps:.0f})."),
+            "args": best["args"],
+            "commandline_extra": [],
+            "settings": best["settings"],
+            "tuned": {
+                **context,
+                **result,
+                "target_fps": self.target_fps,
+                "meets_target": meets,
+                "date": datetime.now().isoformat(timespec="seconds"),
+            },
+        }
+        ok, msg = self.optimizer.save_custom_preset(TUNED_PRESET_KEY, preset)
+        if not ok:
+            return False, msg, None
+        logger.info(f"Preset ajustado: {best} -> {result}")
+        msg = f"✅ Preset ajustado salvo: {preset['description']}"
+        if not meets:
+            msg += "\n⚠️ Nenhuma configuração atingiu o FPS alvo; salvo o mais próximo."
+        return True, msg, preset
@@ -0,0 +1,239 @@
+"""
+Módulo Profiles - Perfis de lançamento nomeados
+Um perfil guarda o estado completo de um "setup" (opções do config.json,
+commandline.txt, opções gráficas do settings.xml e bloqueio de firewall) e
+é aplicado em uma única operação: só o que difere do estado atual é
+alterado, as partes independentes rodam em paralelo e, se alguma falhar,
+as que já foram aplicadas são desfeitas.
+"""
+
+import os
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.config import CONFIG_DIR, ensure_config_dir, save_config
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+PROFILES_FILE = CONFIG_DIR / "profiles.json"
+
+# Chaves do config.json que fazem parte de um perfil
+PROFILE_CONFIG_KEYS = ("launch_mode", "windowed", "borderless", "custom_args", "population_density")
+
+
+class _Step:
+    """Uma parte do perfil a aplicar, com a operação inversa."""
+
+    __slots__ = ("name", "apply", "undo")
+
+    def __init__(self, name: str, apply: Callable[[], Tuple[bool, str]],
+                 undo: Callable[[], Tuple[bool, str]]):
+        self.name = name
+        self.apply = apply
+        self.undo = undo
+
+
+def _run(step_fn: Callable[[], Tuple[bool, str]]) -> Tuple[bool, str]:
+    try:
+        return step_fn()
+    except Exception as e:
+        return False, f"❌ Erro: {str(e)}"
+
+
+class ProfileManager:
+    """
+    Perfis de lançamento ("Stream", "Heists", "Benchmark"...).
+
+    O estado atual é lido das cópias em memória (config, commandline.txt e
+    settings.xml já ficam em cache); o estado do firewall, cuja consulta
+    via netsh é lenta, é consultado uma vez e depois acompanhado pelas
+    próprias aplicações e por `note_firewall`.
+    """
+
+    def __init__(self, config: dict, optimizer, net_mgr,
+                 save_config_fn: Callable[[dict], None] = save_config, path=PROFILES_FILE):
+        self.config = config
+        self.optimizer = optimizer
+        self.net_mgr = net_mgr
+        self.save_config = save_config_fn
+        self.path = path
+        self._profiles: Optional[Dict[str, dict]] = None
+        self._firewall_blocked: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    # ===== Armazenamento =====
+
+    def get_profiles(self) -> Dict[str, dict]:
+        """Perfis salvos ({chave: perfil})."""
+        if self._profiles is None:
+            self._profiles = {}
+            if os.path.isfile(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._profiles = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"profiles.json ilegível: {e}")
+        return self._profiles
+
+    def _save(self, profiles: dict):
+        """Grava `profiles` e só então o adota como lista em memória."""
+        if self.path == PROFILES_FILE:
+            ensure_config_dir()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._profiles = profiles
+
+    def save_profile(self, key: str, profile: dict) -> Tuple[bool, str]:
+        """Salva (ou substitui) um perfil."""
+        profiles = {**self.get_profiles(), key: profile}
+        try:
+            self._save(profiles)
+        except OSError as e:
+            return False, f"❌ Erro ao salvar o perfil: {str(e)}"
+        return True, f"✅ Perfil '{profile.get('name', key)}' salvo."
+
+    def delete_profile(self, key: str) -> Tuple[bool, str]:
+        profiles = dict(self.get_profiles())
+        if key not in profiles:
+            return False, f"❌ Perfil '{key}' não encontrado."
+        profile = profiles.pop(key)
+        try:
+            self._save(profiles)
+        except OSError as e:
+            return False, f"❌ Erro ao excluir o perfil: {str(e)}"
+        return True, f"🗑️ Perfil '{profile.get('name', key)}' excluído."
+
+    # ===== Estado atual =====
+
+    def note_firewall(self, blocked: bool):
+        """Informa o estado do firewall quando ele é alterado/consultado fora daqui."""
+        self._firewall_blocked = bool(blocked)
+
+    def _firewall_state(self) -> bool:
+        if self._firewall_blocked is None:
+            self.net_mgr.game_path = self.config.get("game_path", "")
+            self._firewall_blocked = self.net_mgr.get_block_status()["is_blocked"]
+        return self._firewall_blocked
+
+    def _settings(self):
+        settings = getattr(self.optimizer, "settings", None)
+        return settings if settings is not None and settings.exists() else None
+
+    def capture(self, name: str, include_firewall: bool = True) -> dict:
+        """Perfil com o estado atual das quatro partes."""
+        settings = self._settings()
+        return {
+            "name": name,
+            "config": {k: self.config.get(k) for k in PROFILE_CONFIG_KEYS},
+            "commandline": self.optimizer.read_commandline(),
+            "settings": settings.get_graphics() if settings else {},
+            "firewall_blocked": self._firewall_state() if include_firewall else None,
+            "date": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    # ===== Aplicação =====
+
+    def plan(self, profile: dict, origin: str = "profile") -> List[_Step]:
+        """Passos necessários para chegar ao perfil (vazio se nada difere)."""
+        steps = []
+
+        # config.json
+        wanted = {k: v for k, v in (profile.get("config") or {}).items()
+                  if k in PROFILE_CONFIG_KEYS and self.config.get(k) != v}
+        if wanted:
+            old = {k: self.config.get(k) for k in wanted}
+
+            def set_config(values):
+                def fn():
+                    # A config em memória (compartilhada) só muda depois de salva
+                    updated = {**self.config, **values}
+                    self.save_config(updated)
+                    self.config.update(values)
+                    return True, "✅ Configurações atualizadas."
+                return fn
+            steps.append(_Step("config", set_config(wanted), set_config(old)))
+
+        # commandline.txt
+        cmdline = profile.get("commandline")
+        if cmdline is not None:
+            old_cmdline = self.optimizer.read_commandline()
+            if cmdline.strip() != old_cmdline:
+                steps.append(_Step(
+                    "commandline",
+                    lambda: self.optimizer.write_commandline(cmdline, origin=origin),
+                    lambda: self.optimizer.write_commandline(old_cmdline, origin=f"{origin}:rollback")))
+
+        # settings.xml
+        settings = self._settings()
+        if settings and profile.get("settings"):
+            graphics = settings.get_graphics()
+            changed = {k: v for k, v in profile["settings"].items() if graphics.get(k) != v}
+            if changed:
+                old_graphics = {k: graphics[k] for k in changed if k in graphics}
+                steps.append(_Step("settings", lambda: settings.apply(changed),
+                                   lambda: settings.apply(old_graphics) if old_graphics else (True, "")))
+
+        # firewall
+        blocked = profile.get("firewall_blocked")
+        if blocked is not None and blocked != self._firewall_state():
+            def set_firewall(state):
+                def fn():
+                    self.net_mgr.game_path = self.config.get("game_path", "")
+                    ok, msg = (self.net_mgr.block_gta_network() if state
+                               else self.net_mgr.unblock_gta_network())
+                    if ok:
+                        self._firewall_blocked = state
+                    return ok, msg
+                return fn
+            steps.append(_Step("firewall", set_firewall(blocked), set_firewall(not blocked)))
+
+        return steps
+
+    def apply(self, key: str) -> Tuple[bool, str]:
+        """
+        Aplica o perfil: calcula a diferença, aplica as partes alteradas
+        (em paralelo quando há mais de uma) e desfaz tudo se alguma falhar.
+        """
+        profile = self.get_profiles().get(key)
+        if not profile:
+            return False, f"❌ Perfil '{key}' não encontrado."
+        name = profile.get("name", key)
+
+        with self._lock:
+            steps = self.plan(profile, origin=f"profile:{key}")
+            if not steps:
+                return True, f"ℹ️ O perfil '{name}' já está aplicado."
+
+            # As partes mexem em recursos diferentes: rodam em paralelo
+            if len(steps) == 1:
+                results = [_run(steps[0].apply)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+                    results = list(pool.map(lambda s: _run(s.apply), steps))
+
+            failed = [(s, msg) for s, (ok, msg) in zip(steps, results) if not ok]
+            if not failed:
+                logger.info(f"Perfil '{name}' aplicado: {', '.join(s.name for s in steps)}")
+                return True, f"✅ Perfil '{name}' aplicado ({len(steps)} parte(s) alterada(s))."
+
+            # Desfaz as partes que foram aplicadas
+            undo_errors = []
+            for step, (ok, _) in zip(steps, results):
+                if ok:
+                    undo_ok, undo_msg = _run(step.undo)
+                    if not undo_ok:
+                        undo_errors.append(f"{step.name}: {undo_msg}")
+            logger.warning(f"Perfil '{name}' falhou em {', '.join(s.name for s, _ in failed)}")
+
+        msg = f"❌ Perfil '{name}' não aplicado; alterações desfeitas.\n"
+        msg += "\n".join(m for _, m in failed)
+        if undo_errors:
+            msg += "\n⚠️ Não foi possível desfazer:\n" + "\n".join(undo_errors)
+        return False, msg
@@ -0,0 +1,153 @@
+"""
+Módulo Quarantine - Limpeza instantânea de pastas com trabalho em segundo plano
+A pasta é renomeada para uma quarentena na mesma pasta-mãe (mesmo volume,
+então a renomeação é instantânea) e recriada vazia. Uma thread de baixa
+prioridade depois guarda o conteúdo no BackupStore e apaga a quarentena.
+O tempo percebido pelo usuário não depende do tamanho da pasta.
+"""
+
+import os
+import json
+import queue
+import shutil
+import ctypes
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+QUARANTINE_DIR = ".gtavlauncher-quarantine"
+META_SUFFIX = ".json"
+
+THREAD_PRIORITY_LOWEST = -2
+
+
+def _lower_thread_priority():
+    """Prioridade mínima para a thread atual (somente Windows)."""
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+    except (AttributeError, OSError):
+        pass
+
+
+class QuarantineWorker:
+    """
+    Fila de pastas em quarentena processadas por uma única thread.
+
+    Cada item tem um arquivo .json ao lado com a origem e o tipo de backup,
+    então itens deixados por uma sessão interrompida são retomados por
+    `resume()`.
+    """
+
+    def __init__(self, backups=None):
+        self.backups = backups
+        self._queue: "queue.Queue[Path]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ===== Quarentena =====
+
+    def quarantine(self, path, label: str, backup: bool = True, recreate: bool = True) -> Path:
+        """
+        Move `path` para a quarentena e agenda o backup/remoção.
+
+        Raises:
+            OSError: se a pasta não puder ser renomeada (arquivos em uso).
+        """
+        path = Path(path)
+        qdir = path.parent / QUARANTINE_DIR
+        qdir.mkdir(exist_ok=True)
+        name = f"{label}_{datetime.now():%Y%m%d_%H%M%S_%f}"
+        dest = qdir / name
+        meta = {"source": str(path), "label": label, "backup": bool(backup and self.backups)}
+        with open(qdir / (name + META_SUFFIX), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        try:
+            os.rename(path, dest)
+        except OSError:
+            os.remove(qdir / (name + META_SUFFIX))
+            raise
+        if recreate:
+            path.mkdir(parents=True, exist_ok=True)
+        self._submit(dest)
+        return dest
+
+    def resume(self, parents: Iterable) -> int:
+        """Reagenda itens de quarentena deixados nas pastas informadas."""
+        count = 0
+        for parent in parents:
+            qdir = Path(parent) / QUARANTINE_DIR
+            if not qdir.is_dir():
+                continue
+            for entry in os.scandir(qdir):
+                if entry.is_dir(follow_symlinks=False):
+                    self._submit(Path(entry.path))
+                    count += 1
+        if count:
+            logger.info(f"Quarentena: {count} item(ns) pendente(s) retomado(s)")
+        return count
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a fila esvaziar; retorna False se o tempo acabar."""
+        done = threading.Event()
+
+        def join():
+            self._queue.join()
+            done.set()
+        threading.Thread(target=join, daemon=True).start()
+        return done.wait(timeout)
+
+    # ===== Worker =====
+
+    def _submit(self, item: Path):
+        with self._lock:
+            self._queue.put(item)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quarantine", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        _lower_thread_priority()
+        while True:
+            try:
+                item = self._queue.get(timeout=5)
+            except queue.Empty:
+                # Encerra a thread ociosa; _submit cria outra quando necessário
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            try:
+                self._process(item)
+            except Exception as e:
+                logger.warning(f"Quarentena: falha ao processar {item.name}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _process(self, item: Path):
+        meta_path = item.with_name(item.name + META_SUFFIX)
+        meta = {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+        if meta.get("backup") and self.backups is not None:
+            self.backups.backup(item, meta.get("label", "quarantine"), origin=meta.get("source"))
+        shutil.rmtree(item, ignore_errors=True)
+        if not item.exists():
+            meta_path.unlink(missing_ok=True)
+            try:
+                item.parent.rmdir()           # só se estiver vazia
+            except OSError:
+                pass
+        logger.info(f"Quarentena: {item.name} processado")
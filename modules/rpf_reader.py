@@ -0,0 +1,310 @@
+"""
+Módulo RPF Reader - Leitura do índice de arquivos RPF7 do GTA V
+Lê somente o cabeçalho e a tabela de entradas (TOC) dos arquivos .rpf,
+sem tocar nos dados do arquivo. Somente leitura.
+"""
+
+import os
+import mmap
+import struct
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+# ===== Formato RPF7 =====
+
+RPF7_MAGIC = 0x52504637              # "RPF7"
+HEADER_SIZE = 16                     # magic, entry_count, names_length, encryption
+ENTRY_SIZE = 16
+BLOCK_SIZE = 512                     # offsets de arquivo são em blocos de 512 bytes
+DIRECTORY_MARKER = 0x7FFFFF00
+RESOURCE_FLAG = 0x80000000
+
+ENCRYPTION_TYPES = {
+    0x00000000: "none",
+    0x4E45504F: "open",              # "OPEN" — arquivo salvo pelo OpenIV (modificado)
+    0x0FFFFFF9: "aes",
+    0x0FEFFFFF: "ng",                # formato padrão dos arquivos originais
+}
+
+_HEADER = struct.Struct("<4I")
+_ENTRY = struct.Struct("<QII")
+
+
+def read_rpf_header(path: str) -> dict:
+    """
+    Lê apenas os 16 bytes do cabeçalho de um arquivo RPF7.
+
+    Raises:
+        ValueError: se o arquivo não for um RPF7.
+    """
+    with open(path, "rb") as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"Arquivo muito pequeno para ser RPF7: {path}")
+
+    magic, entry_count, names_length, encryption = _HEADER.unpack(data)
+    if magic != RPF7_MAGIC:
+        raise ValueError(f"Assinatura RPF7 inválida: {path}")
+
+    enc_name = ENCRYPTION_TYPES.get(encryption, "unknown")
+    return {
+        "entry_count": entry_count,
+        "names_length": names_length,
+        "encryption": enc_name,
+        "encrypted": enc_name not in ("none", "open"),
+        "toc_size": HEADER_SIZE + entry_count * ENTRY_SIZE + names_length,
+    }
+
+
+def _read_name(names: bytes, offset: int) -> str:
+    end = names.find(b"\0", offset)
+    if end < 0:
+        end = len(names)
+    return names[offset:end].decode("latin-1")
+
+
+def _parse_entries(toc, entry_count: int, names_length: int) -> List[dict]:
+    """Interpreta a tabela de entradas e monta os caminhos completos."""
+    names_start = HEADER_SIZE + entry_count * ENTRY_SIZE
+    names = bytes(toc[names_start:names_start + names_length])
+
+    raw = []
+    for i in range(entry_count):
+        buf, x, y = _ENTRY.unpack_from(toc, HEADER_SIZE + i * ENTRY_SIZE)
+        low = buf & 0xFFFFFFFF
+        high = buf >> 32
+        if high == DIRECTORY_MARKER:
+            raw.append({
+                "type": "directory",
+                "name": _read_name(names, low),
+                "children": (x, y),
+            })
+        elif high & RESOURCE_FLAG:
+            raw.append({
+                "type": "resource",
+                "name": _read_name(names, buf & 0xFFFF),
+                "size": (buf >> 16) & 0xFFFFFF,
+                "offset": ((buf >> 40) & 0x7FFFFF) * BLOCK_SIZE,
+                "system_flags": x,
+                "graphics_flags": y,
+            })
+        else:
+            raw.append({
+                "type": "binary",
+                "name": _read_name(names, buf & 0xFFFF),
+                "size": (buf >> 16) & 0xFFFFFF,
+                "offset": ((buf >> 40) & 0xFFFFFF) * BLOCK_SIZE,
+                "uncompressed_size": x,
+                "encrypted": y != 0,
+            })
+
+    if not raw or raw[0]["type"] != "directory":
+        raise ValueError("TOC RPF7 inválido: a primeira entrada não é um diretório.")
+
+    # Percorre a árvore a partir da raiz (entrada 0) montando os caminhos
+    entries = []
+    stack = [(0, "")]
+    visited = set()
+    while stack:
+        index, prefix = stack.pop()
+        if index in visited:
+            continue
+        visited.add(index)
+        start, count = raw[index]["children"]
+        if start + count > entry_count:
+            raise ValueError(f"TOC RPF7 inválido: diretório {prefix or '/'} fora dos limites.")
+        for child in range(start, start + count):
+            entry = dict(raw[child])
+            entry["path"] = f"{prefix}{entry['name']}"
+            if entry["type"] == "directory":
+                stack.append((child, entry["path"] + "/"))
+                del entry["children"]
+            entries.append(entry)
+
+    entries.sort(key=lambda e: e["path"])
+    return entries
+
+
+def read_rpf_index(path: str) -> dict:
+    """
+    Lê o índice completo de um arquivo RPF7.
+
+    Apenas a região do cabeçalho + TOC é mapeada em memória, portanto o custo
+    não depende do tamanho do arquivo. Arquivos criptografados (AES/NG) são
+    reportados como opacos, sem entradas.
+
+    Returns:
+        Dict com informações do cabeçalho e a lista de entradas.
+    """
+    st = os.stat(path)
+    header = read_rpf_header(path)
+
+    index = {
+        "path": path,
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        **header,
+        "modified": header["encryption"] == "open",
+        "entries": None,
+    }
+
+    if header["encrypted"]:
+        return index
+
+    toc_size = header["toc_size"]
+    if toc_size > st.st_size:
+        raise ValueError(f"TOC RPF7 truncado: {path}")
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), toc_size, access=mmap.ACCESS_READ) as toc:
+            index["entries"] = _parse_entries(
+                toc, header["entry_count"], header["names_length"]
+            )
+    return index
+
+
+class RpfIndexCache:
+    """Cache de índices RPF, invalidado por tamanho e data de modificação."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> dict:
+        """Retorna o índice do arquivo, relendo o TOC apenas se ele mudou."""
+        key = os.path.normcase(os.path.abspath(path))
+        st = os.stat(path)
+
+        with self._lock:
+            cached = self._items.get(key)
+            if cached and cached["size"] == st.st_size and cached["mtime"] == st.st_mtime_ns:
+                self._items.move_to_end(key)
+                return cached
+
+        index = read_rpf_index(path)
+
+        with self._lock:
+            self._items[key] = index
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return index
+
+    def invalidate(self, path: Optional[str] = None):
+        """Remove um arquivo (ou todos) do cache."""
+        with self._lock:
+            if path is None:
+                self._items.clear()
+            else:
+                self._items.pop(os.path.normcase(os.path.abspath(path)), None)
+
+
+_default_cache = RpfIndexCache()
+
+
+def get_rpf_index(path: str) -> dict:
+    """Lê o índice de um RPF usando o cache compartilhado."""
+    return _default_cache.get(path)
+
+
+def list_rpf_entries(path: str) -> List[dict]:
+    """Lista as entradas de um RPF (lista vazia se for criptografado)."""
+    return get_rpf_index(path)["entries"] or []
+
+
+def find_game_archives(game_path: str) -> List[str]:
+    """Lista os .rpf da raiz do jogo, de update/ e de mods/ (recursivo)."""
+    archives = []
+    if not game_path or not os.path.isdir(game_path):
+        return archives
+
+    def scan(directory: str, recursive: bool):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.lower().endswith(".rpf"):
+                        archives.append(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        scan(entry.path, True)
+        except OSError as e:
+            logger.warning(f"Erro ao listar {directory}: {e}")
+
+    scan(game_path, False)
+    for sub in ("update", "mods"):
+        sub_path = os.path.join(game_path, sub)
+        if os.path.isdir(sub_path):
+            scan(sub_path, True)
+    return archives
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    # Uso: python -m modules.rpf_reader
+    # Monta arquivos RPF7 sintéticos (sem criptografia, OPEN e NG) e confere
+    # cabeçalho e listagem de entradas.
+
+    def build_rpf7(encryption: int) -> bytes:
+        # raiz -> data/, readme.txt ; data/ -> a.ymt (binário), b.ytd (recurso)
+        names = b""
+        offsets = {}
+        for name in ("", "data", "readme.txt", "a.ymt", "b.ytd"):
+            offsets[name] = len(names)
+            names += name.encode() + b"\0"
+        names += b"\0" * (-len(names) % 16)
+
+        def directory(name, start, count):
+            return _ENTRY.pack(offsets[name] | DIRECTORY_MARKER << 32, start, count)
+
+        def binary(name, size, block):
+            return _ENTRY.pack(offsets[name] | size << 16 | block << 40, size, 0)
+
+        def resource(name, size, block):
+            return _ENTRY.pack(offsets[name] | size << 16 | (block | 0x800000) << 40, 0x10, 0x20)
+
+        entries = [directory("", 1, 2), directory("data", 3, 2),
+                   binary("readme.txt", 100, 1), binary("a.ymt", 2048, 2),
+                   resource("b.ytd", 5000, 6)]
+        toc = b"".join(entries)
+        if encryption == 0x0FEFFFFF:
+            toc = os.urandom(len(toc))          # NG: TOC cifrado, ilegível sem a chave
+        data = _HEADER.pack(RPF7_MAGIC, len(entries), len(names), encryption) + toc + names
+        return data + b"\0" * (16 * BLOCK_SIZE - len(data))
+
+    expected = {"data": ("directory", None), "data/a.ymt": ("binary", 2048),
+                "data/b.ytd": ("resource", 5000), "readme.txt": ("binary", 100)}
+    root = tempfile.mkdtemp(prefix="rpf_")
+    for label, encryption in (("none", 0), ("open", 0x4E45504F), ("ng", 0x0FEFFFFF)):
+        path = os.path.join(root, f"{label}.rpf")
+        with open(path, "wb") as f:
+            f.write(build_rpf7(encryption))
+
+        header = read_rpf_header(path)
+        assert header["encryption"] == label and header["entry_count"] == 5, header
+        index = read_rpf_index(path)
+        if label == "ng":
+            # Opaco: reconhecido pelo cabeçalho, sem entradas
+            assert header["encrypted"] and index["entries"] is None and list_rpf_entries(path) == []
+        else:
+            got = {e["path"]: (e["type"], e.get("size")) for e in index["entries"]}
+            assert got == expected, got
+            assert index["modified"] == (label == "open")
+            assert next(e for e in index["entries"] if e["path"] == "data/b.ytd")["offset"] == 6 * BLOCK_SIZE
+        print(f"{label:>4}: {header['encryption']:<4} entradas={index['entries'] and len(index['entries'])}")
+
+    with open(os.path.join(root, "bad.rpf"), "wb") as f:
+        f.write(b"RPF8" + b"\0" * 12)
+    try:
+        read_rpf_header(os.path.join(root, "bad.rpf"))
+        raise AssertionError("assinatura inválida aceita")
+    except ValueError:
+        pass
+    shutil.rmtree(root, ignore_errors=True)
+    print("ok")
@@ -0,0 +1,523 @@
+"""
+Módulo Settings XML - Editor das opções gráficas do settings.xml do GTA V
+Lê o arquivo uma única vez, expõe as opções com tipos e grava apenas os
+atributos alterados, preservando o restante do arquivo byte a byte.
+Também valida a estrutura do arquivo (parse incremental, seções e faixas de
+valores) e repara só os elementos com problema.
+"""
+
+import io
+import os
+import re
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+SETTINGS_XML = Path(os.environ.get("USERPROFILE", "")) / "Documents" / "Rockstar Games" / "GTA V" / "settings.xml"
+
+# chave -> (seção, tipo, mínimo, máximo)
+SCHEMA = {
+    # Texturas e shaders
+    "TextureQuality": ("graphics", int, 0, 2),
+    "ShaderQuality": ("graphics", int, 0, 2),
+    "ParticleQuality": ("graphics", int, 0, 2),
+    "WaterQuality": ("graphics", int, 0, 2),
+    "GrassQuality": ("graphics", int, 0, 3),
+    "Tessellation": ("graphics", int, 0, 3),
+    "AnisotropicFiltering": ("graphics", int, 0, 16),
+    # Sombras e reflexos
+    "ShadowQuality": ("graphics", int, 0, 3),
+    "Shadow_SoftShadows": ("graphics", int, 0, 5),     # 4 = AMD CHS, 5 = NVIDIA PCSS
+    "UltraShadows_Enabled": ("graphics", bool, None, None),
+    "Shadow_LongShadows": ("graphics", bool, None, None),
+    "ReflectionQuality": ("graphics", int, 0, 3),
+    "ReflectionMSAA": ("graphics", int, 0, 8),
+    "SSAO": ("graphics", int, 0, 2),
+    # Anti-aliasing e pós-processamento
+    "MSAA": ("graphics", int, 0, 8),
+    "FXAA_Enabled": ("graphics", bool, None, None),
+    "TXAA_Enabled": ("graphics", bool, None, None),
+    "PostFX": ("graphics", int, 0, 3),
+    "DoF": ("graphics", bool, None, None),
+    "MotionBlurStrength": ("graphics", float, 0.0, 1.0),
+    # Distância e população
+    "LodScale": ("graphics", float, 0.0, 1.0),
+    "MaxLodScale": ("graphics", float, 0.0, 1.0),
+    "CityDensity": ("graphics", float, 0.0, 1.0),
+    "PedVarietyMultiplier": ("graphics", float, 0.0, 1.0),
+    "VehicleVarietyMultiplier": ("graphics", float, 0.0, 1.0),
+    "HdStreamingInFlight": ("graphics", bool, None, None),
+    "DX_Version": ("graphics", int, 0, 2),
+    # Vídeo
+    "ScreenWidth": ("video", int, 640, 7680),
+    "ScreenHeight": ("video", int, 480, 4320),
+    "RefreshRate": ("video", int, 24, 360),
+    "Windowed": ("video", int, 0, 2),
+    "VSync": ("video", int, 0, 2),
+}
+
+# Nome usado no config.json do launcher -> chave do settings.xml
+CONFIG_KEYS = {"population_density": "CityDensity"}
+
+ROOT_ELEMENT = "Settings"
+REQUIRED_SECTIONS = ("graphics", "video")
+
+# Erros do expat que indicam fim de arquivo inesperado (XML_ERROR_NO_ELEMENTS, XML_ERROR_UNCLOSED_TOKEN)
+_EOF_ERRORS = (3, 5)
+_MISMATCHED_TAG = 7
+MAX_REPAIRS = 20
+
+_TAG = re.compile(r'<(/?)([A-Za-z_][\w.:-]*)([^<>]*?)(/?)>')
+_VALUE = re.compile(r'\bvalue\s*=\s*"([^"]*)"')
+
+
+def _parse_value(kind, text: str):
+    if kind is bool:
+        return text.strip().lower() == "true"
+    return kind(float(text)) if kind is int else kind(text)
+
+
+def _format_value(kind, value) -> str:
+    if kind is bool:
+        return "true" if value else "false"
+    if kind is float:
+        return f"{float(value):.6f}"
+    return str(int(value))
+
+
+def _value_error(key: str, raw: Optional[str]) -> Optional[str]:
+    """Motivo pelo qual o valor bruto de `key` é inválido (None se válido)."""
+    _, kind, low, high = SCHEMA[key]
+    if raw is None:
+        return "atributo value ausente"
+    if kind is bool:
+        return None if raw.strip().lower() in ("true", "false") else f"'{raw}' não é true/false"
+    try:
+        value = float(raw)
+    except ValueError:
+        return f"'{raw}' não é numérico"
+    if low is not None and not low <= value <= high:
+        return f"{raw} fora do intervalo ({low} a {high})"
+    return None
+
+
+def _repaired_value(key: str, raw: Optional[str]):
+    """Valor válido mais próximo do original (limite da faixa ou o mínimo)."""
+    _, kind, low, high = SCHEMA[key]
+    if kind is bool:
+        return False
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return kind(low)
+    return kind(min(max(value, low), high))
+
+
+def _scan(source) -> dict:
+    """
+    Valida o XML com iterparse, parando no primeiro erro fatal.
+
+    Args:
+        source: Caminho ou objeto de arquivo binário.
+
+    Returns:
+        Dict com "status" ("ok", "truncated", "malformed" ou "invalid"),
+        "errors" (lista de {"element", "line", "message"}; erros de valor
+        trazem também "key" e "raw", erros de parse "code" e "column") e
+        "checked" (valores verificados).
+    """
+    errors = []
+    stack: List[str] = []
+    sections = set()
+    checked = 0
+    try:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if not stack and elem.tag != ROOT_ELEMENT:
+                    errors.append({"element": elem.tag, "line": None,
+                                   "message": f"elemento raiz deveria ser <{ROOT_ELEMENT}>"})
+                stack.append(elem.tag)
+                continue
+            stack.pop()
+            if len(stack) == 1:
+                sections.add(elem.tag)
+                elem.clear()
+            elif len(stack) == 2 and SCHEMA.get(elem.tag, ("",))[0] == stack[1]:
+                checked += 1
+                raw = elem.get("value")
+                error = _value_error(elem.tag, raw)
+                if error:
+                    errors.append({"element": f"{stack[1]}/{elem.tag}", "line": None, "message": error})
+                    if raw is not None:
+                        errors[-1].update(key=elem.tag, raw=raw)
+    except ET.ParseError as e:
+        line, _ = e.position
+        truncated = e.code in _EOF_ERRORS
+        return {
+            "status": "truncated" if truncated else "malformed",
+            "errors": [{"element": "/".join(stack) or ROOT_ELEMENT, "line": line,
+                        "message": "arquivo termina no meio do elemento" if truncated else str(e),
+                        "code": e.code, "column": e.position[1]}],
+            "checked": checked,
+        }
+
+    for section in REQUIRED_SECTIONS:
+        if section not in sections:
+            errors.append({"element": section, "line": None, "message": f"seção <{section}> ausente"})
+    return {"status": "invalid" if errors else "ok", "errors": errors, "checked": checked}
+
+
+def _close_truncated(text: str) -> str:
+    """Corta o elemento incompleto do final e fecha os elementos ainda abertos."""
+    stack: List[str] = []
+    end = 0
+    for m in _TAG.finditer(text):
+        closing, name, _, selfclose = m.groups()
+        if closing:
+            if stack and stack[-1] == name:
+                stack.pop()
+        elif not selfclose:
+            stack.append(name)
+        end = m.end()
+    nl = "\r\n" if "\r\n" in text else "\n"
+    tail = "".join(f"{nl}{'  ' * depth}</{name}>" for depth, name in reversed(list(enumerate(stack))))
+    return text[:end] + tail + nl
+
+
+def _fix_broken_line(text: str, error: dict, element: str) -> Optional[str]:
+    """
+    Corrige a linha de um elemento malformado dentro de uma seção: um elemento
+    sem fechamento vira auto-fechado; qualquer outro erro remove a linha.
+    """
+    lines = text.splitlines(keepends=True)
+    index = error["line"] - 1
+    if not 0 <= index < len(lines):
+        return None
+    if error.get("code") == _MISMATCHED_TAG:
+        # <Chave value="..."> sem </Chave>: procura a abertura acima do erro
+        for i in range(index - 1, -1, -1):
+            content = lines[i].strip()
+            if content.startswith(f"<{element}") and content.endswith(">") and not content.endswith("/>"):
+                cut = lines[i].rindex(">")
+                lines[i] = lines[i][:cut].rstrip() + " />" + lines[i][cut + 1:]
+                return "".join(lines)
+        return None
+    # Coluna no início do conteúdo: o expat só percebeu o erro na linha seguinte
+    if not lines[index][:error.get("column", 0)].strip() and index > 0:
+        index -= 1
+    content = lines[index].strip()
+    if not content.startswith("<") or content.startswith("</") or content.count("<") != 1:
+        return None
+    return "".join(lines[:index] + lines[index + 1:])
+
+
+def _add_sections(text: str, sections: List[str]) -> Optional[str]:
+    """Recria seções obrigatórias ausentes, vazias, antes de </Settings>."""
+    pos = text.rfind(f"</{ROOT_ELEMENT}>")
+    if pos < 0:
+        return None
+    line_start = text.rfind("\n", 0, pos) + 1
+    if text[line_start:pos].strip():
+        line_start = pos
+    nl = "\r\n" if "\r\n" in text else "\n"
+    # Abertura e fechamento separados: apply() insere chaves novas antes do fechamento
+    return text[:line_start] + "".join(f"  <{name}>{nl}  </{name}>{nl}" for name in sections) \
+        + text[line_start:]
+
+
+def _repair_structure(text: str) -> Tuple[Optional[str], List[str], dict]:
+    """
+    Corrige truncamento, linhas malformadas e seções ausentes até o XML ficar
+    bem-formado; erros de valor ficam para o chamador.
+
+    Returns:
+        (texto reparado ou None se não deu, descrição das correções, resultado da validação)
+    """
+    notes = []
+    result = _scan(io.BytesIO(text.encode("utf-8")))
+    for _ in range(MAX_REPAIRS):
+        error = result["errors"][0] if result["errors"] else None
+        if result["status"] == "truncated":
+            fixed = _close_truncated(text)
+            note = f"fechado o arquivo truncado em <{error['element']}>"
+        elif result["status"] == "malformed" and error["element"].count("/") >= 1:
+            fixed = _fix_broken_line(text, error, error["element"].rsplit("/", 1)[-1])
+            note = f"corrigido elemento malformado perto da linha {error['line']} ({error['element']})"
+        else:
+            break
+        if fixed is None or fixed == text:
+            return None, notes, result
+        new_result = _scan(io.BytesIO(fixed.encode("utf-8")))
+        # Só aceita a correção se o parser avançou
+        if new_result["status"] == result["status"] == "malformed" and \
+                new_result["errors"][0]["line"] < error["line"] - 1:
+            return None, notes, result
+        text, result = fixed, new_result
+        notes.append(note)
+
+    if result["status"] in ("truncated", "malformed"):
+        return None, notes, result
+    missing = [e["element"] for e in result["errors"] if e["message"].startswith("seção")]
+    if missing:
+        text = _add_sections(text, missing)
+        if text is None:
+            return None, notes, result
+        result = _scan(io.BytesIO(text.encode("utf-8")))
+        notes += [f"recriada a seção <{name}> vazia (o jogo preenche os padrões)" for name in missing]
+    if any("key" not in e for e in result["errors"]):
+        return None, notes, result
+    return text, notes, result
+
+
+class SettingsXml:
+    """
+    Acesso tipado ao settings.xml.
+
+    O arquivo é lido uma vez e indexado: para cada elemento `<Chave value="..."/>`
+    guardamos a posição exata do valor no texto. Gravar uma alteração é
+    substituir apenas esses trechos — elementos desconhecidos, comentários,
+    indentação e quebras de linha ficam intactos. Se o arquivo mudar no
+    disco (ex.: o jogo gravou), ele é relido antes de aplicar o patch.
+    """
+
+    def __init__(self, path=SETTINGS_XML):
+        self.path = Path(path)
+        self._text: Optional[str] = None
+        self._mtime: Optional[int] = None
+        self._spans: Dict[str, Tuple[str, int, int]] = {}     # chave -> (seção, início, fim)
+        self._section_ends: Dict[str, Tuple[int, str]] = {}   # seção -> (posição, indentação)
+        self._verdict: Optional[Tuple[Tuple[int, int], dict]] = None  # ((mtime, tamanho), resultado)
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    # ===== Leitura =====
+
+    def _load(self, force: bool = False):
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._text, self._mtime = None, None
+            self._spans, self._section_ends = {}, {}
+            return
+        if not force and self._text is not None and mtime == self._mtime:
+            return
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            self._text = f.read()
+        self._mtime = mtime
+        self._index()
+
+    def _index(self):
+        spans, ends = {}, {}
+        child_indent: Dict[str, str] = {}
+        stack: List[str] = []
+        text = self._text
+        for m in _TAG.finditer(text):
+            closing, name, attrs, selfclose = m.groups()
+            line_start = text.rfind("\n", 0, m.start()) + 1
+            prefix = text[line_start:m.start()]
+            if closing:
+                if stack and stack[-1] == name:
+                    stack.pop()
+                    # Chaves novas entram antes do fechamento, com a indentação dos irmãos
+                    pos = line_start if not prefix.strip() else m.start()
+                    ends[name] = (pos, child_indent.get(name, prefix + "  "))
+                continue
+            if selfclose:
+                v = _VALUE.search(attrs)
+                if v and stack:
+                    start = m.start(3) + v.start(1)
+                    spans.setdefault(name, (stack[-1], start, start + len(v.group(1))))
+                    if not prefix.strip():
+                        child_indent[stack[-1]] = prefix
+                continue
+            stack.append(name)
+        self._spans, self._section_ends = spans, ends
+
+    def get(self, key: str, default=None):
+        """Valor tipado de uma chave (ou `default` se ausente/inválido)."""
+        self._load()
+        span = self._spans.get(key)
+        if not span:
+            return default
+        kind = SCHEMA.get(key, (None, str))[1]
+        try:
+            return _parse_value(kind, self._text[span[1]:span[2]])
+        except ValueError:
+            return default
+
+    def get_graphics(self) -> dict:
+        """Todas as opções conhecidas presentes no arquivo."""
+        self._load()
+        return {k: self.get(k) for k in SCHEMA if k in self._spans}
+
+    @property
+    def population_density(self) -> Optional[float]:
+        """CityDensity, equivalente a config["population_density"]."""
+        return self.get("CityDensity")
+
+    # ===== Validação =====
+
+    def check(self) -> dict:
+        """
+        Valida o arquivo no disco; o resultado fica em cache enquanto mtime
+        e tamanho não mudam.
+
+        Returns:
+            Resultado de `_scan` com "status" também podendo ser "missing" ou
+            "empty", e "repairable" indicando se `repair()` resolve os problemas.
+        """
+        try:
+            st = self.path.stat()
+        except OSError:
+            return {"status": "missing", "errors": [], "checked": 0, "repairable": False}
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._verdict and self._verdict[0] == stamp:
+            return dict(self._verdict[1])
+
+        if not st.st_size:
+            result = {"status": "empty", "errors": [], "checked": 0, "repairable": False}
+        else:
+            result = _scan(str(self.path))
+            result["repairable"] = False
+            if result["status"] != "ok":
+                self._load()
+                result["repairable"] = self._text is not None and \
+                    _repair_structure(self._text)[0] is not None
+        self._verdict = (stamp, result)
+        return dict(result)
+
+    def repair(self) -> Tuple[bool, str]:
+        """
+        Repara só o que está quebrado: fecha um arquivo truncado, corrige ou
+        remove linhas malformadas, recria seções ausentes e traz valores para
+        dentro da faixa do SCHEMA. O restante do arquivo é preservado.
+        """
+        report = self.check()
+        if report["status"] == "ok":
+            return True, "ℹ️ settings.xml está válido; nada a reparar."
+        if not report["repairable"]:
+            return False, "❌ settings.xml não pode ser reparado; use o reset para recriá-lo."
+
+        self._load(force=True)
+        text, notes, result = _repair_structure(self._text)
+        if text is None:
+            return False, "❌ settings.xml não pode ser reparado; use o reset para recriá-lo."
+
+        # Valores fora da faixa: substitui só o atributo (mesmo que a leitura
+        # tipada já "pareça" correta, como "yes" lido como false)
+        self._text = text
+        self._index()
+        patches = []
+        for e in result["errors"]:
+            span = self._spans.get(e["key"])
+            kind = SCHEMA[e["key"]][1]
+            new = _format_value(kind, _repaired_value(e["key"], e["raw"]))
+            if span:
+                patches.append((span[1], span[2], new))
+                notes.append(f"{e['element']}: {e['raw']} → {new}")
+        for start, end, new in sorted(patches, reverse=True):
+            text = text[:start] + new + text[end:]
+        try:
+            self._write(text)
+        except OSError as e:
+            self._mtime = None            # descarta o texto em memória
+            return False, f"❌ Erro ao gravar settings.xml: {str(e)}"
+
+        logger.info(f"settings.xml reparado: {'; '.join(notes)}")
+        return True, "✅ settings.xml reparado:\n" + "\n".join(f"• {n}" for n in notes)
+
+    # ===== Escrita =====
+
+    def validate(self, changes: dict) -> Optional[str]:
+        """Retorna uma mensagem de erro se algum valor for inválido."""
+        for key, value in changes.items():
+            if key not in SCHEMA:
+                return f"Opção desconhecida: {key}"
+            _, kind, low, high = SCHEMA[key]
+            if kind is bool:
+                if not isinstance(value, bool):
+                    return f"{key} deve ser verdadeiro/falso"
+                continue
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return f"{key} deve ser numérico"
+            if kind is int and value != int(value):
+                return f"{key} deve ser inteiro"
+            if low is not None and not low <= value <= high:
+                return f"{key} fora do intervalo ({low} a {high})"
+        return None
+
+    def apply(self, changes: dict) -> Tuple[bool, str]:
+        """
+        Aplica as opções e grava o arquivo atomicamente.
+
+        Chaves do config.json (ex.: "population_density") também são aceitas.
+        Somente os atributos com valor diferente do atual são reescritos.
+        """
+        changes = {CONFIG_KEYS.get(k, k): v for k, v in changes.items()}
+        error = self.validate(changes)
+        if error:
+            return False, f"❌ {error}"
+
+        self._load()
+        if self._text is None:
+            return False, "❌ settings.xml não encontrado. Inicie o jogo uma vez para criá-lo."
+
+        patches = []     # (início, fim, texto)
+        inserts: Dict[str, List[str]] = {}
+        changed = 0
+        for key, value in changes.items():
+            section, kind = SCHEMA[key][0], SCHEMA[key][1]
+            new = _format_value(kind, value)
+            span = self._spans.get(key)
+            if span:
+                if self.get(key) != _parse_value(kind, new):
+                    patches.append((span[1], span[2], new))
+                    changed += 1
+            elif section in self._section_ends:
+                inserts.setdefault(section, []).append(f'<{key} value="{new}" />')
+                changed += 1
+            else:
+                return False, f"❌ Seção <{section}> não encontrada no settings.xml."
+
+        if not changed:
+            return True, "ℹ️ settings.xml já está com essas opções."
+
+        for section, elements in inserts.items():
+            pos, indent = self._section_ends[section]
+            nl = "\r\n" if "\r\n" in self._text else "\n"
+            patches.append((pos, pos, "".join(f"{indent}{e}{nl}" for e in elements)))
+
+        text = self._text
+        for start, end, new in sorted(patches, reverse=True):
+            text = text[:start] + new + text[end:]
+
+        try:
+            self._write(text)
+        except OSError as e:
+            return False, f"❌ Erro ao gravar settings.xml: {str(e)}"
+        logger.info(f"settings.xml: {changed} opção(ões) alterada(s)")
+        return True, f"✅ settings.xml atualizado ({changed} opção(ões) alterada(s))."
+
+    def _write(self, text: str):
+        tmp = self.path.with_suffix(".xml.tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._text = text
+        self._mtime = self.path.stat().st_mtime_ns
+        self._index()
+
+    def set(self, key: str, value) -> Tuple[bool, str]:
+        """Altera uma única opção."""
+        return self.apply({key: value})
+
+    def set_population_density(self, value: float) -> Tuple[bool, str]:
+        """Grava config["population_density"] no settings.xml."""
+        return self.apply({"CityDensity": float(value)})
@@ -4,13 +4,21 @@ Resolve problemas comuns do Rockstar Social Club.
 """
 
 import os
-import shutil
 import subprocess
 import logging
 import winreg
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
+
+from modules.mod_detector import ModDetector, DISABLE_CATEGORIES
+from modules.diagnostics import DiagnosticsRunner
+from modules.dir_size import dir_size
+from modules.backup_store import BackupStore, CHUNKS_DIR, SNAPSHOTS_DIR
+from modules.quarantine import QuarantineWorker
+from modules.settings_xml import SettingsXml
+from modules.log_analyzer import LogAnalyzer
+from modules.diag_history import DiagnosticsHistory
 
 logger = logging.getLogger("GTAVLauncher")
 
@@ -31,44 +39,60 @@ class SocialClubFixer:
 
     BACKUP_DIR = Path(os.environ.get("APPDATA", "")) / "GTAVLauncher" / "backups"
 
-    def __init__(self):
+    CACHE_WARNING_MB = 500
+
+    def __init__(self, game_path: str = ""):
         self.issues_found: List[str] = []
         self.fixes_applied: List[str] = []
-
-    def run_diagnostics(self) -> List[dict]:
+        self.game_path = game_path
+        self.mod_detector = ModDetector(game_path)
+        self.diagnostics = self._register_checks()
+        self.backups = BackupStore(self.BACKUP_DIR)
+        self.settings = SettingsXml(self.SETTINGS_XML)
+        self.logs = LogAnalyzer()
+        self.history = DiagnosticsHistory()
+        # Limpezas interrompidas na sessão anterior
+        self.quarantine = QuarantineWorker(self.backups)
+        self.quarantine.resume([self.SC_CACHE_DIR.parent, self.SC_LAUNCHER_DIR])
+
+    def _register_checks(self) -> DiagnosticsRunner:
+        return (DiagnosticsRunner()
+                .register("directories", "Diretórios Social Club", self._check_sc_directories, timeout=5)
+                .register("cache", "Cache do Social Club", self._check_sc_cache)
+                .register("profiles", "Perfis do Social Club", self._check_profiles, timeout=5)
+                .register("settings", "Configurações do Jogo", self._check_settings, timeout=5)
+                .register("services", "Serviços Rockstar", self._check_rockstar_services)
+                .register("registry", "Registro do Windows", self._check_registry, timeout=5)
+                .register("mods", "Mods e ASI Loaders", self._check_mods, timeout=20)
+                .register("logs", "Logs do Launcher e Social Club", self._check_logs, timeout=20))
+
+    def run_diagnostics(self, on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
         """
         Executa diagnóstico completo do Social Club.
 
+        As verificações rodam em paralelo (ver DiagnosticsRunner).
+
+        Args:
+            on_result: Recebe cada resultado assim que ele fica pronto.
+
         Returns:
-            Lista de problemas encontrados com sugestões.
+            Lista de problemas encontrados com sugestões, cada um com a
+            duração ("duration", em segundos) da verificação, a métrica
+            ("metric") e, se houver, o resultado da execução anterior
+            ("previous": {ts, status, metric}). A execução é gravada no
+            histórico.
         """
         self.issues_found.clear()
-        results = []
-
-        # 1. Verificar diretórios do Social Club
-        check = self._check_sc_directories()
-        results.append(check)
-
-        # 2. Verificar cache corrompido
-        check = self._check_sc_cache()
-        results.append(check)
-
-        # 3. Verificar perfis
-        check = self._check_profiles()
-        results.append(check)
+        previous = self.history.latest()
 
-        # 4. Verificar settings.xml
-        check = self._check_settings()
-        results.append(check)
-
-        # 5. Verificar serviços do Rockstar
-        check = self._check_rockstar_services()
-        results.append(check)
-
-        # 6. Verificar registro do Windows
-        check = self._check_registry()
-        results.append(check)
+        def annotate(result: dict):
+            if result["key"] in previous:
+                result["previous"] = previous[result["key"]]
+            if on_result:
+                on_result(result)
 
+        results = self.diagnostics.run(annotate)
+        self.history.record(results)
         return results
 
     def _check_sc_directories(self) -> dict:
@@ -102,17 +126,26 @@ class SocialClubFixer:
         }
 
         if self.SC_CACHE_DIR.exists():
-            cache_size = sum(f.stat().st_size for f in self.SC_CACHE_DIR.rglob("*") if f.is_file())
-            cache_size_mb = cache_size / (1024 * 1024)
+            # Tamanho completo (o histórico acompanha o crescimento); as pastas
+            # que não mudaram vêm do cache do dir_size
+            cache_size_mb = dir_size(self.SC_CACHE_DIR)["bytes"] / (1024 * 1024)
+            result["metric"] = round(cache_size_mb, 2)
+            result["unit"] = "MB"
 
-            if cache_size_mb > 500:
+            if cache_size_mb > self.CACHE_WARNING_MB:
                 result["status"] = "warning"
-                result["message"] = f"⚠️ Cache muito grande ({cache_size_mb:.1f} MB). Recomenda-se limpar."
+                result["message"] = (f"⚠️ Cache muito grande ({cache_size_mb:.0f} MB, limite "
+                                     f"{self.CACHE_WARNING_MB} MB). Recomenda-se limpar.")
             else:
                 result["message"] = f"✅ Cache do Social Club OK ({cache_size_mb:.1f} MB)."
+            growth = self.history.growth_per_day("cache")
+            if growth is not None and abs(growth) >= 0.1:
+                result["message"] += f"\nTendência: {growth:+.1f} MB/dia (últimos 30 dias)."
         else:
             result["message"] = "✅ Cache do Social Club não encontrado (limpo)."
             result["fixable"] = False
+            result["metric"] = 0.0
+            result["unit"] = "MB"
 
         return result
 
@@ -127,6 +160,7 @@ class SocialClubFixer:
 
         if self.DOCUMENTS_PROFILES_DIR.exists():
             profiles = list(self.DOCUMENTS_PROFILES_DIR.iterdir())
+            result["metric"] = len(profiles)
             if profiles:
                 result["message"] = f"✅ {len(profiles)} perfil(is) encontrado(s)."
             else:
@@ -147,20 +181,37 @@ class SocialClubFixer:
             "fixable": True,
         }
 
-        if self.SETTINGS_XML.exists():
-            size = self.SETTINGS_XML.stat().st_size
-            if size == 0:
-                result["status"] = "error"
-                result["message"] = "❌ settings.xml está vazio! O jogo pode não iniciar corretamente."
-            elif size < 100:
-                result["status"] = "warning"
-                result["message"] = "⚠️ settings.xml parece corrompido (muito pequeno)."
-            else:
-                result["message"] = "✅ settings.xml encontrado e válido."
-        else:
+        report = self.settings.check()
+        status = report["status"]
+        if status != "missing":
+            result["metric"] = len(report["errors"]) + (status == "empty")
+        first = report["errors"][0] if report["errors"] else {}
+        where = f"<{first.get('element', '')}>" + (f" (linha {first['line']})" if first.get("line") else "")
+        if status == "ok":
+            result["message"] = f"✅ settings.xml válido ({report['checked']} opções verificadas)."
+        elif status == "missing":
             result["status"] = "info"
             result["message"] = "ℹ️ settings.xml não encontrado. Será criado na primeira execução."
             result["fixable"] = False
+        elif status == "empty":
+            result["status"] = "error"
+            result["message"] = "❌ settings.xml está vazio! O jogo pode não iniciar corretamente."
+        elif status == "truncated":
+            result["status"] = "error"
+            result["message"] = f"❌ settings.xml truncado em {where}: o arquivo termina no meio."
+        elif status == "malformed":
+            result["status"] = "error"
+            result["message"] = f"❌ settings.xml corrompido em {where}: {first.get('message', '')}"
+        else:
+            result["status"] = "warning"
+            result["message"] = "⚠️ settings.xml com problemas:\n" + "\n".join(
+                f"• <{e['element']}> {e['message']}" for e in report["errors"][:5])
+        if status not in ("ok", "missing"):
+            since = self.history.bad_since("settings")
+            if since:
+                result["message"] += f"\nCom problema desde {datetime.fromtimestamp(since):%d/%m/%Y %H:%M}."
+        if report.get("repairable"):
+            result["message"] += "\nPode ser reparado sem apagar o arquivo."
 
         return result
 
@@ -179,6 +230,7 @@ class SocialClubFixer:
                 capture_output=True,
                 text=True,
                 creationflags=subprocess.CREATE_NO_WINDOW,
+                timeout=8,
             )
             if "RockstarService.exe" in output.stdout:
                 result["message"] = "✅ Rockstar Service está em execução."
@@ -230,16 +282,94 @@ class SocialClubFixer:
 
         return result
 
+    def _check_mods(self) -> dict:
+        """Verifica mods, ASI loaders e plugins na pasta do jogo."""
+        result = {
+            "name": "Mods e ASI Loaders",
+            "status": "ok",
+            "message": "",
+            "fixable": False,
+        }
+
+        if not self.game_path or not os.path.isdir(self.game_path):
+            result["status"] = "info"
+            result["message"] = "ℹ️ Pasta do jogo não configurada."
+            return result
+
+        self.mod_detector.game_path = self.game_path
+
+        if self.mod_detector.is_vanilla_active():
+            result["status"] = "warning"
+            result["message"] = "⚠️ Mods desativados pelo modo vanilla e ainda não restaurados."
+            result["fixable"] = True
+            return result
+
+        try:
+            scan = self.mod_detector.scan()
+        except OSError as e:
+            result["status"] = "info"
+            result["message"] = f"ℹ️ Não foi possível ler a pasta do jogo: {e}"
+            return result
+
+        mods = [i for i in scan["items"] if i["category"] in DISABLE_CATEGORIES]
+        lines = [f"• {i['description']}" for i in mods]
+        lines += [f"• {name} modificado (OpenIV)" for name in scan["modified_archives"]]
+
+        result["metric"] = len(lines)
+        if mods or scan["modified_archives"]:
+            result["status"] = "warning"
+            result["message"] = (
+                f"⚠️ {len(lines)} modificação(ões) encontrada(s). "
+                "Após updates, mods desatualizados impedem o jogo de abrir — "
+                "use o modo vanilla para testar.\n" + "\n".join(lines)
+            )
+        else:
+            result["message"] = "✅ Nenhum mod ou ASI loader encontrado."
+
+        return result
+
+    def _check_logs(self) -> dict:
+        """Procura erros conhecidos nas linhas novas dos logs."""
+        result = {
+            "name": "Logs do Launcher e Social Club",
+            "status": "ok",
+            "message": "",
+            "fixable": False,
+        }
+
+        report = self.logs.analyze()
+        findings = report["findings"]
+        result["metric"] = len(findings)
+        if not report["files"] and not findings:
+            result["status"] = "info"
+            result["message"] = "ℹ️ Nenhum log do Launcher/Social Club encontrado."
+            return result
+        if not findings:
+            result["message"] = (f"✅ Nenhum erro conhecido nos logs ({report['files']} arquivo(s), "
+                                 f"{report['bytes'] / 1024 / 1024:.1f} MB novos analisados).")
+            return result
+
+        result["status"] = "error" if any(f["severity"] == "error" for f in findings) else "warning"
+        lines = [f"• {f['description']} ({f['count']}x em {f['file']})" for f in findings[:6]]
+        fixes = list(dict.fromkeys(f["fix"] for f in findings if f["fix"]))
+        if fixes:
+            result["fixable"] = True
+            result["fixes"] = fixes
+        result["message"] = "⚠️ Erros encontrados nos logs:\n" + "\n".join(lines)
+        return result
+
     # ===== Correções =====
 
     def clear_social_club_cache(self) -> Tuple[bool, str]:
-        """Limpa o cache do Social Club."""
+        """
+        Limpa o cache do Social Club.
+
+        A pasta vai para a quarentena (renomeação instantânea); o backup e a
+        remoção acontecem em segundo plano.
+        """
         try:
-            # Fazer backup primeiro
             if self.SC_CACHE_DIR.exists():
-                self._backup_directory(self.SC_CACHE_DIR, "sc_cache")
-                shutil.rmtree(self.SC_CACHE_DIR, ignore_errors=True)
-                self.SC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                self.quarantine.quarantine(self.SC_CACHE_DIR, "sc_cache")
                 return True, "✅ Cache do Social Club limpo com sucesso!"
 
             return True, "ℹ️ Cache já estava limpo."
@@ -254,8 +384,7 @@ class SocialClubFixer:
             if self.SC_LAUNCHER_DIR.exists():
                 cache_dir = self.SC_LAUNCHER_DIR / "httpcache"
                 if cache_dir.exists():
-                    self._backup_directory(cache_dir, "launcher_cache")
-                    shutil.rmtree(cache_dir, ignore_errors=True)
+                    self.quarantine.quarantine(cache_dir, "launcher_cache", recreate=False)
                     return True, "✅ Cache do Launcher limpo com sucesso!"
 
             return True, "ℹ️ Cache do Launcher já estava limpo."
@@ -264,6 +393,18 @@ class SocialClubFixer:
         except Exception as e:
             return False, f"❌ Erro ao limpar cache: {str(e)}"
 
+    def repair_settings(self) -> Tuple[bool, str]:
+        """Repara só os elementos com problema do settings.xml (faz backup antes)."""
+        try:
+            report = self.settings.check()
+            if report["status"] in ("ok", "missing"):
+                return True, "ℹ️ settings.xml não precisa de reparo."
+            if report["repairable"]:
+                self.backups.backup(self.SETTINGS_XML, "settings")
+            return self.settings.repair()
+        except Exception as e:
+            return False, f"❌ Erro: {str(e)}"
+
     def reset_settings(self) -> Tuple[bool, str]:
         """Reseta o settings.xml (faz backup antes)."""
         try:
@@ -275,6 +416,18 @@ class SocialClubFixer:
         except Exception as e:
             return False, f"❌ Erro: {str(e)}"
 
+    def fix_from_logs(self) -> List[Tuple[str, bool, str]]:
+        """Aplica as correções associadas aos erros encontrados nos logs."""
+        results = []
+        findings = self.logs.recent_findings()
+        for fix in dict.fromkeys(f["fix"] for f in findings if f["fix"]):
+            keys = [f["key"] for f in findings if f["fix"] == fix]
+            ok, msg = getattr(self, fix)()
+            results.append((", ".join(f["description"] for f in findings if f["key"] in keys), ok, msg))
+            if ok:
+                self.logs.dismiss(keys)
+        return results
+
     def fix_all(self) -> List[Tuple[bool, str]]:
         """Aplica todas as correções disponíveis."""
         results = []
@@ -284,6 +437,8 @@ class SocialClubFixer:
 
         results.append(("Cache SC", *self.clear_social_club_cache()))
         results.append(("Cache Launcher", *self.clear_launcher_cache()))
+        if self.settings.check()["repairable"]:
+            results.append(("settings.xml", *self.repair_settings()))
 
         return results
 
@@ -305,29 +460,65 @@ class SocialClubFixer:
                 pass
 
     def _backup_directory(self, source: Path, label: str):
-        """Faz backup de um diretório antes de modificá-lo."""
+        """Faz backup (incremental, ver BackupStore) de um diretório antes de modificá-lo."""
         try:
-            self.BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = self.BACKUP_DIR / f"{label}_{timestamp}"
-
-            if source.is_dir():
-                shutil.copytree(source, backup_path, dirs_exist_ok=True)
-            elif source.is_file():
-                backup_path.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source, backup_path / source.name)
-
-            logger.info(f"Backup criado: {backup_path}")
+            if source.exists():
+                self.backups.backup(source, label)
         except Exception as e:
             logger.warning(f"Falha ao criar backup: {e}")
 
-    def get_backup_list(self) -> List[dict]:
-        """Lista os backups disponíveis."""
+    def restore_backup(self, snapshot_id: str, dry_run: bool = False) -> Tuple[bool, str]:
+        """
+        Restaura um backup no local original.
+
+        Args:
+            dry_run: Só lista o que seria adicionado, alterado e removido.
+        """
+        plan = self.backups.plan_restore(snapshot_id)
+        if plan is None:
+            return False, f"❌ Backup '{snapshot_id}' não encontrado."
+        if dry_run:
+            lines = [f"Destino: {plan['target']}",
+                     f"➕ {len(plan['add'])} arquivo(s) a recriar",
+                     f"✏️ {len(plan['modify'])} arquivo(s) a substituir",
+                     f"➖ {len(plan['delete'])} arquivo(s) a remover",
+                     f"= {plan['unchanged']} arquivo(s) iguais"]
+            for label, items in (("➕", plan["add"]), ("✏️", plan["modify"]), ("➖", plan["delete"])):
+                lines += [f"  {label} {p}" for p in items[:5]]
+                if len(items) > 5:
+                    lines.append(f"  … e mais {len(items) - 5}")
+            return True, "\n".join(lines)
+        if not (plan["add"] or plan["modify"] or plan["delete"]):
+            return True, "ℹ️ O destino já está igual ao backup."
+        # O estado atual também vira backup, para poder desfazer a restauração
+        self._backup_directory(Path(plan["target"]), "pre_restore")
+        return self.backups.restore(snapshot_id)
+
+    def get_backup_list(self, on_rebuilt: Optional[Callable[[], None]] = None) -> List[dict]:
+        """
+        Lista os backups disponíveis (a partir do catálogo do BackupStore).
+
+        Args:
+            on_rebuilt: Chamado se o catálogo precisar ser reconstruído em
+                        segundo plano, quando a lista completa estiver pronta.
+        """
         backups = []
+        for snap in self.backups.list_snapshots(on_rebuilt):
+            backups.append({
+                "id": snap["id"],
+                "name": snap["id"],
+                "label": snap["label"],
+                "path": snap["source"],
+                "size_mb": snap["bytes"] / (1024 * 1024),
+                "stored_mb": snap["stored_bytes"] / (1024 * 1024),
+                "files": snap["files"],
+                "date": datetime.fromisoformat(snap["created"]).timestamp(),
+            })
+        # Backups antigos, copiados pasta a pasta
         if self.BACKUP_DIR.exists():
             for item in sorted(self.BACKUP_DIR.iterdir(), reverse=True):
-                if item.is_dir():
-                    size = sum(f.stat().st_size for f in item.rglob("*") if f.is_file())
+                if item.is_dir() and item.name not in (CHUNKS_DIR, SNAPSHOTS_DIR):
+                    size = dir_size(item)["bytes"]
                     backups.append({
                         "name": item.name,
                         "path": str(item),
@@ -0,0 +1,246 @@
+"""
+Módulo Storage Benchmark - Mede o desempenho do disco do GTA V
+Lê trechos dos próprios arquivos .rpf (sequencial e aleatório), evitando o
+cache do sistema quando possível, com tempo total limitado.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import random
+import shutil
+import logging
+from ctypes import wintypes
+from typing import List, Optional
+
+from modules.rpf_reader import find_game_archives
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+SEQ_BLOCK = 4 * 1024 * 1024
+RANDOM_BLOCK = 64 * 1024             # tamanho típico de leitura do streaming do jogo
+ALIGNMENT = 4096
+DEFAULT_BUDGET = 5.0                 # segundos
+
+# Limites de classificação (MB/s sequencial, IOPS aleatório)
+NVME_SEQ_MB_S = 1500
+SSD_SEQ_MB_S = 300
+SSD_RANDOM_IOPS = 1000
+
+
+class _Reader:
+    """Leitura posicional de um arquivo, sem passar pelo cache quando possível."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.bypass = False
+        self._handle = None
+        self._fd = None
+        self._buffer = None
+        if sys.platform == "win32":
+            self._open_windows()
+        else:
+            self._fd = os.open(path, os.O_RDONLY)
+            self.bypass = hasattr(os, "posix_fadvise")
+
+    def _open_windows(self):
+        k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        k32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                    wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+        k32.CreateFileW.restype = wintypes.HANDLE
+        k32.SetFilePointerEx.argtypes = [wintypes.HANDLE, wintypes.LARGE_INTEGER,
+                                         ctypes.POINTER(wintypes.LARGE_INTEGER), wintypes.DWORD]
+        k32.SetFilePointerEx.restype = wintypes.BOOL
+        k32.ReadFile.argtypes = [wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD,
+                                 ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID]
+        k32.ReadFile.restype = wintypes.BOOL
+        k32.VirtualAlloc.argtypes = [wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD, wintypes.DWORD]
+        k32.VirtualAlloc.restype = ctypes.c_void_p
+        k32.VirtualFree.argtypes = [wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD]
+        k32.VirtualFree.restype = wintypes.BOOL
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        k32.CloseHandle.restype = wintypes.BOOL
+        GENERIC_READ = 0x80000000
+        FILE_SHARE_READ = 0x1
+        OPEN_EXISTING = 3
+        FILE_FLAG_NO_BUFFERING = 0x20000000
+        handle = k32.CreateFileW(self.path, GENERIC_READ, FILE_SHARE_READ, None,
+                                 OPEN_EXISTING, FILE_FLAG_NO_BUFFERING, None)
+        if handle in (None, wintypes.HANDLE(-1).value):
+            # Sem acesso direto: usa leitura normal (com cache)
+            self._fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            return
+        # Buffer alinhado à página, exigido por FILE_FLAG_NO_BUFFERING
+        buffer = k32.VirtualAlloc(None, SEQ_BLOCK, 0x3000, 0x04)
+        if not buffer:
+            k32.CloseHandle(handle)
+            self._fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            return
+        self._k32 = k32
+        self._handle = handle
+        self._buffer = buffer
+        self.bypass = True
+
+    def read_at(self, offset: int, size: int) -> int:
+        """Lê `size` bytes a partir de `offset`; retorna quantos bytes foram lidos."""
+        if self._handle is not None:
+            # Offset de 64 bits inteiro (SetFilePointer truncava a parte baixa em int)
+            if not self._k32.SetFilePointerEx(self._handle, offset, None, 0):
+                raise ctypes.WinError(ctypes.get_last_error())
+            read = wintypes.DWORD(0)
+            if not self._k32.ReadFile(self._handle, self._buffer, size, ctypes.byref(read), None):
+                raise ctypes.WinError(ctypes.get_last_error())
+            return read.value
+        if self.bypass:
+            os.posix_fadvise(self._fd, offset, size, os.POSIX_FADV_DONTNEED)
+        if hasattr(os, "pread"):
+            return len(os.pread(self._fd, size, offset))
+        os.lseek(self._fd, offset, os.SEEK_SET)
+        return len(os.read(self._fd, size))
+
+    def close(self):
+        if self._handle is not None:
+            self._k32.VirtualFree(self._buffer, 0, 0x8000)
+            self._k32.CloseHandle(self._handle)
+            self._handle = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class StorageBenchmark:
+    """Benchmark de leitura do disco onde o GTA V está instalado."""
+
+    def __init__(self, game_path: str, time_budget: float = DEFAULT_BUDGET,
+                 files: Optional[List[str]] = None):
+        self.game_path = game_path
+        self.time_budget = time_budget
+        self._files = files
+
+    def _sample_files(self) -> List[str]:
+        files = self._files if self._files is not None else find_game_archives(self.game_path)
+        files = [f for f in files if os.path.isfile(f) and os.path.getsize(f) >= RANDOM_BLOCK]
+        files.sort(key=os.path.getsize, reverse=True)
+        return files[:16]
+
+    def run(self) -> dict:
+        """
+        Executa o benchmark dentro do tempo limite.
+
+        Returns:
+            Dict com MB/s sequencial, MB/s e IOPS aleatórios, espaço livre
+            e a classificação do disco ("nvme", "ssd", "hdd" ou "unknown").
+        """
+        result = {
+            "path": self.game_path,
+            "seq_mb_s": 0.0,
+            "random_mb_s": 0.0,
+            "random_iops": 0.0,
+            "free_gb": 0.0,
+            "total_gb": 0.0,
+            "drive_class": "unknown",
+            "cache_bypass": False,
+            "files_sampled": 0,
+            "duration_s": 0.0,
+        }
+        try:
+            usage = shutil.disk_usage(self.game_path)
+            result["free_gb"] = round(usage.free / 1024 ** 3, 1)
+            result["total_gb"] = round(usage.total / 1024 ** 3, 1)
+        except OSError:
+            pass
+
+        files = self._sample_files()
+        if not files:
+            return result
+
+        start = time.monotonic()
+        readers = []
+        try:
+            readers = [_Reader(f) for f in files]
+            result["cache_bypass"] = all(r.bypass for r in readers)
+            result["files_sampled"] = len(readers)
+            half = self.time_budget / 2
+
+            # Sequencial: blocos contíguos de 4 MB a partir de uma posição aleatória
+            rnd = random.Random(0x6A5)
+            seq_bytes, seq_time = 0, 0.0
+            deadline = start + half
+            for r in readers:
+                if time.monotonic() >= deadline:
+                    break
+                max_start = max(r.size - SEQ_BLOCK * 16, 0)
+                offset = rnd.randrange(0, max_start + 1, ALIGNMENT) if max_start else 0
+                t0 = time.perf_counter()
+                while offset + SEQ_BLOCK <= r.size and time.monotonic() < deadline:
+                    n = r.read_at(offset, SEQ_BLOCK)
+                    if not n:
+                        break
+                    seq_bytes += n
+                    offset += n
+                seq_time += time.perf_counter() - t0
+
+            # Aleatório: blocos de 64 KB espalhados entre todos os arquivos
+            rand_bytes, rand_ops = 0, 0
+            deadline = start + self.time_budget
+            t0 = time.perf_counter()
+            while time.monotonic() < deadline:
+                r = readers[rnd.randrange(len(readers))]
+                offset = rnd.randrange(0, r.size - RANDOM_BLOCK + 1, ALIGNMENT)
+                rand_bytes += r.read_at(offset, RANDOM_BLOCK)
+                rand_ops += 1
+            rand_time = time.perf_counter() - t0
+        except OSError as e:
+            logger.warning(f"Benchmark de disco falhou: {e}")
+            return result
+        finally:
+            for r in readers:
+                r.close()
+
+        mb = 1024 * 1024
+        if seq_time > 0:
+            result["seq_mb_s"] = round(seq_bytes / mb / seq_time, 1)
+        if rand_time > 0:
+            result["random_mb_s"] = round(rand_bytes / mb / rand_time, 1)
+            result["random_iops"] = round(rand_ops / rand_time, 0)
+        result["duration_s"] = round(time.monotonic() - start, 2)
+        result["drive_class"] = classify_drive(result)
+        return result
+
+
+def classify_drive(result: dict) -> str:
+    """Classifica o disco a partir do resultado do benchmark."""
+    if not result.get("seq_mb_s"):
+        return "unknown"
+    if result["seq_mb_s"] >= NVME_SEQ_MB_S:
+        return "nvme"
+    if result["seq_mb_s"] >= SSD_SEQ_MB_S or result["random_iops"] >= SSD_RANDOM_IOPS:
+        return "ssd"
+    return "hdd"
+
+
+def get_storage_recommendation(result: Optional[dict]) -> Optional[str]:
+    """Sugere mover o jogo quando o disco é lento ou está quase cheio."""
+    if not result or result.get("drive_class") == "unknown":
+        return None
+    if result["drive_class"] == "hdd":
+        return ("💽 O GTA V está em um HD mecânico "
+                f"({result['seq_mb_s']:.0f} MB/s). Mova para um SSD em "
+                "Configurações → Mover instalação para carregar muito mais rápido.")
+    if result["total_gb"] and result["free_gb"] / result["total_gb"] < 0.1:
+        return (f"💽 Pouco espaço livre no disco do jogo ({result['free_gb']:.0f} GB). "
+                "Isso pode atrasar atualizações e o streaming de texturas.")
+    return None
+
+
+if __name__ == "__main__":
+    import json
+    # Uso: python -m modules.storage_bench <pasta do jogo ou de arquivos de teste>
+    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    sample = None
+    if os.path.isdir(target) and not find_game_archives(target):
+        sample = [os.path.join(target, f) for f in os.listdir(target)]
+    print(json.dumps(StorageBenchmark(target, files=sample).run(), indent=2))
@@ -0,0 +1,184 @@
+"""
+Módulo VRAM Estimator - Estima o uso de memória de vídeo do GTA V
+Modela o orçamento de VRAM mostrado no menu gráfico do jogo a partir das
+opções do settings.xml e da resolução, e escolhe a combinação de maior
+qualidade que cabe na placa de vídeo.
+"""
+
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("GTAVLauncher")
+
+
+BASE_MB = 350                        # buffers fixos, geometria, UI
+TARGET_FRACTION = 0.9                # margem para o Windows e outros programas
+DEFAULT_RESOLUTION = (1920, 1080)
+
+# Custo (MB) de cada nível; "per_mpix" escala com a resolução (render targets)
+COSTS = {
+    "TextureQuality":    {"levels": [0, 1, 2], "mb": [750, 1250, 2050]},
+    "ShaderQuality":     {"levels": [0, 1, 2], "mb": [40, 80, 120]},
+    "ShadowQuality":     {"levels": [1, 2, 3], "mb": [60, 160, 320]},
+    "ReflectionQuality": {"levels": [0, 1, 2, 3], "mb": [0, 12, 40, 100], "per_mpix": [0, 4, 8, 16]},
+    "WaterQuality":      {"levels": [0, 1, 2], "mb": [10, 30, 50]},
+    "ParticleQuality":   {"levels": [0, 1, 2], "mb": [10, 25, 40]},
+    "GrassQuality":      {"levels": [0, 1, 2, 3], "mb": [20, 45, 80, 120]},
+    "PostFX":            {"levels": [0, 1, 2, 3], "mb": [0, 0, 0, 0], "per_mpix": [8, 14, 20, 28]},
+    "SSAO":              {"levels": [0, 1, 2], "mb": [0, 0, 0], "per_mpix": [0, 8, 16]},
+    "MSAA":              {"levels": [0, 2, 4, 8], "mb": [0, 0, 0, 0], "per_mpix": [0, 60, 120, 240]},
+    "CityDensity":       {"levels": [0.0, 0.5, 0.75, 1.0], "mb": [0, 75, 110, 150]},
+}
+RENDER_TARGET_MB_PER_MPIX = 60       # G-buffer + HDR sem MSAA
+
+# Nomes dos níveis como no menu do jogo (cada opção tem sua própria escala)
+_NORMAL_TO_VERY_HIGH = {0: "Normal", 1: "Alta", 2: "Muito alta"}
+_NORMAL_TO_ULTRA = {0: "Normal", 1: "Alta", 2: "Muito alta", 3: "Ultra"}
+LEVEL_NAMES = {
+    "TextureQuality": _NORMAL_TO_VERY_HIGH,
+    "ShaderQuality": _NORMAL_TO_VERY_HIGH,
+    "ShadowQuality": {1: "Normal", 2: "Alta", 3: "Muito alta"},
+    "ReflectionQuality": _NORMAL_TO_ULTRA,
+    "WaterQuality": _NORMAL_TO_VERY_HIGH,
+    "ParticleQuality": _NORMAL_TO_VERY_HIGH,
+    "GrassQuality": _NORMAL_TO_ULTRA,
+    "PostFX": _NORMAL_TO_ULTRA,
+    "SSAO": {0: "Desligado", 1: "Normal", 2: "Alto"},
+}
+
+# Peso visual de cada opção na nota de qualidade
+QUALITY_WEIGHTS = {
+    "TextureQuality": 3.0,
+    "ShaderQuality": 1.5,
+    "ShadowQuality": 2.0,
+    "ReflectionQuality": 1.0,
+    "WaterQuality": 0.5,
+    "ParticleQuality": 0.5,
+    "GrassQuality": 1.0,
+    "PostFX": 1.0,
+    "SSAO": 1.0,
+    "MSAA": 1.5,
+    "CityDensity": 0.5,
+}
+
+KEYS = list(COSTS)
+
+_table: Optional[dict] = None
+
+
+def _candidate_table() -> dict:
+    """
+    Tabela com todas as combinações de níveis (uma linha por candidato),
+    montada uma única vez: índices, custo fixo, custo por megapixel e nota.
+    """
+    global _table
+    if _table is None:
+        sizes = [len(COSTS[k]["levels"]) for k in KEYS]
+        idx = np.indices(sizes, dtype=np.int8).reshape(len(sizes), -1).T
+        fixed = np.zeros(len(idx), dtype=np.float32)
+        per_mpix = np.zeros(len(idx), dtype=np.float32)
+        quality = np.zeros(len(idx), dtype=np.float32)
+        for col, key in enumerate(KEYS):
+            c = COSTS[key]
+            fixed += np.asarray(c["mb"], dtype=np.float32)[idx[:, col]]
+            per_mpix += np.asarray(c.get("per_mpix", [0] * sizes[col]), dtype=np.float32)[idx[:, col]]
+            quality += QUALITY_WEIGHTS[key] * idx[:, col] / (sizes[col] - 1)
+        quality /= sum(QUALITY_WEIGHTS.values())
+        _table = {"idx": idx, "fixed": fixed, "per_mpix": per_mpix, "quality": quality}
+    return _table
+
+
+def _level_index(key: str, value) -> int:
+    levels = COSTS[key]["levels"]
+    # Valor fora da lista (ex.: CityDensity 0.9): usa o nível mais próximo
+    return int(np.argmin([abs(float(value) - lv) for lv in levels]))
+
+
+def estimate_vram(settings: dict, resolution=DEFAULT_RESOLUTION) -> int:
+    """
+    Estima o uso de VRAM (MB) de uma combinação de opções.
+
+    Opções ausentes usam o nível intermediário.
+    """
+    mpix = resolution[0] * resolution[1] / 1e6
+    total = BASE_MB + RENDER_TARGET_MB_PER_MPIX * mpix
+    for key, c in COSTS.items():
+        i = _level_index(key, settings[key]) if key in settings else len(c["levels"]) // 2
+        total += c["mb"][i] + c.get("per_mpix", [0] * len(c["levels"]))[i] * mpix
+    return int(round(total))
+
+
+def estimate_table(resolution=DEFAULT_RESOLUTION) -> np.ndarray:
+    """Uso estimado de VRAM (MB) de todos os candidatos, de uma vez."""
+    t = _candidate_table()
+    mpix = resolution[0] * resolution[1] / 1e6
+    return BASE_MB + RENDER_TARGET_MB_PER_MPIX * mpix + t["fixed"] + t["per_mpix"] * mpix
+
+
+def _row_settings(row: np.ndarray) -> dict:
+    return {key: COSTS[key]["levels"][int(i)] for key, i in zip(KEYS, row)}
+
+
+def solve(vram_mb: float, resolution=DEFAULT_RESOLUTION,
+          fraction: float = TARGET_FRACTION, fixed: Optional[dict] = None) -> Optional[dict]:
+    """
+    Escolhe a combinação de maior qualidade que cabe em `fraction` da VRAM.
+
+    Args:
+        vram_mb: VRAM da placa (SystemAnalyzer: "vram_mb").
+        resolution: (largura, altura).
+        fixed: Opções que devem ficar como estão (ex.: {"MSAA": 0}).
+
+    Returns:
+        Dict com "settings", "vram_mb" estimado, "budget_mb" e "quality"
+        (0 a 1), ou None se nem a combinação mínima couber.
+    """
+    t = _candidate_table()
+    usage = estimate_table(resolution)
+    budget = vram_mb * fraction
+    mask = usage <= budget
+    for key, value in (fixed or {}).items():
+        if key in COSTS:
+            mask &= t["idx"][:, KEYS.index(key)] == _level_index(key, value)
+    if not mask.any():
+        return None
+    # Maior qualidade; no empate, o menor uso de VRAM
+    score = np.where(mask, t["quality"] - usage / 1e7, -np.inf)
+    best = int(np.argmax(score))
+    return {
+        "settings": _row_settings(t["idx"][best]),
+        "vram_mb": int(round(float(usage[best]))),
+        "budget_mb": int(budget),
+        "quality": round(float(t["quality"][best]), 3),
+    }
+
+
+def describe(settings: dict) -> List[str]:
+    """Resumo legível das opções principais."""
+    out = []
+    for key, label in (("TextureQuality", "Texturas"), ("ShadowQuality", "Sombras"),
+                       ("ShaderQuality", "Shaders")):
+        if key in settings:
+            out.append(f"{label}: {LEVEL_NAMES[key].get(settings[key], settings[key])}")
+    if "MSAA" in settings:
+        out.append(f"MSAA: {settings['MSAA']}x" if settings["MSAA"] else "MSAA: off")
+    return out
+
+
+if __name__ == "__main__":
+    import time
+    # Uso: python -m modules.vram_estimator
+    t0 = time.perf_counter()
+    n = len(_candidate_table()["idx"])
+    t_build = time.perf_counter() - t0
+    for vram in (2048, 4096, 6144, 8192, 12288):
+        for res in ((1920, 1080), (2560, 1440), (3840, 2160)):
+            t0 = time.perf_counter()
+            r = solve(vram, res)
+            dt = (time.perf_counter() - t0) * 1000
+            desc = ", ".join(describe(r["settings"])) if r else "nada cabe"
+            used = f"{r['vram_mb']} MB" if r else "-"
+            print(f"{vram:>6} MB  {res[0]}x{res[1]}  {used:>8}  {desc}  ({dt:.1f} ms)")
+    print(f"{n:,} combinações; tabela montada em {t_build * 1000:.0f} ms")